@@ -46,6 +46,14 @@ class ActionHandler(ABC):
         """
         ...
 
+    def clear_cache(self) -> None:
+        """Drop any per-snapshot element state cached by the handler.
+
+        Called whenever the executor receives a fresh set of element
+        references. The default implementation caches nothing.
+        """
+        return None
+
     @abstractmethod
     def open_app(self, name: str) -> ActionResult:
         """Open an application by name.
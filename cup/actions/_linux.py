@@ -354,13 +354,28 @@ def _atspi_get_bounds_xywh(accessible) -> tuple[int, int, int, int] | None:
     return None
 
 
+# Element centers memoized per snapshot, keyed by id(accessible). The
+# accessible itself is stored alongside so a recycled id() is never trusted.
+_center_cache: dict[int, tuple[Any, tuple[int, int]]] = {}
+
+
 def _get_element_center(accessible) -> tuple[int, int] | None:
-    """Get the center point of an AT-SPI2 element in screen coordinates."""
+    """Get the center point of an AT-SPI2 element in screen coordinates.
+
+    Results are memoized until the next snapshot (or a scroll) so repeated
+    gestures on the same element skip the D-Bus extents round-trip.
+    """
+    cached = _center_cache.get(id(accessible))
+    if cached is not None and cached[0] is accessible:
+        return cached[1]
+
     bounds = _atspi_get_bounds_xywh(accessible)
     if bounds is None:
         return None
     x, y, w, h = bounds
-    return x + w // 2, y + h // 2
+    center = x + w // 2, y + h // 2
+    _center_cache[id(accessible)] = (accessible, center)
+    return center
 
 
 def _atspi_grab_focus(accessible) -> bool:
@@ -600,6 +615,9 @@ class LinuxActionHandler(ActionHandler):
                 error=f"Failed to press keys '{combo}': {exc}",
             )
 
+    def clear_cache(self) -> None:
+        _center_cache.clear()
+
     # -- individual actions ------------------------------------------------
 
     def _click(self, element) -> ActionResult:
@@ -779,6 +797,8 @@ class LinuxActionHandler(ActionHandler):
         if center:
             try:
                 _send_scroll(center[0], center[1], direction)
+                # Content moved — every memoized center is now stale
+                _center_cache.clear()
                 return ActionResult(success=True, message=f"Scrolled {direction}")
             except Exception as exc:
                 return ActionResult(success=False, message="", error=f"Scroll failed: {exc}")
@@ -2,17 +2,120 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import ctypes
 import difflib
+import functools
 import os
 import re
+import signal
 import subprocess
+import threading
 import time
+from collections.abc import Collection
 from typing import Any
 
 from cup.actions._handler import ActionHandler
 from cup.actions._keys import parse_combo
 from cup.actions.executor import ActionResult
 
+# PyObjC symbols are bound once at import time rather than re-imported in
+# every helper. On hosts without PyObjC (e.g. when running the test suite on
+# Linux) the module still imports; helpers raise on first use instead.
+try:
+    import objc
+    from AppKit import (
+        NSApplicationActivationPolicyRegular,
+        NSRunningApplication,
+        NSWorkspace,
+        NSWorkspaceDidLaunchApplicationNotification,
+    )
+    from ApplicationServices import (
+        AXUIElementCopyActionNames,
+        AXUIElementCopyAttributeValue,
+        AXUIElementCopyMultipleAttributeValues,
+        AXUIElementCreateApplication,
+        AXUIElementGetAttributeValueCount,
+        AXUIElementIsAttributeSettable,
+        AXUIElementPerformAction,
+        AXUIElementSetAttributeValue,
+        AXUIElementSetMessagingTimeout,
+        AXValueGetValue,
+        kAXErrorSuccess,
+        kAXPositionAttribute,
+        kAXSizeAttribute,
+        kAXValueCGPointType,
+        kAXValueCGSizeType,
+        kAXWindowsAttribute,
+    )
+    from Foundation import NSURL, NSBundle, NSDate, NSDefaultRunLoopMode, NSObject, NSRunLoop
+    from Quartz import (
+        CGEventCreateKeyboardEvent,
+        CGEventCreateMouseEvent,
+        CGEventCreateScrollWheelEvent,
+        CGEventKeyboardSetUnicodeString,
+        CGEventPost,
+        CGEventSetFlags,
+        CGEventSetIntegerValueField,
+        CGEventSetLocation,
+        CGPointMake,
+        CGWindowListCopyWindowInfo,
+        kCGEventLeftMouseDown,
+        kCGEventLeftMouseUp,
+        kCGEventMouseMoved,
+        kCGEventRightMouseDown,
+        kCGEventRightMouseUp,
+        kCGHIDEventTap,
+        kCGMouseButtonLeft,
+        kCGMouseButtonRight,
+        kCGMouseEventClickState,
+        kCGNullWindowID,
+        kCGScrollEventUnitPixel,
+        kCGWindowListOptionOnScreenOnly,
+    )
+except ImportError as exc:
+    _pyobjc_import_error: ImportError | None = exc
+else:
+    _pyobjc_import_error = None
+
+
+# rapidfuzz (optional) scores fuzzy app-name matches in C; difflib is the
+# pure-Python fallback.
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _rf_fuzz = None
+    _rf_process = None
+
+
+def _require_pyobjc() -> None:
+    """Raise if the PyObjC frameworks needed for macOS actions are missing."""
+    if _pyobjc_import_error is not None:
+        raise ImportError(
+            "macOS actions require pyobjc-framework-ApplicationServices, "
+            f"pyobjc-framework-Cocoa and pyobjc-framework-Quartz: {_pyobjc_import_error}"
+        )
+
+
+# WindowServer delivers posted events in order, so no settle time is needed
+# between them by default. CUP_MACOS_EVENT_DELAY (seconds) reintroduces a
+# pause after each event batch for apps that drop fast synthetic input.
+_INTER_EVENT_DELAY = float(os.environ.get("CUP_MACOS_EVENT_DELAY", "0"))
+
+
+def _pause() -> None:
+    """Sleep for the configured inter-event delay, if any."""
+    if _INTER_EVENT_DELAY > 0:
+        time.sleep(_INTER_EVENT_DELAY)
+
+
+# An unresponsive app would otherwise block each AX call for the system
+# default (~6 s). CUP_MACOS_AX_TIMEOUT (seconds) bounds the wait per call so
+# the handler can fall back to CGEvents; 0 keeps the system default.
+_AX_TIMEOUT = float(os.environ.get("CUP_MACOS_AX_TIMEOUT", "0.5"))
+
+
 # ---------------------------------------------------------------------------
 # Quartz CGEvent keyboard constants
 # ---------------------------------------------------------------------------
@@ -114,94 +217,124 @@ _MOD_FLAGS: dict[str, int] = {
     "shift": _kCGEventFlagMaskShift,
 }
 
+# Virtual keycodes for modifiers pressed on their own (e.g. "cmd")
+_MOD_VK: dict[str, int] = {
+    "meta": 0x37,  # kVK_Command
+    "ctrl": 0x3B,  # kVK_Control
+    "alt": 0x3A,  # kVK_Option
+    "shift": 0x38,  # kVK_Shift
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_combo_cached(combo_str: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """parse_combo, memoized; workflows press the same few combos repeatedly."""
+    mod_names, key_names = parse_combo(combo_str)
+    return tuple(mod_names), tuple(key_names)
+
 
 def _send_key_combo(combo_str: str) -> None:
     """Send a keyboard combination via Quartz CGEvents."""
-    from Quartz import (
-        CGEventCreateKeyboardEvent,
-        CGEventPost,
-        CGEventSetFlags,
-        kCGHIDEventTap,
-    )
+    _require_pyobjc()
 
-    mod_names, key_names = parse_combo(combo_str)
+    mod_names, key_names = _parse_combo_cached(combo_str)
 
     # Build modifier flags mask
     flags = 0
     for m in mod_names:
         flags |= _MOD_FLAGS.get(m, 0)
 
-    # Resolve main keycodes
+    # Resolve main keycodes (parse_combo already lowercases key names)
     main_keys: list[int] = []
     for k in key_names:
-        if k in _VK_MAP:
-            main_keys.append(_VK_MAP[k])
-        elif len(k) == 1 and k.lower() in _VK_MAP:
-            main_keys.append(_VK_MAP[k.lower()])
+        vk = _VK_MAP.get(k)
+        if vk is not None:
+            main_keys.append(vk)
 
     # If only modifiers were specified (e.g. "cmd"), treat them as key presses
     if not main_keys and mod_names:
-        # Map modifier names to their virtual keycodes
-        _MOD_VK: dict[str, int] = {
-            "meta": 0x37,  # kVK_Command
-            "ctrl": 0x3B,  # kVK_Control
-            "alt": 0x3A,  # kVK_Option
-            "shift": 0x38,  # kVK_Shift
-        }
         for m in mod_names:
-            if m in _MOD_VK:
-                main_keys.append(_MOD_VK[m])
+            vk = _MOD_VK.get(m)
+            if vk is not None:
+                main_keys.append(vk)
         flags = 0  # No modifier flags when pressing modifier alone
 
     if not main_keys:
         raise RuntimeError(f"Could not resolve any key codes from combo: {combo_str!r}")
 
-    # Key down
-    for vk in main_keys:
-        event = CGEventCreateKeyboardEvent(None, vk, True)
-        if flags:
+    # Create and flag every event before posting so the post loop is a
+    # straight run of CGEventPost calls; the pool drains the transient
+    # wrappers once at the end instead of piecemeal between posts.
+    down_events = [CGEventCreateKeyboardEvent(None, vk, True) for vk in main_keys]
+    up_events = [CGEventCreateKeyboardEvent(None, vk, False) for vk in reversed(main_keys)]
+    if flags:
+        for event in down_events + up_events:
             CGEventSetFlags(event, flags)
-        CGEventPost(kCGHIDEventTap, event)
 
-    time.sleep(0.01)
+    with objc.autorelease_pool():
+        for event in down_events:
+            CGEventPost(kCGHIDEventTap, event)
 
-    # Key up
-    for vk in reversed(main_keys):
-        event = CGEventCreateKeyboardEvent(None, vk, False)
-        if flags:
-            CGEventSetFlags(event, flags)
-        CGEventPost(kCGHIDEventTap, event)
+        _pause()
+
+        for event in up_events:
+            CGEventPost(kCGHIDEventTap, event)
+
+        _pause()
+
+
+# CGEventKeyboardSetUnicodeString accepts at most 20 UTF-16 code units per event
+_UNICODE_CHUNK_UNITS = 20
 
-    time.sleep(0.01)
+
+def _utf16_chunks(text: str, max_units: int = _UNICODE_CHUNK_UNITS) -> list[tuple[str, int]]:
+    """Split text into (chunk, utf16_length) pairs of at most max_units units.
+
+    Characters outside the BMP occupy two UTF-16 units and are never split
+    across chunks.
+    """
+    # Fast path: short text (the common case) fits in a single event pair,
+    # so skip the per-character walk.
+    units = len(text.encode("utf-16-le")) // 2
+    if units <= max_units:
+        return [(text, units)] if units else []
+
+    chunks: list[tuple[str, int]] = []
+    start = 0
+    units = 0
+    for i, char in enumerate(text):
+        width = 2 if ord(char) > 0xFFFF else 1
+        if units + width > max_units:
+            chunks.append((text[start:i], units))
+            start = i
+            units = 0
+        units += width
+    if units:
+        chunks.append((text[start:], units))
+    return chunks
 
 
 def _type_string(text: str) -> None:
     """Type a string using CGEvents with Unicode support.
 
     Uses CGEventKeyboardSetUnicodeString for reliable Unicode input
-    regardless of keyboard layout.
+    regardless of keyboard layout. Text is posted in chunks of up to 20
+    UTF-16 units per key-down/key-up pair rather than one pair per character.
     """
-    from Quartz import (
-        CGEventCreateKeyboardEvent,
-        CGEventKeyboardSetUnicodeString,
-        CGEventPost,
-        kCGHIDEventTap,
-    )
+    _require_pyobjc()
 
-    # Send in chunks — CGEventKeyboardSetUnicodeString supports up to 20 chars
-    # per event reliably, but we'll do 1 char at a time for maximum compatibility
-    for char in text:
-        # Key down with Unicode char
+    for chunk, units in _utf16_chunks(text):
+        # Key down with Unicode payload
         event_down = CGEventCreateKeyboardEvent(None, 0, True)
-        CGEventKeyboardSetUnicodeString(event_down, len(char), char)
+        CGEventKeyboardSetUnicodeString(event_down, units, chunk)
         CGEventPost(kCGHIDEventTap, event_down)
 
         # Key up
         event_up = CGEventCreateKeyboardEvent(None, 0, False)
-        CGEventKeyboardSetUnicodeString(event_up, len(char), char)
+        CGEventKeyboardSetUnicodeString(event_up, units, chunk)
         CGEventPost(kCGHIDEventTap, event_up)
 
-    time.sleep(0.01)
+    _pause()
 
 
 # ---------------------------------------------------------------------------
@@ -209,33 +342,150 @@ def _type_string(text: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+# Move/down/up events are delivered in FIFO order, so they are posted back
+# to back. CUP_MACOS_CLICK_DEBUG=1 restores the old settle sleeps between
+# them when troubleshooting an app that misses clicks.
+_CLICK_DEBUG = os.environ.get("CUP_MACOS_CLICK_DEBUG") == "1"
+
+
+def _click_settle(seconds: float) -> None:
+    """Pause between mouse events; only sleeps the full time in debug mode."""
+    if _CLICK_DEBUG:
+        time.sleep(seconds)
+    else:
+        _pause()
+
+
+# Per-thread caches that live for the duration of one
+# MacosActionHandler.action() call. Entries are keyed by id(element) and
+# hold the element itself, so a recycled id() is never trusted.
+_action_cache = threading.local()
+
+
 def _get_element_bounds(element) -> tuple[int, int, int, int] | None:
-    """Get element bounds (x, y, w, h) from AXUIElement."""
-    from ApplicationServices import (
-        AXUIElementCopyAttributeValue,
-        AXValueGetValue,
-        kAXErrorSuccess,
-        kAXPositionAttribute,
-        kAXSizeAttribute,
-        kAXValueCGPointType,
-        kAXValueCGSizeType,
+    """Get element bounds (x, y, w, h) from AXUIElement.
+
+    Within an action() call the result (including a miss) is memoized, so
+    fallback chains that ask for the same element's geometry more than
+    once only pay for the AX round-trips once.
+    """
+    cache = getattr(_action_cache, "bounds", None)
+    if cache is not None:
+        cached = cache.get(id(element))
+        if cached is not None and cached[0] is element:
+            return cached[1]
+
+    bounds = _query_element_bounds(element)
+    if cache is not None:
+        cache[id(element)] = (element, bounds)
+    return bounds
+
+
+def _query_element_bounds(element) -> tuple[int, int, int, int] | None:
+    """Read element bounds from the AX API (uncached)."""
+    _require_pyobjc()
+
+    if _USE_SKYLIGHT_BOUNDS and _ax_get_attr(element, "AXRole") == "AXWindow":
+        bounds = _skylight_window_bounds(element)
+        if bounds is not None:
+            return bounds
+
+    # Position and size in one round-trip to the app's AX server; fall back
+    # to one request per attribute if the batched call fails.
+    err, values = AXUIElementCopyMultipleAttributeValues(
+        element, [kAXPositionAttribute, kAXSizeAttribute], 0, None
     )
+    if err == kAXErrorSuccess and values is not None and len(values) == 2:
+        pos_ref, size_ref = values[0], values[1]
+    else:
+        err, pos_ref = AXUIElementCopyAttributeValue(element, kAXPositionAttribute, None)
+        if err != kAXErrorSuccess or pos_ref is None:
+            return None
 
-    err, pos_ref = AXUIElementCopyAttributeValue(element, kAXPositionAttribute, None)
-    if err != kAXErrorSuccess or pos_ref is None:
-        return None
+        err, size_ref = AXUIElementCopyAttributeValue(element, kAXSizeAttribute, None)
+        if err != kAXErrorSuccess or size_ref is None:
+            return None
+
+    # A batched attribute that failed comes back as an AXError value, which
+    # AXValueGetValue refuses to unpack as a point or size.
+    ok_point, point = AXValueGetValue(pos_ref, kAXValueCGPointType, None)
+    ok_size, size = AXValueGetValue(size_ref, kAXValueCGSizeType, None)
 
-    err, size_ref = AXUIElementCopyAttributeValue(element, kAXSizeAttribute, None)
-    if err != kAXErrorSuccess or size_ref is None:
+    if not ok_point or not ok_size or point is None or size is None:
         return None
 
-    _, point = AXValueGetValue(pos_ref, kAXValueCGPointType, None)
-    _, size = AXValueGetValue(size_ref, kAXValueCGSizeType, None)
+    return int(point.x), int(point.y), int(size.width), int(size.height)
+
+
+# ---------------------------------------------------------------------------
+# SkyLight window bounds (private API, opt-in)
+# ---------------------------------------------------------------------------
+
+# Window frames can be read straight from the window server via SkyLight,
+# bypassing the target app's AX queue. These are private symbols, so the
+# path is opt-in and falls back to AX whenever anything is missing.
+_USE_SKYLIGHT_BOUNDS = os.environ.get("CUP_MACOS_SKYLIGHT_BOUNDS") == "1"
+
+
+class _CGRect(ctypes.Structure):
+    _fields_ = [
+        ("x", ctypes.c_double),
+        ("y", ctypes.c_double),
+        ("width", ctypes.c_double),
+        ("height", ctypes.c_double),
+    ]
+
+
+# (connection_id, SLSGetWindowBounds, _AXUIElementGetWindow) once loaded,
+# False if the private symbols are unavailable, None if not yet attempted.
+_skylight: tuple[int, Any, Any] | bool | None = None
+
+
+def _load_skylight() -> tuple[int, Any, Any] | None:
+    """Resolve the SkyLight / HIServices private symbols (once)."""
+    global _skylight
+    if _skylight is None:
+        try:
+            sl = ctypes.CDLL("/System/Library/PrivateFrameworks/SkyLight.framework/SkyLight")
+            hi = ctypes.CDLL(
+                "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
+            )
+            main_connection = sl.SLSMainConnectionID
+            main_connection.argtypes = []
+            main_connection.restype = ctypes.c_int
+
+            get_bounds = sl.SLSGetWindowBounds
+            get_bounds.argtypes = [ctypes.c_int, ctypes.c_uint32, ctypes.POINTER(_CGRect)]
+            get_bounds.restype = ctypes.c_int
+
+            get_window = hi._AXUIElementGetWindow
+            get_window.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32)]
+            get_window.restype = ctypes.c_int
 
-    if point is None or size is None:
+            _skylight = (main_connection(), get_bounds, get_window)
+        except (OSError, AttributeError):
+            _skylight = False
+    return _skylight or None
+
+
+def _skylight_window_bounds(element) -> tuple[int, int, int, int] | None:
+    """Get a window element's frame via SLSGetWindowBounds, or None."""
+    api = _load_skylight()
+    if api is None:
+        return None
+    cid, get_bounds, get_window = api
+    try:
+        element_ptr = element.__c_void_p__()
+    except AttributeError:
         return None
 
-    return int(point.x), int(point.y), int(size.width), int(size.height)
+    wid = ctypes.c_uint32()
+    if get_window(element_ptr, ctypes.byref(wid)) != 0 or not wid.value:
+        return None
+    rect = _CGRect()
+    if get_bounds(cid, wid.value, ctypes.byref(rect)) != 0:
+        return None
+    return int(rect.x), int(rect.y), int(rect.width), int(rect.height)
 
 
 def _get_element_center(element) -> tuple[float, float] | None:
@@ -255,7 +505,7 @@ def _get_element_center_or_parent(element) -> tuple[float, float] | None:
     find the nearest ancestor with bounds, falling back to the window
     center as a last resort.
     """
-    from ApplicationServices import AXUIElementCopyAttributeValue, kAXErrorSuccess
+    _require_pyobjc()
 
     current = element
     for _ in range(20):  # guard against infinite loops
@@ -279,21 +529,7 @@ def _send_mouse_click(
     count: int = 1,
 ) -> None:
     """Send mouse click(s) at screen coordinates via Quartz CGEvents."""
-    from Quartz import (
-        CGEventCreateMouseEvent,
-        CGEventPost,
-        CGEventSetIntegerValueField,
-        CGPointMake,
-        kCGEventLeftMouseDown,
-        kCGEventLeftMouseUp,
-        kCGEventMouseMoved,
-        kCGEventRightMouseDown,
-        kCGEventRightMouseUp,
-        kCGHIDEventTap,
-        kCGMouseButtonLeft,
-        kCGMouseButtonRight,
-        kCGMouseEventClickState,
-    )
+    _require_pyobjc()
 
     point = CGPointMake(x, y)
 
@@ -309,7 +545,7 @@ def _send_mouse_click(
     # Move cursor to position first
     move = CGEventCreateMouseEvent(None, kCGEventMouseMoved, point, kCGMouseButtonLeft)
     CGEventPost(kCGHIDEventTap, move)
-    time.sleep(0.02)
+    _click_settle(0.02)
 
     # Click(s)
     for i in range(count):
@@ -318,37 +554,30 @@ def _send_mouse_click(
         CGEventSetIntegerValueField(down, kCGMouseEventClickState, click_number)
         CGEventPost(kCGHIDEventTap, down)
 
-        time.sleep(0.01)
+        _click_settle(0.01)
 
         up = CGEventCreateMouseEvent(None, up_type, point, mouse_button)
         CGEventSetIntegerValueField(up, kCGMouseEventClickState, click_number)
         CGEventPost(kCGHIDEventTap, up)
 
+        # Keep a gap between clicks of a multi-click so apps still see them
+        # as separate presses within the double-click interval.
         if i < count - 1:
             time.sleep(0.02)
 
-    time.sleep(0.01)
+    _click_settle(0.01)
 
 
 def _send_mouse_long_press(x: float, y: float, duration: float = 0.8) -> None:
     """Send a long press (mouse down, hold, mouse up) at screen coordinates."""
-    from Quartz import (
-        CGEventCreateMouseEvent,
-        CGEventPost,
-        CGPointMake,
-        kCGEventLeftMouseDown,
-        kCGEventLeftMouseUp,
-        kCGEventMouseMoved,
-        kCGHIDEventTap,
-        kCGMouseButtonLeft,
-    )
+    _require_pyobjc()
 
     point = CGPointMake(x, y)
 
     # Move cursor
     move = CGEventCreateMouseEvent(None, kCGEventMouseMoved, point, kCGMouseButtonLeft)
     CGEventPost(kCGHIDEventTap, move)
-    time.sleep(0.02)
+    _pause()
 
     # Press down
     down = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, point, kCGMouseButtonLeft)
@@ -360,7 +589,7 @@ def _send_mouse_long_press(x: float, y: float, duration: float = 0.8) -> None:
     # Release
     up = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, point, kCGMouseButtonLeft)
     CGEventPost(kCGHIDEventTap, up)
-    time.sleep(0.01)
+    _pause()
 
 
 def _send_scroll(x: float, y: float, direction: str, amount: int = 5) -> None:
@@ -371,14 +600,7 @@ def _send_scroll(x: float, y: float, direction: str, amount: int = 5) -> None:
     is unreliable in apps like Safari where line units may be interpreted
     as tiny or zero-pixel movements.
     """
-    from Quartz import (
-        CGEventCreateScrollWheelEvent,
-        CGEventPost,
-        CGEventSetLocation,
-        CGPointMake,
-        kCGHIDEventTap,
-        kCGScrollEventUnitPixel,
-    )
+    _require_pyobjc()
 
     point = CGPointMake(x, y)
 
@@ -399,7 +621,7 @@ def _send_scroll(x: float, y: float, direction: str, amount: int = 5) -> None:
     event = CGEventCreateScrollWheelEvent(None, kCGScrollEventUnitPixel, 2, dy, dx)
     CGEventSetLocation(event, point)
     CGEventPost(kCGHIDEventTap, event)
-    time.sleep(0.02)
+    _pause()
 
 
 # ---------------------------------------------------------------------------
@@ -409,7 +631,7 @@ def _send_scroll(x: float, y: float, direction: str, amount: int = 5) -> None:
 
 def _ax_perform_action(element, action_name: str) -> bool:
     """Perform a named AX action on an element. Returns True on success."""
-    from ApplicationServices import AXUIElementPerformAction, kAXErrorSuccess
+    _require_pyobjc()
 
     try:
         err = AXUIElementPerformAction(element, action_name)
@@ -419,21 +641,50 @@ def _ax_perform_action(element, action_name: str) -> bool:
 
 
 def _ax_has_action(element, action_name: str) -> bool:
-    """Check if an element supports a specific AX action."""
-    from ApplicationServices import AXUIElementCopyActionNames, kAXErrorSuccess
+    """Check if an element supports a specific AX action.
+
+    The element's action names are fetched once per action() call.
+    """
+    return action_name in _ax_action_names(element)
+
 
+def _ax_action_names(element) -> frozenset[str]:
+    """Return the AX action names an element supports (empty on error)."""
+    cache = getattr(_action_cache, "action_names", None)
+    if cache is not None:
+        cached = cache.get(id(element))
+        if cached is not None and cached[0] is element:
+            return cached[1]
+
+    _require_pyobjc()
+
+    names: frozenset[str] = frozenset()
     try:
         err, actions = AXUIElementCopyActionNames(element, None)
         if err == kAXErrorSuccess and actions:
-            return action_name in actions
+            names = frozenset(actions)
     except Exception:
         pass
+
+    if cache is not None:
+        cache[id(element)] = (element, names)
+    return names
+
+
+def _ax_raise(element) -> bool:
+    """Perform AXRaise only if the element advertises it.
+
+    Most elements (text fields, buttons) do not support AXRaise, so checking
+    the cached action names first skips a doomed round-trip.
+    """
+    if _ax_has_action(element, "AXRaise"):
+        return _ax_perform_action(element, "AXRaise")
     return False
 
 
 def _ax_get_attr(element, attr: str, default=None):
     """Safely read a single AX attribute."""
-    from ApplicationServices import AXUIElementCopyAttributeValue, kAXErrorSuccess
+    _require_pyobjc()
 
     try:
         err, value = AXUIElementCopyAttributeValue(element, attr, None)
@@ -444,9 +695,37 @@ def _ax_get_attr(element, attr: str, default=None):
     return default
 
 
+def _set_messaging_timeout(element) -> None:
+    """Apply the configured AX messaging timeout to element, if any."""
+    if _AX_TIMEOUT <= 0 or element is None or _pyobjc_import_error is not None:
+        return
+    try:
+        AXUIElementSetMessagingTimeout(element, _AX_TIMEOUT)
+    except Exception:
+        pass
+
+
+def _wait_for_focus(element, timeout: float = 0.05) -> bool:
+    """Poll AXFocused until the element reports focus or timeout elapses.
+
+    Returns as soon as focus lands instead of always sleeping the full
+    timeout. Polls start at 2 ms and back off exponentially.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.002
+    while True:
+        if _ax_get_attr(element, "AXFocused"):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay *= 2
+
+
 def _ax_set_attr(element, attr: str, value) -> bool:
     """Set an AX attribute value. Returns True on success."""
-    from ApplicationServices import AXUIElementSetAttributeValue, kAXErrorSuccess
+    _require_pyobjc()
 
     try:
         err = AXUIElementSetAttributeValue(element, attr, value)
@@ -457,7 +736,7 @@ def _ax_set_attr(element, attr: str, value) -> bool:
 
 def _ax_is_settable(element, attr: str) -> bool:
     """Check if an attribute is settable."""
-    from ApplicationServices import AXUIElementIsAttributeSettable, kAXErrorSuccess
+    _require_pyobjc()
 
     try:
         err, settable = AXUIElementIsAttributeSettable(element, attr, None)
@@ -473,12 +752,16 @@ def _ax_is_settable(element, attr: str) -> bool:
 # ---------------------------------------------------------------------------
 
 
-def _discover_apps() -> dict[str, str]:
-    """Discover installed macOS apps. Returns {lowercase_name: path_or_bundle_id}."""
-    apps: dict[str, str] = {}
+# Installed apps change rarely, so discovery results are reused for up to
+# _APPS_TTL seconds as long as no application directory has been modified.
+_APPS_TTL = 60.0
+# Keyed by whether the Spotlight results were included.
+_apps_cache: dict[bool, tuple[float, tuple[float | None, ...], dict[str, str]]] = {}
 
-    # Search common application directories
-    app_dirs = [
+
+def _app_dirs() -> list[str]:
+    """Return the directories scanned for .app bundles."""
+    return [
         "/Applications",
         "/Applications/Utilities",
         "/System/Applications",
@@ -486,46 +769,125 @@ def _discover_apps() -> dict[str, str]:
         os.path.expanduser("~/Applications"),
     ]
 
-    for app_dir in app_dirs:
-        if not os.path.isdir(app_dir):
-            continue
+
+def _dir_mtimes(dirs: list[str]) -> tuple[float | None, ...]:
+    """Return the mtime of each directory (None if missing)."""
+    mtimes: list[float | None] = []
+    for d in dirs:
         try:
-            for entry in os.listdir(app_dir):
-                if entry.endswith(".app"):
-                    app_name = entry[:-4]  # Remove .app
-                    app_path = os.path.join(app_dir, entry)
-                    apps[app_name.lower()] = app_path
+            mtimes.append(os.stat(d).st_mtime)
         except OSError:
-            continue
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _invalidate_apps_cache() -> None:
+    """Forget cached app discovery results."""
+    _apps_cache.clear()
+
+
+def _discover_apps(include_spotlight: bool = True) -> dict[str, str]:
+    """Discover installed macOS apps. Returns {lowercase_name: path_or_bundle_id}.
 
-    # Also search via system_profiler for more apps (Homebrew casks, etc.)
+    Args:
+        include_spotlight: Also query Spotlight (``mdfind``) for bundles
+            outside the standard application directories.
+
+    Results are cached for ``_APPS_TTL`` seconds and invalidated early if
+    any application directory's mtime changes.
+    """
+    app_dirs = _app_dirs()
+    mtimes = _dir_mtimes(app_dirs)
+    now = time.monotonic()
+    cached = _apps_cache.get(include_spotlight)
+    if cached is not None:
+        cached_at, cached_mtimes, cached_apps = cached
+        if now - cached_at < _APPS_TTL and cached_mtimes == mtimes:
+            return cached_apps
+
+    apps = _scan_apps(app_dirs, include_spotlight)
+    if apps:
+        _apps_cache[include_spotlight] = (now, mtimes, apps)
+    return apps
+
+
+def _scan_app_dir(app_dir: str) -> dict[str, str]:
+    """List the .app bundles directly inside one application directory."""
+    apps: dict[str, str] = {}
+    if not os.path.isdir(app_dir):
+        return apps
+    try:
+        with os.scandir(app_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".app"):
+                    # Strip ".app"; DirEntry.path is already joined
+                    apps[entry.name[:-4].lower()] = entry.path
+    except OSError:
+        pass
+    return apps
+
+
+def _spotlight_apps() -> dict[str, str]:
+    """Find application bundles outside the standard dirs via Spotlight."""
+    apps: dict[str, str] = {}
     try:
         result = subprocess.run(
             ["mdfind", "kMDItemContentType == 'com.apple.application-bundle'"],
             capture_output=True,
             text=True,
-            timeout=5,
+            timeout=2,
         )
         if result.returncode == 0:
             for line in result.stdout.strip().split("\n"):
                 line = line.strip()
                 if line.endswith(".app"):
                     app_name = os.path.basename(line)[:-4]
-                    if app_name.lower() not in apps:
-                        apps[app_name.lower()] = line
+                    apps.setdefault(app_name.lower(), line)
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         pass
+    return apps
+
+
+def _scan_apps(app_dirs: list[str], include_spotlight: bool = True) -> dict[str, str]:
+    """Scan application directories (and optionally Spotlight) for installed apps.
+
+    The directory listings and the ``mdfind`` query are I/O bound, so they
+    run concurrently; the Spotlight query overlaps the directory reads
+    instead of adding to them.
+    """
+    apps: dict[str, str] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(app_dirs) + 1) as pool:
+        # Also search via Spotlight for more apps (Homebrew casks, etc.)
+        spotlight = pool.submit(_spotlight_apps) if include_spotlight else None
+        for dir_apps in pool.map(_scan_app_dir, app_dirs):
+            apps.update(dir_apps)
+
+        # Directory scans take precedence over Spotlight duplicates
+        if spotlight is not None:
+            for app_name, app_path in spotlight.result().items():
+                apps.setdefault(app_name, app_path)
 
     return apps
 
 
 def _fuzzy_match(
     query: str,
-    candidates: list[str],
+    candidates: Collection[str],
     cutoff: float = 0.5,
 ) -> str | None:
-    """Find the best fuzzy match for query among candidates."""
+    """Find the best fuzzy match for query among candidates.
+
+    Args:
+        query: Name typed by the caller.
+        candidates: Lowercase names to match against. A dict (such as the
+            result of ``_discover_apps``) is matched on its keys, and gives
+            an O(1) exact-match check without copying the names.
+        cutoff: Minimum similarity ratio for the fuzzy fallback.
+    """
     query_lower = query.lower().strip()
+    if isinstance(candidates, dict):
+        candidates = candidates.keys()
 
     # Exact match
     if query_lower in candidates:
@@ -537,11 +899,8 @@ def _fuzzy_match(
     substring_matches = [c for c in candidates if query_lower in c]
     if substring_matches:
         # Prefer candidates where query appears as a whole word boundary
-        word_boundary = [
-            c
-            for c in substring_matches
-            if re.search(r"(?:^|[\s\-_])" + re.escape(query_lower) + r"(?:$|[\s\-_])", c)
-        ]
+        word_pattern = re.compile(r"(?:^|[\s\-_])" + re.escape(query_lower) + r"(?:$|[\s\-_])")
+        word_boundary = [c for c in substring_matches if word_pattern.search(c)]
         if word_boundary:
             return min(word_boundary, key=len)
         return min(substring_matches, key=len)
@@ -551,10 +910,26 @@ def _fuzzy_match(
         if c in query_lower:
             return c
 
-    # Fuzzy match via SequenceMatcher
+    # Fuzzy match via rapidfuzz when installed
+    if _rf_process is not None:
+        best = _rf_process.extractOne(
+            query_lower,
+            candidates,
+            scorer=_rf_fuzz.ratio,
+            score_cutoff=cutoff * 100,
+        )
+        return best[0] if best else None
+
+    # Fallback: fuzzy match via SequenceMatcher
     best_match = None
     best_score = 0.0
+    query_len = len(query_lower)
     for c in candidates:
+        # ratio() can never exceed 2*min(len)/sum(len); skip candidates whose
+        # length alone rules out beating the cutoff or the current best.
+        bound = 2.0 * min(query_len, len(c)) / (query_len + len(c)) if c else 0.0
+        if bound < cutoff or bound <= best_score:
+            continue
         score = difflib.SequenceMatcher(None, query_lower, c).ratio()
         if score > best_score:
             best_score = score
@@ -565,6 +940,174 @@ def _fuzzy_match(
     return None
 
 
+# NSObject subclass receiving NSWorkspace launch notifications; defined on
+# first use because an Objective-C class can only be registered once.
+_launch_observer_cls = None
+
+
+def _launch_observer_class():
+    """Return the launch-notification observer class, defining it if needed."""
+    global _launch_observer_cls
+    if _launch_observer_cls is None:
+
+        class _CupLaunchObserver(NSObject):
+            def initWithNeedle_(self, needle):
+                self = objc.super(_CupLaunchObserver, self).init()
+                if self is None:
+                    return None
+                self.needle = needle
+                self.launched = threading.Event()
+                return self
+
+            def applicationDidLaunch_(self, notification):
+                info = notification.userInfo() or {}
+                app = info.get("NSWorkspaceApplicationKey")
+                name = (app.localizedName() if app is not None else None) or ""
+                if self.needle in name.casefold():
+                    self.launched.set()
+
+        _launch_observer_cls = _CupLaunchObserver
+    return _launch_observer_cls
+
+
+def _observe_launches(workspace, needle: str):
+    """Subscribe to launches of apps whose casefolded name contains needle.
+
+    Returns the observer (whose ``launched`` event is set when a matching app
+    finishes launching), or None if the notification could not be set up.
+    """
+    try:
+        observer = _launch_observer_class().alloc().initWithNeedle_(needle)
+        workspace.notificationCenter().addObserver_selector_name_object_(
+            observer,
+            "applicationDidLaunch:",
+            NSWorkspaceDidLaunchApplicationNotification,
+            None,
+        )
+        return observer
+    except Exception:
+        return None
+
+
+def _wait_for_event(event: threading.Event, timeout: float) -> None:
+    """Wait up to timeout for event, pumping the run loop for notifications.
+
+    Workspace notifications are delivered through the current run loop, so
+    this runs it rather than sleeping. If the run loop has no input sources
+    (it returns immediately) the remainder is slept instead.
+    """
+    deadline = time.monotonic() + timeout
+    run_loop = NSRunLoop.currentRunLoop()
+    while not event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not run_loop.runMode_beforeDate_(
+            NSDefaultRunLoopMode, NSDate.dateWithTimeIntervalSinceNow_(remaining)
+        ):
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            return
+
+
+def _spawn_and_wait(argv: list[str], timeout: float) -> int | None:
+    """Run argv with output discarded and return its exit code.
+
+    Uses posix_spawn directly, skipping subprocess's pipe setup. The child
+    is killed if it runs longer than timeout, in which case None is
+    returned.
+    """
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    pid = os.posix_spawn(argv[0], argv, os.environ, file_actions=file_actions)
+
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        _, status = os.waitpid(pid, 0)
+    finally:
+        timer.cancel()
+    if timed_out.is_set():
+        return None
+    return os.waitstatus_to_exitcode(status)
+
+
+def _bundle_identifier(app_path: str) -> str | None:
+    """Return the bundle identifier for a discovered app path or bundle id."""
+    if not (app_path.endswith(".app") and os.path.isdir(app_path)):
+        return app_path or None
+    try:
+        bundle = NSBundle.bundleWithPath_(app_path)
+        return bundle.bundleIdentifier() if bundle is not None else None
+    except Exception:
+        return None
+
+
+def _running_candidates(workspace, needle: str, bundle_id: str | None):
+    """Running applications that may be the launched app.
+
+    With a bundle id this asks NSRunningApplication directly instead of
+    enumerating every running app and name-matching it.
+    """
+    if bundle_id:
+        return NSRunningApplication.runningApplicationsWithBundleIdentifier_(bundle_id) or []
+    return workspace.runningApplications()
+
+
+# How long _open_application_async waits for the launch to be accepted
+# before handing over to window polling.
+_OPEN_APP_ACK_TIMEOUT = 2.0
+
+
+def _open_application_async(workspace, app_path: str) -> bool | None:
+    """Launch via openApplicationAtURL:configuration:completionHandler:.
+
+    Unlike the deprecated synchronous launch calls this returns as soon as
+    the request is dispatched; we wait only briefly for the completion
+    handler. Returns None when the API (macOS 10.15+) or the app URL is
+    unavailable so the caller can fall back.
+    """
+    if not hasattr(workspace, "openApplicationAtURL_configuration_completionHandler_"):
+        return None
+    try:
+        config_cls = objc.lookUpClass("NSWorkspaceOpenConfiguration")
+    except objc.nosuchclass_error:
+        return None
+
+    if app_path.endswith(".app") and os.path.isdir(app_path):
+        url = NSURL.fileURLWithPath_(app_path)
+    else:
+        url = workspace.URLForApplicationWithBundleIdentifier_(app_path)
+    if url is None:
+        return None
+
+    config = config_cls.configuration()
+    config.setActivates_(True)
+
+    done = threading.Event()
+    outcome: dict[str, Any] = {}
+
+    def completion(app, error):
+        outcome["error"] = error
+        done.set()
+
+    workspace.openApplicationAtURL_configuration_completionHandler_(url, config, completion)
+    if not done.wait(_OPEN_APP_ACK_TIMEOUT):
+        # Still launching; _wait_for_window takes it from here.
+        return True
+    return outcome.get("error") is None
+
+
 # ---------------------------------------------------------------------------
 # MacosActionHandler
 # ---------------------------------------------------------------------------
@@ -578,6 +1121,21 @@ class MacosActionHandler(ActionHandler):
         native_ref: Any,
         action: str,
         params: dict[str, Any],
+    ) -> ActionResult:
+        _set_messaging_timeout(native_ref)
+        _action_cache.bounds = {}
+        _action_cache.action_names = {}
+        try:
+            return self._dispatch(native_ref, action, params)
+        finally:
+            _action_cache.bounds = None
+            _action_cache.action_names = None
+
+    def _dispatch(
+        self,
+        native_ref: Any,
+        action: str,
+        params: dict[str, Any],
     ) -> ActionResult:
         element = native_ref
 
@@ -681,9 +1239,9 @@ class MacosActionHandler(ActionHandler):
         """
         try:
             # Focus the element first
-            _ax_perform_action(element, "AXRaise")
+            _ax_raise(element)
             _ax_set_attr(element, "AXFocused", True)
-            time.sleep(0.05)
+            _wait_for_focus(element)
 
             # Strategy 1: Set AXValue directly (preferred — bypasses keyboard entirely)
             if _ax_is_settable(element, "AXValue"):
@@ -694,10 +1252,10 @@ class MacosActionHandler(ActionHandler):
             center = _get_element_center(element)
             if center:
                 _send_mouse_click(center[0], center[1])
-                time.sleep(0.05)
+                _wait_for_focus(element)
 
             _send_key_combo("meta+a")
-            time.sleep(0.05)
+            _pause()
             _type_string(text)
             return ActionResult(success=True, message=f"Typed: {text}")
         except Exception as exc:
@@ -862,7 +1420,7 @@ class MacosActionHandler(ActionHandler):
 
     def _focus(self, element) -> ActionResult:
         # Try AXRaise first (brings window/element to front)
-        _ax_perform_action(element, "AXRaise")
+        _ax_raise(element)
 
         # Set AXFocused
         if _ax_set_attr(element, "AXFocused", True):
@@ -885,9 +1443,9 @@ class MacosActionHandler(ActionHandler):
 
         # Fallback: send Escape key
         try:
-            _ax_perform_action(element, "AXRaise")
+            _ax_raise(element)
             _ax_set_attr(element, "AXFocused", True)
-            time.sleep(0.05)
+            _wait_for_focus(element)
             _send_key_combo("escape")
             return ActionResult(success=True, message="Dismissed (Escape)")
         except Exception as exc:
@@ -928,15 +1486,21 @@ class MacosActionHandler(ActionHandler):
             )
 
         try:
-            apps = _discover_apps()
-            if not apps:
-                return ActionResult(
-                    success=False,
-                    message="",
-                    error="Could not discover installed applications",
-                )
+            # Most queries resolve against the standard application
+            # directories, so only pay for the Spotlight query when the
+            # local scan doesn't contain the name outright.
+            apps = _discover_apps(include_spotlight=False)
+            match = _fuzzy_match(name, apps) if apps else None
+            if match is None or name.lower().strip() not in match:
+                apps = _discover_apps()
+                if not apps:
+                    return ActionResult(
+                        success=False,
+                        message="",
+                        error="Could not discover installed applications",
+                    )
+                match = _fuzzy_match(name, apps)
 
-            match = _fuzzy_match(name, list(apps.keys()))
             if match is None:
                 return ActionResult(
                     success=False,
@@ -960,7 +1524,7 @@ class MacosActionHandler(ActionHandler):
                 )
 
             # Wait for window to appear
-            if self._wait_for_window(match):
+            if self._wait_for_window(match, bundle_id=_bundle_identifier(app_path)):
                 return ActionResult(
                     success=True,
                     message=f"{display_name} launched",
@@ -980,10 +1544,13 @@ class MacosActionHandler(ActionHandler):
     def _launch_via_nsworkspace(self, app_path: str) -> bool:
         """Launch app via NSWorkspace."""
         try:
-            from AppKit import NSWorkspace
-
+            _require_pyobjc()
             workspace = NSWorkspace.sharedWorkspace()
 
+            launched = _open_application_async(workspace, app_path)
+            if launched is not None:
+                return launched
+
             if app_path.endswith(".app") and os.path.isdir(app_path):
                 return bool(workspace.launchApplication_(app_path))
 
@@ -1001,90 +1568,101 @@ class MacosActionHandler(ActionHandler):
 
     def _launch_via_open(self, app_path: str) -> bool:
         """Launch app via `open` command (fallback)."""
+        flag = "-a" if app_path.endswith(".app") and os.path.isdir(app_path) else "-b"
         try:
-            if app_path.endswith(".app") and os.path.isdir(app_path):
-                result = subprocess.run(
-                    ["open", "-a", app_path],
-                    capture_output=True,
-                    timeout=10,
-                )
-            else:
-                result = subprocess.run(
-                    ["open", "-b", app_path],
-                    capture_output=True,
-                    timeout=10,
-                )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            return _spawn_and_wait(["/usr/bin/open", flag, app_path], timeout=10) == 0
+        except OSError:
             return False
 
     def _wait_for_window(
         self,
         app_name: str,
         timeout: float = 8.0,
+        bundle_id: str | None = None,
     ) -> bool:
         """Poll for a window matching the launched app.
 
         Uses both NSWorkspace (for activation policy filtering) and
         CGWindowListCopyWindowInfo (for fresh window-server data) to
-        detect when the launched app's window appears.
+        detect when the launched app's window appears. When the launched
+        app's bundle_id is known, only its instances are checked instead of
+        name-matching every running app.
         """
-        from AppKit import NSApplicationActivationPolicyRegular, NSWorkspace
+        _require_pyobjc()
 
         deadline = time.monotonic() + timeout
-        pattern = re.compile(re.escape(app_name), re.IGNORECASE)
+        needle = app_name.casefold()
+        workspace = NSWorkspace.sharedWorkspace()
 
-        while time.monotonic() < deadline:
-            # Strategy 1: NSWorkspace (may be stale in long-running processes)
-            workspace = NSWorkspace.sharedWorkspace()
-            for app in workspace.runningApplications():
-                if app.activationPolicy() != NSApplicationActivationPolicyRegular:
-                    continue
-                name = app.localizedName() or ""
-                if pattern.search(name.lower()):
-                    pid = app.processIdentifier()
-                    try:
-                        from ApplicationServices import (
-                            AXUIElementCopyAttributeValue,
-                            AXUIElementCreateApplication,
-                            kAXErrorSuccess,
-                            kAXWindowsAttribute,
-                        )
+        # Fast launches are noticed within ~50 ms; slow ones back off to
+        # polling every 400 ms.
+        delay = 0.05
+        attempt = 0
 
-                        app_ref = AXUIElementCreateApplication(pid)
-                        err, windows = AXUIElementCopyAttributeValue(
-                            app_ref,
-                            kAXWindowsAttribute,
-                            None,
+        # The launch notification wakes the loop early for slow launches;
+        # polling remains the source of truth (the app may already be up).
+        observer = _observe_launches(workspace, needle)
+        try:
+            while time.monotonic() < deadline:
+                # Strategy 1: NSWorkspace (may be stale in long-running processes)
+                app_seen = False
+                for app in _running_candidates(workspace, needle, bundle_id):
+                    if app.activationPolicy() != NSApplicationActivationPolicyRegular:
+                        continue
+                    if bundle_id or needle in (app.localizedName() or "").casefold():
+                        app_seen = True
+                        pid = app.processIdentifier()
+                        try:
+                            # Only the count matters; don't materialize the
+                            # array of window elements.
+                            app_ref = AXUIElementCreateApplication(pid)
+                            err, count = AXUIElementGetAttributeValueCount(
+                                app_ref,
+                                kAXWindowsAttribute,
+                                None,
+                            )
+                            if err == kAXErrorSuccess and count > 0:
+                                return True
+                        except Exception:
+                            pass
+
+                # Strategy 2: CGWindowListCopyWindowInfo (always fresh from window
+                # server). Apps usually show up in NSWorkspace first, so the window
+                # list is only consulted early on once the app is running but has
+                # no AX windows yet.
+                if app_seen or attempt >= 2:
+                    try:
+                        cg_windows = CGWindowListCopyWindowInfo(
+                            kCGWindowListOptionOnScreenOnly,
+                            kCGNullWindowID,
                         )
-                        if err == kAXErrorSuccess and windows and len(windows) > 0:
-                            return True
+                        if cg_windows:
+                            for w in cg_windows:
+                                layer = w.get("kCGWindowLayer", -1)
+                                if layer != 0:
+                                    continue
+                                owner = w.get("kCGWindowOwnerName", "")
+                                if owner and needle in owner.casefold():
+                                    return True
                     except Exception:
                         pass
 
-            # Strategy 2: CGWindowListCopyWindowInfo (always fresh from window server)
-            try:
-                from Quartz import (
-                    CGWindowListCopyWindowInfo,
-                    kCGNullWindowID,
-                    kCGWindowListOptionOnScreenOnly,
-                )
-
-                cg_windows = CGWindowListCopyWindowInfo(
-                    kCGWindowListOptionOnScreenOnly,
-                    kCGNullWindowID,
-                )
-                if cg_windows:
-                    for w in cg_windows:
-                        layer = w.get("kCGWindowLayer", -1)
-                        if layer != 0:
-                            continue
-                        owner = w.get("kCGWindowOwnerName", "")
-                        if owner and pattern.search(owner.lower()):
-                            return True
-            except Exception:
-                pass
-
-            time.sleep(0.5)
+                attempt += 1
+                if observer is not None and not observer.launched.is_set():
+                    _wait_for_event(observer.launched, delay)
+                    if observer.launched.is_set():
+                        # Just launched: windows usually follow within a few polls
+                        delay = 0.05
+                        continue
+                else:
+                    time.sleep(delay)
+                delay = min(delay * 1.5, 0.4)
+
+        finally:
+            if observer is not None:
+                try:
+                    workspace.notificationCenter().removeObserver_(observer)
+                except Exception:
+                    pass
 
         return False
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import string
 import time
+from collections.abc import Callable
 from typing import Any
 
 from cup.actions._handler import ActionHandler
@@ -57,20 +60,176 @@ def _get_click_point(box_model: dict) -> tuple[float, float]:
     The content quad is returned as [x1,y1, x2,y2, x3,y3, x4,y4].
     We average all four corners to get the center.
     """
-    content = box_model.get("model", {}).get("content", [])
-    if len(content) >= 8:
-        xs = [content[i] for i in range(0, 8, 2)]
-        ys = [content[i] for i in range(1, 8, 2)]
-        return sum(xs) / 4, sum(ys) / 4
-    # Fallback: use border quad
-    border = box_model.get("model", {}).get("border", [])
-    if len(border) >= 8:
-        xs = [border[i] for i in range(0, 8, 2)]
-        ys = [border[i] for i in range(1, 8, 2)]
-        return sum(xs) / 4, sum(ys) / 4
+    # CDP almost always returns the content quad, so read it directly and
+    # only fall back to the border quad on the rare miss.
+    for quad in ("content", "border"):
+        try:
+            c = box_model["model"][quad]
+            if len(c) >= 8:
+                return (c[0] + c[2] + c[4] + c[6]) * 0.25, (c[1] + c[3] + c[5] + c[7]) * 0.25
+        except (KeyError, TypeError):
+            pass
     raise RuntimeError("Cannot determine element position from box model")
 
 
+# Runtime object group for nodes resolved by the handler. Expired or
+# replaced objectIds are released one by one; the group is released as a
+# whole when the handler's connections are closed.
+_OBJECT_GROUP = "cup"
+
+
+def _click_message(button: str, click_count: int) -> str:
+    """Describe a mouse click for ActionResult.message."""
+    return {
+        ("left", 1): "Clicked",
+        ("left", 2): "Double-clicked",
+        ("right", 1): "Right-clicked",
+    }.get((button, click_count), f"Mouse {button} x{click_count}")
+
+
+# Page-side click: mousedown/mouseup/click per press at the element's
+# center, plus dblclick or contextmenu where a real click would fire one.
+_JS_CLICK_FUNCTION = """function(button, count) {
+    const r = this.getBoundingClientRect();
+    const b = button === 'right' ? 2 : 0;
+    const base = {
+        bubbles: true, cancelable: true, view: window, button: b,
+        clientX: r.left + r.width / 2, clientY: r.top + r.height / 2,
+    };
+    for (let i = 1; i <= count; i++) {
+        this.dispatchEvent(new MouseEvent('mousedown',
+            {...base, detail: i, buttons: b === 2 ? 2 : 1}));
+        this.dispatchEvent(new MouseEvent('mouseup', {...base, detail: i}));
+        if (b === 0) {
+            this.dispatchEvent(new MouseEvent('click', {...base, detail: i}));
+        }
+    }
+    if (b === 0 && count === 2) {
+        this.dispatchEvent(new MouseEvent('dblclick', {...base, detail: 2}));
+    }
+    if (b === 2) {
+        this.dispatchEvent(new MouseEvent('contextmenu', base));
+    }
+    return true;
+}"""
+
+
+# Page-side helpers for Runtime.callFunctionOn. They are sent verbatim on
+# every call; identical source lets V8 reuse its compiled code per context.
+_JS_SET_VALUE_FUNCTION = """function(v) {
+    this.value = v;
+    this.dispatchEvent(new Event('input', {bubbles: true}));
+    this.dispatchEvent(new Event('change', {bubbles: true}));
+}"""
+
+# JS .click() for reliable toggling of checkboxes/switches
+_JS_TOGGLE_FUNCTION = "function() { this.click(); }"
+
+# <option> elements are selected directly and change is dispatched on the
+# parent <select>; anything else is clicked.
+_JS_SELECT_FUNCTION = """function() {
+    if (this.tagName === 'OPTION') {
+        this.selected = true;
+        if (this.parentElement) {
+            this.parentElement.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    } else {
+        this.click();
+    }
+}"""
+
+
+# DOM ``code`` values for letter keys ("a" -> "KeyA")
+_CDP_LETTER_CODES: dict[str, str] = {c: f"Key{c.upper()}" for c in string.ascii_lowercase}
+
+
+@functools.lru_cache(maxsize=256)
+def _key_combo_commands(combo: str) -> tuple[tuple[str, dict[str, Any]], ...]:
+    """Build the Input.dispatchKeyEvent commands for a key combo.
+
+    Results are cached per combo string; the returned params dicts are
+    shared and must not be mutated.
+    """
+    modifiers, keys = parse_combo(combo)
+    commands: list[tuple[str, dict[str, Any]]] = []
+
+    # Calculate modifier bitmask
+    mod_bits = 0
+    for mod in modifiers:
+        info = _CDP_MODIFIER_MAP.get(mod)
+        if info:
+            mod_bits |= info["bit"]
+
+    # Press modifiers down
+    for mod in modifiers:
+        info = _CDP_MODIFIER_MAP.get(mod)
+        if info:
+            commands.append(
+                (
+                    "Input.dispatchKeyEvent",
+                    {
+                        "type": "keyDown",
+                        "key": info["key"],
+                        "code": info["code"],
+                        "modifiers": mod_bits,
+                    },
+                )
+            )
+
+    # Press and release main keys
+    for key in keys:
+        mapped = _CDP_KEY_MAP.get(key)
+        if mapped:
+            cdp_key = mapped["key"]
+            cdp_code = mapped["code"]
+            text = ""
+        elif len(key) == 1:
+            cdp_key = key
+            cdp_code = _CDP_LETTER_CODES.get(key) or (f"Key{key.upper()}" if key.isalpha() else "")
+            text = key
+        else:
+            continue
+
+        params: dict[str, Any] = {
+            "type": "keyDown",
+            "key": cdp_key,
+            "code": cdp_code,
+            "modifiers": mod_bits,
+        }
+        if text and not mod_bits:
+            params["text"] = text
+        commands.append(("Input.dispatchKeyEvent", params))
+        commands.append(
+            (
+                "Input.dispatchKeyEvent",
+                {
+                    "type": "keyUp",
+                    "key": cdp_key,
+                    "code": cdp_code,
+                    "modifiers": mod_bits,
+                },
+            )
+        )
+
+    # Release modifiers
+    for mod in reversed(modifiers):
+        info = _CDP_MODIFIER_MAP.get(mod)
+        if info:
+            commands.append(
+                (
+                    "Input.dispatchKeyEvent",
+                    {
+                        "type": "keyUp",
+                        "key": info["key"],
+                        "code": info["code"],
+                        "modifiers": 0,
+                    },
+                )
+            )
+
+    return tuple(commands)
+
+
 # ---------------------------------------------------------------------------
 # WebActionHandler
 # ---------------------------------------------------------------------------
@@ -83,8 +242,75 @@ class WebActionHandler(ActionHandler):
     web adapter during tree capture.
     """
 
+    # Pooled connections idle for longer than this are reopened on checkout.
+    _WS_IDLE_TIMEOUT = 30.0
+    # Resolved objectIds are reused for this long; CDP may collect the node
+    # (e.g. on navigation) so they are not kept indefinitely.
+    _RESOLVE_TTL = 5.0
+    # How long press() reuses the CDP target list.
+    _TARGETS_TTL = 0.5
+
     def __init__(self, *, cdp_host: str | None = None):
         self._host = cdp_host or os.environ.get("CUP_CDP_HOST", "127.0.0.1")
+        self._port = int(os.environ.get("CUP_CDP_PORT", "9222"))
+        # Dispatch clicks as DOM MouseEvents instead of Input events. This
+        # skips the geometry lookup and works for off-screen elements, but
+        # the events are untrusted (isTrusted == false), so it is opt-in.
+        self._js_click = os.environ.get("CUP_CDP_JS_CLICK") == "1"
+        # ws_url -> (websocket, last release time). Sockets are removed while
+        # checked out, so concurrent actions never share one.
+        self._ws_pool: dict[str, tuple[Any, float]] = {}
+        # (id(ws), backend_node_id) -> (objectId, resolve time). Entries for a
+        # socket are dropped when it is closed, so a recycled id() is safe.
+        self._resolve_cache: dict[tuple[int, int], tuple[str, float]] = {}
+        self._targets_cache: tuple[list[dict], float] | None = None
+
+    def _get_ws(self, ws_url: str) -> Any:
+        """Check out a pooled connection to ws_url, connecting if needed."""
+        from cup.platforms.web import _cdp_connect
+
+        entry = self._ws_pool.pop(ws_url, None)
+        if entry is not None:
+            ws, released_at = entry
+            fresh = time.monotonic() - released_at < self._WS_IDLE_TIMEOUT
+            if fresh and getattr(ws, "connected", True):
+                return ws
+            self._close_ws(ws)
+        return _cdp_connect(ws_url, self._host)
+
+    def _release_ws(self, ws_url: str, ws: Any) -> None:
+        """Return a healthy connection to the pool for reuse."""
+        previous = self._ws_pool.get(ws_url)
+        self._ws_pool[ws_url] = (ws, time.monotonic())
+        if previous is not None and previous[0] is not ws:
+            self._close_ws(previous[0])
+
+    def _close_ws(self, ws: Any, *, release_objects: bool = False) -> None:
+        """Close a connection and forget objectIds resolved through it."""
+        from cup.platforms.web import _cdp_close, _cdp_send
+
+        ws_key = id(ws)
+        stale = [key for key in self._resolve_cache if key[0] == ws_key]
+        for key in stale:
+            del self._resolve_cache[key]
+        if release_objects and stale:
+            try:
+                _cdp_send(ws, "Runtime.releaseObjectGroup", {"objectGroup": _OBJECT_GROUP})
+            except Exception:
+                pass
+        _cdp_close(ws)
+
+    def close(self) -> None:
+        """Close all pooled CDP connections."""
+        pool, self._ws_pool = self._ws_pool, {}
+        for ws, _ in pool.values():
+            self._close_ws(ws, release_objects=True)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def action(
         self,
@@ -92,20 +318,20 @@ class WebActionHandler(ActionHandler):
         action: str,
         params: dict[str, Any],
     ) -> ActionResult:
-        from cup.platforms.web import _cdp_close, _cdp_connect
-
         ws_url, backend_node_id = native_ref
-        ws = _cdp_connect(ws_url, self._host)
+        ws = self._get_ws(ws_url)
         try:
-            return self._dispatch(ws, backend_node_id, action, params)
+            result = self._dispatch(ws, backend_node_id, action, params)
         except Exception as exc:
+            # The socket may hold unread replies; don't hand it out again.
+            self._close_ws(ws)
             return ActionResult(
                 success=False,
                 message="",
                 error=f"Web action '{action}' failed: {exc}",
             )
-        finally:
-            _cdp_close(ws)
+        self._release_ws(ws_url, ws)
+        return result
 
     def press(self, combo: str) -> ActionResult:
         """Send a keyboard shortcut via CDP Input.dispatchKeyEvent.
@@ -113,46 +339,97 @@ class WebActionHandler(ActionHandler):
         This sends to the currently focused element in the most recently
         used tab. We need a websocket URL — use the CDP target list.
         """
-        from cup.platforms.web import (
-            _cdp_close,
-            _cdp_connect,
-            _cdp_get_targets,
-        )
-
-        port = int(os.environ.get("CUP_CDP_PORT", "9222"))
-        try:
-            targets = _cdp_get_targets(self._host, port)
-        except Exception as exc:
-            return ActionResult(
-                success=False,
-                message="",
-                error=f"Cannot connect to CDP for press: {exc}",
-            )
+        for use_cache in (True, False):
+            try:
+                targets, from_cache = self._get_targets(use_cache)
+            except Exception as exc:
+                return ActionResult(
+                    success=False,
+                    message="",
+                    error=f"Cannot connect to CDP for press: {exc}",
+                )
 
-        page_targets = [t for t in targets if t.get("type") == "page"]
-        if not page_targets:
-            return ActionResult(
-                success=False,
-                message="",
-                error="No browser tabs found for press",
-            )
+            page_targets = [t for t in targets if t.get("type") == "page"]
+            if not page_targets:
+                return ActionResult(
+                    success=False,
+                    message="",
+                    error="No browser tabs found for press",
+                )
 
-        ws_url = page_targets[0]["webSocketDebuggerUrl"]
-        ws = _cdp_connect(ws_url, self._host)
+            ws_url = page_targets[0]["webSocketDebuggerUrl"]
+            try:
+                ws = self._get_ws(ws_url)
+                break
+            except Exception as exc:
+                # A cached target may have gone away; refetch once.
+                self.invalidate_targets()
+                if not from_cache:
+                    return ActionResult(
+                        success=False,
+                        message="",
+                        error=f"Failed to press keys: {exc}",
+                    )
         try:
             self._send_key_combo(ws, combo)
-            return ActionResult(success=True, message=f"Pressed {combo}")
         except Exception as exc:
+            self._close_ws(ws)
             return ActionResult(
                 success=False,
                 message="",
                 error=f"Failed to press keys: {exc}",
             )
-        finally:
-            _cdp_close(ws)
+        self._release_ws(ws_url, ws)
+        return ActionResult(success=True, message=f"Pressed {combo}")
+
+    def _get_targets(self, use_cache: bool = True) -> tuple[list[dict], bool]:
+        """Return the CDP target list and whether it came from the cache.
+
+        press() may be called in quick succession (shortcut sequences), so
+        the list is reused for ``_TARGETS_TTL`` seconds.
+        """
+        from cup.platforms.web import _cdp_get_targets
+
+        cached = self._targets_cache
+        if use_cache and cached is not None:
+            targets, fetched_at = cached
+            if time.monotonic() - fetched_at < self._TARGETS_TTL:
+                return targets, True
+
+        targets = _cdp_get_targets(self._host, self._port)
+        self._targets_cache = (targets, time.monotonic())
+        return targets, False
+
+    def invalidate_targets(self) -> None:
+        """Forget the cached target list (e.g. after switching tabs)."""
+        self._targets_cache = None
 
     # -- dispatch -----------------------------------------------------------
 
+    # action name -> handler(self, ws, backend_node_id, params)
+    _ACTION_DISPATCH: dict[str, Callable[..., ActionResult]] = {
+        "click": lambda self, ws, node, params: self._click(ws, node),
+        "rightclick": lambda self, ws, node, params: self._mouse_click(ws, node, button="right"),
+        "doubleclick": lambda self, ws, node, params: self._mouse_click(
+            ws, node, button="left", click_count=2
+        ),
+        "type": lambda self, ws, node, params: self._type(ws, node, params.get("value", "")),
+        "setvalue": lambda self, ws, node, params: self._setvalue(
+            ws, node, params.get("value", "")
+        ),
+        "toggle": lambda self, ws, node, params: self._toggle(ws, node),
+        "expand": lambda self, ws, node, params: self._click(ws, node),
+        "collapse": lambda self, ws, node, params: self._click(ws, node),
+        "select": lambda self, ws, node, params: self._select(ws, node),
+        "scroll": lambda self, ws, node, params: self._scroll(
+            ws, node, params.get("direction", "down")
+        ),
+        "focus": lambda self, ws, node, params: self._focus(ws, node),
+        "dismiss": lambda self, ws, node, params: self._dismiss(ws),
+        "increment": lambda self, ws, node, params: self._arrow_key(ws, node, "ArrowUp"),
+        "decrement": lambda self, ws, node, params: self._arrow_key(ws, node, "ArrowDown"),
+    }
+
     def _dispatch(
         self,
         ws: Any,
@@ -160,42 +437,14 @@ class WebActionHandler(ActionHandler):
         action: str,
         params: dict,
     ) -> ActionResult:
-
-        if action == "click":
-            return self._click(ws, backend_node_id)
-        elif action == "rightclick":
-            return self._mouse_click(ws, backend_node_id, button="right")
-        elif action == "doubleclick":
-            return self._mouse_click(ws, backend_node_id, button="left", click_count=2)
-        elif action == "type":
-            text = params.get("value", "")
-            return self._type(ws, backend_node_id, text)
-        elif action == "setvalue":
-            text = params.get("value", "")
-            return self._setvalue(ws, backend_node_id, text)
-        elif action == "toggle":
-            return self._toggle(ws, backend_node_id)
-        elif action in ("expand", "collapse"):
-            return self._click(ws, backend_node_id)
-        elif action == "select":
-            return self._select(ws, backend_node_id)
-        elif action == "scroll":
-            direction = params.get("direction", "down")
-            return self._scroll(ws, backend_node_id, direction)
-        elif action == "focus":
-            return self._focus(ws, backend_node_id)
-        elif action == "dismiss":
-            return self._dismiss(ws)
-        elif action == "increment":
-            return self._arrow_key(ws, backend_node_id, "ArrowUp")
-        elif action == "decrement":
-            return self._arrow_key(ws, backend_node_id, "ArrowDown")
-        else:
+        handler = self._ACTION_DISPATCH.get(action)
+        if handler is None:
             return ActionResult(
                 success=False,
                 message="",
                 error=f"Action '{action}' not implemented for web",
             )
+        return handler(self, ws, backend_node_id, params)
 
     # -- individual actions -------------------------------------------------
 
@@ -210,7 +459,10 @@ class WebActionHandler(ActionHandler):
         button: str = "left",
         click_count: int = 1,
     ) -> ActionResult:
-        from cup.platforms.web import _cdp_send
+        from cup.platforms.web import _cdp_send, _cdp_send_batch
+
+        if self._js_click and self._js_click_node(ws, backend_node_id, button, click_count):
+            return ActionResult(success=True, message=_click_message(button, click_count))
 
         resp = _cdp_send(
             ws,
@@ -221,86 +473,159 @@ class WebActionHandler(ActionHandler):
         )
         x, y = _get_click_point(resp.get("result", {}))
 
+        commands: list[tuple[str, dict[str, Any]]] = []
         for i in range(click_count):
-            _cdp_send(
-                ws,
-                "Input.dispatchMouseEvent",
-                {
-                    "type": "mousePressed",
-                    "x": x,
-                    "y": y,
-                    "button": button,
-                    "clickCount": i + 1,
-                },
-            )
-            _cdp_send(
+            for event_type in ("mousePressed", "mouseReleased"):
+                commands.append(
+                    (
+                        "Input.dispatchMouseEvent",
+                        {
+                            "type": event_type,
+                            "x": x,
+                            "y": y,
+                            "button": button,
+                            "clickCount": i + 1,
+                        },
+                    )
+                )
+        _cdp_send_batch(ws, commands)
+
+        return ActionResult(success=True, message=_click_message(button, click_count))
+
+    def _js_click_node(
+        self,
+        ws: Any,
+        backend_node_id: int,
+        button: str,
+        click_count: int,
+    ) -> bool:
+        """Click a node by dispatching MouseEvents from page JS.
+
+        Returns False (so the caller falls back to coordinate input) if the
+        node cannot be resolved or the script fails.
+        """
+        try:
+            resp = self._call_on_node(
                 ws,
-                "Input.dispatchMouseEvent",
+                backend_node_id,
                 {
-                    "type": "mouseReleased",
-                    "x": x,
-                    "y": y,
-                    "button": button,
-                    "clickCount": i + 1,
+                    "functionDeclaration": _JS_CLICK_FUNCTION,
+                    "arguments": [{"value": button}, {"value": click_count}],
+                    "returnByValue": True,
                 },
             )
+        except RuntimeError:
+            return False
+        if resp is None:
+            return False
+        result = resp.get("result", {})
+        return "exceptionDetails" not in result and result.get("result", {}).get("value") is True
+
+    def _resolve(self, ws: Any, backend_node_id: int) -> str | None:
+        """Resolve a backend node to a Runtime objectId, reusing recent results."""
+        from cup.platforms.web import _cdp_send
 
-        action_name = {
-            ("left", 1): "Clicked",
-            ("left", 2): "Double-clicked",
-            ("right", 1): "Right-clicked",
-        }.get((button, click_count), f"Mouse {button} x{click_count}")
-        return ActionResult(success=True, message=action_name)
+        key = (id(ws), backend_node_id)
+        cached = self._resolve_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[1] < self._RESOLVE_TTL:
+                return cached[0]
+            self._forget_resolved(ws, key)
 
-    def _type(self, ws: Any, backend_node_id: int, text: str) -> ActionResult:
+        resp = _cdp_send(
+            ws,
+            "DOM.resolveNode",
+            {"backendNodeId": backend_node_id, "objectGroup": _OBJECT_GROUP},
+        )
+        object_id = resp.get("result", {}).get("object", {}).get("objectId")
+        if object_id:
+            self._resolve_cache[key] = (object_id, time.monotonic())
+        return object_id
+
+    def _forget_resolved(self, ws: Any, key: tuple[int, int]) -> None:
+        """Drop a cached objectId and release it in the page.
+
+        A pooled socket may stay busy and never be closed, so expired or
+        replaced objects are released one by one rather than left in the
+        group until close().
+        """
         from cup.platforms.web import _cdp_send
 
-        # Focus the element first
-        _cdp_send(ws, "DOM.focus", {"backendNodeId": backend_node_id})
-        time.sleep(0.05)
+        entry = self._resolve_cache.pop(key, None)
+        if entry is None:
+            return
+        try:
+            _cdp_send(ws, "Runtime.releaseObject", {"objectId": entry[0]})
+        except Exception:
+            pass  # already collected (e.g. after navigation)
+
+    def _call_on_node(self, ws: Any, backend_node_id: int, params: dict[str, Any]) -> dict | None:
+        """Runtime.callFunctionOn against a backend node.
+
+        Returns None if the node cannot be resolved. A cached objectId that
+        the page no longer knows is re-resolved once.
+        """
+        from cup.platforms.web import _cdp_send
 
-        # Select all existing content, then type new text
-        self._send_key_combo(ws, "ctrl+a")
-        time.sleep(0.05)
+        key = (id(ws), backend_node_id)
+        was_cached = key in self._resolve_cache
+        object_id = self._resolve(ws, backend_node_id)
+        if not object_id:
+            return None
+        try:
+            return _cdp_send(ws, "Runtime.callFunctionOn", {"objectId": object_id, **params})
+        except RuntimeError:
+            if not was_cached:
+                raise
+        self._forget_resolved(ws, key)
+        object_id = self._resolve(ws, backend_node_id)
+        if not object_id:
+            return None
+        return _cdp_send(ws, "Runtime.callFunctionOn", {"objectId": object_id, **params})
 
-        # Use insertText for reliable text input
-        _cdp_send(ws, "Input.insertText", {"text": text})
+    def _type(self, ws: Any, backend_node_id: int, text: str) -> ActionResult:
+        """Replace the element's text as if typed by the user.
+
+        Uses trusted Input events (one pipelined batch) rather than setting
+        ``value`` from page JS: it costs the same single round-trip, works
+        for contenteditable hosts, and frameworks that track input through
+        native value setters (e.g. React) see a real edit. ``setvalue`` is
+        the JS-assignment path.
+        """
+        from cup.platforms.web import _cdp_send, _cdp_send_batch
+
+        # Focus first and on its own: if it fails, the edit below must not
+        # land in whatever element had focus before.
+        _cdp_send(ws, "DOM.focus", {"backendNodeId": backend_node_id})
+        # Select all existing content, then insertText for reliable text
+        # input. CDP runs commands in order and each is applied before its
+        # reply, so no settle time is needed between them.
+        _cdp_send_batch(
+            ws,
+            [
+                *_key_combo_commands("ctrl+a"),
+                ("Input.insertText", {"text": text}),
+            ],
+        )
 
         return ActionResult(success=True, message=f"Typed: {text}")
 
     def _setvalue(self, ws: Any, backend_node_id: int, text: str) -> ActionResult:
-        from cup.platforms.web import _cdp_send
-
-        # Resolve the backend node to a Runtime object
-        resp = _cdp_send(
+        # Set value and dispatch input/change events
+        resp = self._call_on_node(
             ws,
-            "DOM.resolveNode",
+            backend_node_id,
             {
-                "backendNodeId": backend_node_id,
+                "functionDeclaration": _JS_SET_VALUE_FUNCTION,
+                "arguments": [{"value": text}],
             },
         )
-        object_id = resp.get("result", {}).get("object", {}).get("objectId")
-        if not object_id:
+        if resp is None:
             return ActionResult(
                 success=False,
                 message="",
                 error="Cannot resolve DOM node for setvalue",
             )
-
-        # Set value and dispatch input/change events
-        _cdp_send(
-            ws,
-            "Runtime.callFunctionOn",
-            {
-                "objectId": object_id,
-                "functionDeclaration": """function(v) {
-                this.value = v;
-                this.dispatchEvent(new Event('input', {bubbles: true}));
-                this.dispatchEvent(new Event('change', {bubbles: true}));
-            }""",
-                "arguments": [{"value": text}],
-            },
-        )
         return ActionResult(success=True, message=f"Set value to: {text}")
 
     def _scroll(
@@ -350,88 +675,46 @@ class WebActionHandler(ActionHandler):
         return ActionResult(success=True, message="Focused")
 
     def _toggle(self, ws: Any, backend_node_id: int) -> ActionResult:
-        from cup.platforms.web import _cdp_send
-
         # Use JS .click() for reliable toggling of checkboxes/switches
-        resp = _cdp_send(
+        resp = self._call_on_node(
             ws,
-            "DOM.resolveNode",
-            {
-                "backendNodeId": backend_node_id,
-            },
+            backend_node_id,
+            {"functionDeclaration": _JS_TOGGLE_FUNCTION},
         )
-        object_id = resp.get("result", {}).get("object", {}).get("objectId")
-        if not object_id:
+        if resp is None:
             # Fallback to coordinate click
             return self._click(ws, backend_node_id)
-
-        _cdp_send(
-            ws,
-            "Runtime.callFunctionOn",
-            {
-                "objectId": object_id,
-                "functionDeclaration": "function() { this.click(); }",
-            },
-        )
         return ActionResult(success=True, message="Toggled")
 
     def _select(self, ws: Any, backend_node_id: int) -> ActionResult:
-        from cup.platforms.web import _cdp_send
-
         # Handle <option> elements by setting selected on the option
         # and dispatching change on the parent <select>
-        resp = _cdp_send(
+        resp = self._call_on_node(
             ws,
-            "DOM.resolveNode",
+            backend_node_id,
             {
-                "backendNodeId": backend_node_id,
+                "functionDeclaration": _JS_SELECT_FUNCTION,
             },
         )
-        object_id = resp.get("result", {}).get("object", {}).get("objectId")
-        if not object_id:
+        if resp is None:
             return self._click(ws, backend_node_id)
-
-        _cdp_send(
-            ws,
-            "Runtime.callFunctionOn",
-            {
-                "objectId": object_id,
-                "functionDeclaration": """function() {
-                if (this.tagName === 'OPTION') {
-                    this.selected = true;
-                    if (this.parentElement) {
-                        this.parentElement.dispatchEvent(
-                            new Event('change', {bubbles: true})
-                        );
-                    }
-                } else {
-                    this.click();
-                }
-            }""",
-            },
-        )
         return ActionResult(success=True, message="Selected")
 
     def _dismiss(self, ws: Any) -> ActionResult:
-        from cup.platforms.web import _cdp_send
+        from cup.platforms.web import _cdp_send_batch
 
-        _cdp_send(
+        _cdp_send_batch(
             ws,
-            "Input.dispatchKeyEvent",
-            {
-                "type": "keyDown",
-                "key": "Escape",
-                "code": "Escape",
-            },
-        )
-        _cdp_send(
-            ws,
-            "Input.dispatchKeyEvent",
-            {
-                "type": "keyUp",
-                "key": "Escape",
-                "code": "Escape",
-            },
+            [
+                (
+                    "Input.dispatchKeyEvent",
+                    {"type": "keyDown", "key": "Escape", "code": "Escape"},
+                ),
+                (
+                    "Input.dispatchKeyEvent",
+                    {"type": "keyUp", "key": "Escape", "code": "Escape"},
+                ),
+            ],
         )
         return ActionResult(success=True, message="Dismissed (Escape)")
 
@@ -441,28 +724,17 @@ class WebActionHandler(ActionHandler):
         backend_node_id: int,
         key: str,
     ) -> ActionResult:
-        from cup.platforms.web import _cdp_send
+        from cup.platforms.web import _cdp_send, _cdp_send_batch
 
-        _cdp_send(ws, "DOM.focus", {"backendNodeId": backend_node_id})
-        time.sleep(0.05)
         code = key  # ArrowUp, ArrowDown are both key and code
-        _cdp_send(
-            ws,
-            "Input.dispatchKeyEvent",
-            {
-                "type": "keyDown",
-                "key": key,
-                "code": code,
-            },
-        )
-        _cdp_send(
+        # Focus on its own so a failure stops before any key is sent.
+        _cdp_send(ws, "DOM.focus", {"backendNodeId": backend_node_id})
+        _cdp_send_batch(
             ws,
-            "Input.dispatchKeyEvent",
-            {
-                "type": "keyUp",
-                "key": key,
-                "code": code,
-            },
+            [
+                ("Input.dispatchKeyEvent", {"type": "keyDown", "key": key, "code": code}),
+                ("Input.dispatchKeyEvent", {"type": "keyUp", "key": key, "code": code}),
+            ],
         )
         verb = "Incremented" if key == "ArrowUp" else "Decremented"
         return ActionResult(success=True, message=verb)
@@ -470,82 +742,13 @@ class WebActionHandler(ActionHandler):
     # -- keyboard helpers ---------------------------------------------------
 
     def _send_key_combo(self, ws: Any, combo: str) -> None:
-        """Parse a key combo and send via CDP Input.dispatchKeyEvent."""
-        from cup.platforms.web import _cdp_send
+        """Parse a key combo and send it via CDP Input.dispatchKeyEvent.
 
-        modifiers, keys = parse_combo(combo)
-
-        # Calculate modifier bitmask
-        mod_bits = 0
-        for mod in modifiers:
-            info = _CDP_MODIFIER_MAP.get(mod)
-            if info:
-                mod_bits |= info["bit"]
-
-        # Press modifiers down
-        for mod in modifiers:
-            info = _CDP_MODIFIER_MAP.get(mod)
-            if info:
-                _cdp_send(
-                    ws,
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyDown",
-                        "key": info["key"],
-                        "code": info["code"],
-                        "modifiers": mod_bits,
-                    },
-                )
-
-        # Press and release main keys
-        for key in keys:
-            mapped = _CDP_KEY_MAP.get(key)
-            if mapped:
-                cdp_key = mapped["key"]
-                cdp_code = mapped["code"]
-                text = ""
-            elif len(key) == 1:
-                cdp_key = key
-                cdp_code = f"Key{key.upper()}" if key.isalpha() else ""
-                text = key
-            else:
-                continue
-
-            params: dict[str, Any] = {
-                "type": "keyDown",
-                "key": cdp_key,
-                "code": cdp_code,
-                "modifiers": mod_bits,
-            }
-            if text and not mod_bits:
-                params["text"] = text
-            _cdp_send(ws, "Input.dispatchKeyEvent", params)
-
-            _cdp_send(
-                ws,
-                "Input.dispatchKeyEvent",
-                {
-                    "type": "keyUp",
-                    "key": cdp_key,
-                    "code": cdp_code,
-                    "modifiers": mod_bits,
-                },
-            )
+        All key events are pipelined in a single batch.
+        """
+        from cup.platforms.web import _cdp_send_batch
 
-        # Release modifiers
-        for mod in reversed(modifiers):
-            info = _CDP_MODIFIER_MAP.get(mod)
-            if info:
-                _cdp_send(
-                    ws,
-                    "Input.dispatchKeyEvent",
-                    {
-                        "type": "keyUp",
-                        "key": info["key"],
-                        "code": info["code"],
-                        "modifiers": 0,
-                    },
-                )
+        _cdp_send_batch(ws, _key_combo_commands(combo))
 
     def open_app(self, name: str) -> ActionResult:
         return ActionResult(
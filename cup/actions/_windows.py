@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-import base64
-import csv
+import array
 import ctypes
 import ctypes.wintypes
-import difflib
-import glob
-import io
+import functools
+import heapq
 import os
-import re
-import subprocess
+import sys
+import threading
 import time
+from collections import Counter
+from collections.abc import Callable, Collection, Iterable, Iterator
 from typing import Any
 
 from cup.actions._handler import ActionHandler
@@ -30,6 +30,38 @@ UIA_SelectionItemPatternId = 10010
 UIA_TogglePatternId = 10015
 UIA_RangeValuePatternId = 10013
 
+_PATTERN_IDS = (
+    UIA_InvokePatternId,
+    UIA_ValuePatternId,
+    UIA_ScrollPatternId,
+    UIA_ExpandCollapsePatternId,
+    UIA_SelectionItemPatternId,
+    UIA_TogglePatternId,
+    UIA_RangeValuePatternId,
+)
+
+# ---------------------------------------------------------------------------
+# UIA property IDs read by actions
+# ---------------------------------------------------------------------------
+
+UIA_BoundingRectanglePropertyId = 30001
+UIA_NativeWindowHandlePropertyId = 30020
+UIA_ValueIsReadOnlyPropertyId = 30046
+UIA_RangeValueValuePropertyId = 30047
+UIA_RangeValueMinimumPropertyId = 30049
+UIA_RangeValueMaximumPropertyId = 30050
+UIA_RangeValueSmallChangePropertyId = 30052
+
+_ACTION_PROP_IDS = (
+    UIA_BoundingRectanglePropertyId,
+    UIA_NativeWindowHandlePropertyId,
+    UIA_ValueIsReadOnlyPropertyId,
+    UIA_RangeValueValuePropertyId,
+    UIA_RangeValueMinimumPropertyId,
+    UIA_RangeValueMaximumPropertyId,
+    UIA_RangeValueSmallChangePropertyId,
+)
+
 # ---------------------------------------------------------------------------
 # UIA pattern interfaces — lazily imported after comtypes generates them
 # ---------------------------------------------------------------------------
@@ -42,10 +74,14 @@ _ISelectionItem = None
 _IScroll = None
 _IRangeValue = None
 
+# Cache request that snapshots every pattern and property an action may read,
+# so one BuildUpdatedCache round-trip replaces the per-read RPCs.
+_action_cr = None
+
 
 def _ensure_pattern_interfaces():
     global _IInvoke, _IToggle, _IValue, _IExpandCollapse
-    global _ISelectionItem, _IScroll, _IRangeValue
+    global _ISelectionItem, _IScroll, _IRangeValue, _action_cr
     if _IInvoke is not None:
         return
     from comtypes.gen.UIAutomationClient import (
@@ -66,20 +102,85 @@ def _ensure_pattern_interfaces():
     _IScroll = IUIAutomationScrollPattern
     _IRangeValue = IUIAutomationRangeValuePattern
 
+    try:
+        _action_cr = _make_action_cache_request()
+    except Exception:
+        _action_cr = None  # fall back to live reads
+
+
+def _make_action_cache_request():
+    """Build a cache request covering every pattern and property actions use."""
+    from cup.platforms.windows import init_uia
+
+    cr = init_uia().CreateCacheRequest()
+    for pattern_id in _PATTERN_IDS:
+        cr.AddPattern(pattern_id)
+    for prop_id in _ACTION_PROP_IDS:
+        cr.AddProperty(prop_id)
+    return cr
+
+
+def _refresh(element):
+    """Return a copy of *element* with the action cache populated.
+
+    Falls back to the original element if caching is unavailable or the
+    element can no longer be reached.
+    """
+    if _action_cr is None:
+        return element
+    try:
+        return element.BuildUpdatedCache(_action_cr) or element
+    except Exception:
+        return element
+
 
 def _get_pattern(element, pattern_id, interface):
-    """Get a UIA pattern from an element, returning None if unavailable."""
+    """Get a UIA pattern from an element, returning None if unavailable.
+
+    Reads the cached pattern first and only falls back to a live
+    ``GetCurrentPattern`` call when the element has no cached copy.
+    """
     import comtypes
 
-    try:
-        pat = element.GetCurrentPattern(pattern_id)
-        if pat:
-            return pat.QueryInterface(interface)
-    except (comtypes.COMError, Exception):
-        pass
+    for getter in ("GetCachedPattern", "GetCurrentPattern"):
+        try:
+            pat = getattr(element, getter)(pattern_id)
+            if pat:
+                return pat.QueryInterface(interface)
+        except (comtypes.COMError, Exception):
+            continue
     return None
 
 
+def _cached_or_current(obj, name: str):
+    """Read ``Cached<name>`` from a UIA object, falling back to ``Current<name>``."""
+    try:
+        return getattr(obj, "Cached" + name)
+    except Exception:
+        return getattr(obj, "Current" + name)
+
+
+def _is_read_only(pat) -> bool:
+    """Whether a ValuePattern reports its value as read-only (False if unknown)."""
+    try:
+        return bool(_cached_or_current(pat, "IsReadOnly"))
+    except Exception:
+        return False
+
+
+def _range_values(pat) -> tuple[float, float, float, float]:
+    """Read (value, small change, minimum, maximum) from a RangeValue pattern.
+
+    Uses the cached snapshot when the pattern came from the action cache;
+    otherwise the first failed cached read switches all four to live reads.
+    """
+    names = ("Value", "SmallChange", "Minimum", "Maximum")
+    try:
+        return tuple(getattr(pat, "Cached" + n) for n in names)
+    except Exception:
+        return tuple(getattr(pat, "Current" + n) for n in names)
+
+
 # ---------------------------------------------------------------------------
 # Win32 SendInput keyboard
 # ---------------------------------------------------------------------------
@@ -186,7 +287,262 @@ class INPUT(ctypes.Structure):
     ]
 
 
-def _make_key_input(vk: int, *, down: bool = True) -> INPUT:
+# cbSize argument for every SendInput call.
+_INPUT_SIZE = ctypes.sizeof(INPUT)
+
+
+class SHELLEXECUTEINFOW(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.wintypes.DWORD),
+        ("fMask", ctypes.wintypes.ULONG),
+        ("hwnd", ctypes.wintypes.HWND),
+        ("lpVerb", ctypes.wintypes.LPCWSTR),
+        ("lpFile", ctypes.wintypes.LPCWSTR),
+        ("lpParameters", ctypes.wintypes.LPCWSTR),
+        ("lpDirectory", ctypes.wintypes.LPCWSTR),
+        ("nShow", ctypes.c_int),
+        ("hInstApp", ctypes.wintypes.HINSTANCE),
+        ("lpIDList", ctypes.c_void_p),
+        ("lpClass", ctypes.wintypes.LPCWSTR),
+        ("hkeyClass", ctypes.wintypes.HKEY),
+        ("dwHotKey", ctypes.wintypes.DWORD),
+        ("hIconOrMonitor", ctypes.wintypes.HANDLE),
+        ("hProcess", ctypes.wintypes.HANDLE),
+    ]
+
+
+class THREADENTRY32(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("cntUsage", ctypes.wintypes.DWORD),
+        ("th32ThreadID", ctypes.wintypes.DWORD),
+        ("th32OwnerProcessID", ctypes.wintypes.DWORD),
+        ("tpBasePri", ctypes.wintypes.LONG),
+        ("tpDeltaPri", ctypes.wintypes.LONG),
+        ("dwFlags", ctypes.wintypes.DWORD),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# user32 entry points — bound once with explicit prototypes
+# ---------------------------------------------------------------------------
+
+if sys.platform == "win32":
+    # use_last_error=True so ctypes.get_last_error() reports real failures.
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    WNDENUMPROC = ctypes.WINFUNCTYPE(
+        ctypes.wintypes.BOOL,
+        ctypes.wintypes.HWND,
+        ctypes.wintypes.LPARAM,
+    )
+
+    _SendInput = _user32.SendInput
+    _SendInput.argtypes = [ctypes.wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+    _SendInput.restype = ctypes.wintypes.UINT
+
+    _GetSystemMetrics = _user32.GetSystemMetrics
+    _GetSystemMetrics.argtypes = [ctypes.c_int]
+    _GetSystemMetrics.restype = ctypes.c_int
+
+    _EnumWindows = _user32.EnumWindows
+    _EnumWindows.argtypes = [WNDENUMPROC, ctypes.wintypes.LPARAM]
+    _EnumWindows.restype = ctypes.wintypes.BOOL
+
+    _GetWindowTextW = _user32.GetWindowTextW
+    _GetWindowTextW.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.LPWSTR, ctypes.c_int]
+    _GetWindowTextW.restype = ctypes.c_int
+
+    _IsWindowVisible = _user32.IsWindowVisible
+    _IsWindowVisible.argtypes = [ctypes.wintypes.HWND]
+    _IsWindowVisible.restype = ctypes.wintypes.BOOL
+
+    _GetForegroundWindow = _user32.GetForegroundWindow
+    _GetForegroundWindow.argtypes = []
+    _GetForegroundWindow.restype = ctypes.wintypes.HWND
+
+    _GetAncestor = _user32.GetAncestor
+    _GetAncestor.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.UINT]
+    _GetAncestor.restype = ctypes.wintypes.HWND
+
+    _EnumThreadWindows = _user32.EnumThreadWindows
+    _EnumThreadWindows.argtypes = [ctypes.wintypes.DWORD, WNDENUMPROC, ctypes.wintypes.LPARAM]
+    _EnumThreadWindows.restype = ctypes.wintypes.BOOL
+
+    WINEVENTPROC = ctypes.WINFUNCTYPE(
+        None,
+        ctypes.wintypes.HANDLE,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.HWND,
+        ctypes.wintypes.LONG,
+        ctypes.wintypes.LONG,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+    )
+
+    _SetWinEventHook = _user32.SetWinEventHook
+    _SetWinEventHook.argtypes = [
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.HMODULE,
+        WINEVENTPROC,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+    ]
+    _SetWinEventHook.restype = ctypes.wintypes.HANDLE
+
+    _UnhookWinEvent = _user32.UnhookWinEvent
+    _UnhookWinEvent.argtypes = [ctypes.wintypes.HANDLE]
+    _UnhookWinEvent.restype = ctypes.wintypes.BOOL
+
+    _MsgWaitForMultipleObjects = _user32.MsgWaitForMultipleObjects
+    _MsgWaitForMultipleObjects.argtypes = [
+        ctypes.wintypes.DWORD,
+        ctypes.POINTER(ctypes.wintypes.HANDLE),
+        ctypes.wintypes.BOOL,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+    ]
+    _MsgWaitForMultipleObjects.restype = ctypes.wintypes.DWORD
+
+    _PeekMessageW = _user32.PeekMessageW
+    _PeekMessageW.argtypes = [
+        ctypes.POINTER(ctypes.wintypes.MSG),
+        ctypes.wintypes.HWND,
+        ctypes.wintypes.UINT,
+        ctypes.wintypes.UINT,
+        ctypes.wintypes.UINT,
+    ]
+    _PeekMessageW.restype = ctypes.wintypes.BOOL
+
+    _TranslateMessage = _user32.TranslateMessage
+    _TranslateMessage.argtypes = [ctypes.POINTER(ctypes.wintypes.MSG)]
+    _TranslateMessage.restype = ctypes.wintypes.BOOL
+
+    _DispatchMessageW = _user32.DispatchMessageW
+    _DispatchMessageW.argtypes = [ctypes.POINTER(ctypes.wintypes.MSG)]
+    _DispatchMessageW.restype = ctypes.wintypes.LPARAM
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _CreateToolhelp32Snapshot = _kernel32.CreateToolhelp32Snapshot
+    _CreateToolhelp32Snapshot.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.DWORD]
+    _CreateToolhelp32Snapshot.restype = ctypes.wintypes.HANDLE
+
+    _Thread32First = _kernel32.Thread32First
+    _Thread32First.argtypes = [ctypes.wintypes.HANDLE, ctypes.POINTER(THREADENTRY32)]
+    _Thread32First.restype = ctypes.wintypes.BOOL
+
+    _Thread32Next = _kernel32.Thread32Next
+    _Thread32Next.argtypes = [ctypes.wintypes.HANDLE, ctypes.POINTER(THREADENTRY32)]
+    _Thread32Next.restype = ctypes.wintypes.BOOL
+
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = [ctypes.wintypes.HANDLE]
+    _CloseHandle.restype = ctypes.wintypes.BOOL
+
+    _GetProcessId = _kernel32.GetProcessId
+    _GetProcessId.argtypes = [ctypes.wintypes.HANDLE]
+    _GetProcessId.restype = ctypes.wintypes.DWORD
+
+    _shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+
+    _ShellExecuteExW = _shell32.ShellExecuteExW
+    _ShellExecuteExW.argtypes = [ctypes.POINTER(SHELLEXECUTEINFOW)]
+    _ShellExecuteExW.restype = ctypes.wintypes.BOOL
+
+GA_ROOT = 2
+TH32CS_SNAPTHREAD = 0x00000004
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+EVENT_OBJECT_SHOW = 0x8002
+OBJID_WINDOW = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+QS_ALLINPUT = 0x04FF
+PM_REMOVE = 0x0001
+SEE_MASK_NOCLOSEPROCESS = 0x00000040
+SEE_MASK_FLAG_NO_UI = 0x00000400
+SW_SHOWNORMAL = 1
+
+
+def _process_threads(pid: int) -> list[int]:
+    """Return the IDs of the threads currently owned by process *pid*."""
+    snapshot = _CreateToolhelp32Snapshot(TH32CS_SNAPTHREAD, 0)
+    if not snapshot or snapshot == _INVALID_HANDLE_VALUE:
+        return []
+    try:
+        entry = THREADENTRY32()
+        entry.dwSize = ctypes.sizeof(THREADENTRY32)
+        threads = []
+        ok = _Thread32First(snapshot, ctypes.byref(entry))
+        while ok:
+            if entry.th32OwnerProcessID == pid:
+                threads.append(entry.th32ThreadID)
+            ok = _Thread32Next(snapshot, ctypes.byref(entry))
+        return threads
+    finally:
+        _CloseHandle(snapshot)
+
+
+class _WindowShowWaiter:
+    """Sleeps between window polls, waking early when any window is shown.
+
+    An out-of-context EVENT_OBJECT_SHOW hook is delivered to this thread
+    while it pumps messages, so a poll runs as soon as something appears
+    instead of at the end of the backoff delay. Without the hook (or off
+    Windows) it is a plain sleep.
+    """
+
+    def __init__(self) -> None:
+        self._shown = False
+        self._hook: Any = None
+        self._proc: Any = None
+
+    def __enter__(self) -> _WindowShowWaiter:
+        if sys.platform == "win32":
+            # Keep the thunk referenced for as long as the hook is installed.
+            self._proc = WINEVENTPROC(self._on_event)
+            self._hook = _SetWinEventHook(
+                EVENT_OBJECT_SHOW,
+                EVENT_OBJECT_SHOW,
+                None,
+                self._proc,
+                0,
+                0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+            )
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        hook, self._hook = self._hook, None
+        if hook:
+            _UnhookWinEvent(hook)
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread, ms) -> None:
+        if id_object == OBJID_WINDOW:
+            self._shown = True
+
+    def sleep(self, delay: float) -> None:
+        """Wait up to *delay* seconds, or until a window is shown."""
+        if not self._hook:
+            time.sleep(delay)
+            return
+        deadline = time.monotonic() + delay
+        msg = ctypes.wintypes.MSG()
+        while not self._shown:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _MsgWaitForMultipleObjects(0, None, False, int(remaining * 1000) + 1, QS_ALLINPUT)
+            # Pumping is what delivers the hook callbacks to this thread.
+            while _PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                _TranslateMessage(ctypes.byref(msg))
+                _DispatchMessageW(ctypes.byref(msg))
+        self._shown = False
+
+
+def _build_key_input(vk: int, *, down: bool) -> INPUT:
     flags = 0 if down else KEYEVENTF_KEYUP
     if vk in _EXTENDED_VKS:
         flags |= KEYEVENTF_EXTENDEDKEY
@@ -197,14 +553,60 @@ def _make_key_input(vk: int, *, down: bool = True) -> INPUT:
     return inp
 
 
-def _send_key_combo(keys_string: str) -> None:
-    """Parse 'ctrl+s', 'enter', etc. and send via SendInput."""
+# Prebuilt key-down/key-up events for every named key.  INPUT arrays copy
+# their elements on construction, so the templates are shared read-only.
+_KEY_DOWN_TEMPLATES: dict[int, INPUT] = {
+    vk: _build_key_input(vk, down=True) for vk in _EXTENDED_VKS | set(VK_MAP.values())
+}
+_KEY_UP_TEMPLATES: dict[int, INPUT] = {
+    vk: _build_key_input(vk, down=False) for vk in _KEY_DOWN_TEMPLATES
+}
+
+
+def _make_key_input(vk: int, *, down: bool = True) -> INPUT:
+    """Return a keyboard INPUT for *vk*; callers must not mutate the result."""
+    templates = _KEY_DOWN_TEMPLATES if down else _KEY_UP_TEMPLATES
+    inp = templates.get(vk)
+    if inp is None:
+        inp = _build_key_input(vk, down=down)
+    return inp
+
+
+# Shell hotkeys that drop the main key unless the Win modifier has been
+# registered first.  Keys are normalized by _combo_key.
+_SLOW_COMBOS = frozenset(
+    {
+        "meta+r",
+        "meta+e",
+        "meta+d",
+        "meta+i",
+        "meta+l",
+        "meta+s",
+        "meta+x",
+        "meta+tab",
+    }
+)
+
+
+def _combo_key(mod_names: list[str], key_names: list[str]) -> str:
+    """Normalize a parsed combo to the form used by _SLOW_COMBOS."""
+    return "+".join(sorted(mod_names) + key_names)
+
+
+# Map modifier names to VK codes ("meta" → VK_LWIN via VK_MAP["win"])
+_MOD_TO_VK = {"ctrl": 0xA2, "alt": 0xA4, "shift": 0xA0, "meta": 0x5B}
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_combo(keys_string: str) -> tuple[tuple[int, ...], tuple[int, ...], bool]:
+    """Resolve a combo to (modifier VKs, main-key VKs, needs modifier settle).
+
+    Memoized; workflows press the same few combos repeatedly.
+    """
     from cup.actions._keys import parse_combo
 
     mod_names, key_names = parse_combo(keys_string)
 
-    # Map modifier names to VK codes ("meta" → VK_LWIN via VK_MAP["win"])
-    _MOD_TO_VK = {"ctrl": 0xA2, "alt": 0xA4, "shift": 0xA0, "meta": 0x5B}
     modifiers = [_MOD_TO_VK[m] for m in mod_names if m in _MOD_TO_VK]
 
     main_keys = []
@@ -220,37 +622,105 @@ def _send_key_combo(keys_string: str) -> None:
         main_keys = modifiers
         modifiers = []
 
-    inputs = []
-    for mod in modifiers:
-        inputs.append(_make_key_input(mod, down=True))
-    for key in main_keys:
-        inputs.append(_make_key_input(key, down=True))
-    for key in reversed(main_keys):
-        inputs.append(_make_key_input(key, down=False))
-    for mod in reversed(modifiers):
-        inputs.append(_make_key_input(mod, down=False))
-
-    if not inputs:
+    slow = _combo_key(mod_names, key_names) in _SLOW_COMBOS
+    return tuple(modifiers), tuple(main_keys), slow
+
+
+def _send_key_combo(keys_string: str) -> None:
+    """Parse 'ctrl+s', 'enter', etc. and send via SendInput."""
+    modifiers, main_keys, slow = _resolve_combo(keys_string)
+
+    n = 2 * (len(modifiers) + len(main_keys))
+    if not n:
         raise RuntimeError(f"Could not resolve any key codes from combo: {keys_string!r}")
 
-    # Send modifier-down events first, pause briefly, then the rest.
-    # This gives the OS time to register modifier state before the main key,
-    # which is important for system-level hotkeys like Win+R.
+    # Fill a preallocated array slot by slot; assigning a template copies it
+    # in place, with no intermediate list or varargs constructor call.
+    arr = (INPUT * n)()
+    i = 0
+    for vk in (*modifiers, *main_keys):
+        arr[i] = _make_key_input(vk, down=True)
+        i += 1
+    for vk in (*reversed(main_keys), *reversed(modifiers)):
+        arr[i] = _make_key_input(vk, down=False)
+        i += 1
+
+    # One SendInput call is atomic with respect to other input, so the
+    # modifiers are registered before the main key without any pause.
+    # Only shell hotkeys handled by Explorer (Win+R and friends) need the
+    # modifier state to settle first.
     n_mods = len(modifiers)
-    if n_mods > 0 and len(inputs) > n_mods:
-        mod_arr = (INPUT * n_mods)(*inputs[:n_mods])
-        ctypes.windll.user32.SendInput(n_mods, mod_arr, ctypes.sizeof(INPUT))
+    if slow and n_mods and n > n_mods:
+        _SendInput(n_mods, (INPUT * n_mods).from_buffer(arr), _INPUT_SIZE)
         time.sleep(0.02)
-        rest = inputs[n_mods:]
-        rest_arr = (INPUT * len(rest))(*rest)
-        sent = ctypes.windll.user32.SendInput(len(rest), rest_arr, ctypes.sizeof(INPUT))
+        rest = (INPUT * (n - n_mods)).from_buffer(arr, n_mods * _INPUT_SIZE)
+        sent = _SendInput(n - n_mods, rest, _INPUT_SIZE)
     else:
-        arr = (INPUT * len(inputs))(*inputs)
-        sent = ctypes.windll.user32.SendInput(len(inputs), arr, ctypes.sizeof(INPUT))
+        sent = _SendInput(n, arr, _INPUT_SIZE)
 
     if sent == 0:
         err = ctypes.get_last_error()
-        raise RuntimeError(f"SendInput failed, sent 0/{len(inputs)} events (error={err})")
+        raise RuntimeError(f"SendInput failed, sent 0/{n} events (error={err})")
+
+
+# Byte offsets inside one INPUT record, used by _unicode_inputs to fill
+# many records at once through strided memoryview writes.
+_KI_OFFSET = INPUT._input.offset + _INPUT_UNION.ki.offset
+_VK_OFFSET = _KI_OFFSET + KEYBDINPUT.wVk.offset
+_SCAN_OFFSET = _KI_OFFSET + KEYBDINPUT.wScan.offset
+_FLAGS_OFFSET = _KI_OFFSET + KEYBDINPUT.dwFlags.offset
+
+# Control characters sent as virtual-key presses instead of Unicode scan codes.
+_CONTROL_VK = {
+    "\n": 0x0D,  # VK_RETURN
+    "\t": 0x09,  # VK_TAB
+}
+
+
+def _unicode_inputs(text: str) -> ctypes.Array:
+    """Build the key-down/key-up INPUT records for *text* in bulk.
+
+    Every UTF-16 code unit becomes a KEYEVENTF_UNICODE down/up pair, so
+    characters outside the BMP go out as surrogate pairs.  The records are
+    packed into one buffer with strided memoryview assignments; only the
+    control characters in _CONTROL_VK are patched individually.
+    """
+    encoded = text.encode("utf-16-le")
+    units = array.array("H", encoded)
+    n = len(units)
+    buf = bytearray(2 * n * _INPUT_SIZE)
+    u16 = memoryview(buf).cast("H")
+    u32 = memoryview(buf).cast("I")
+    rec16 = _INPUT_SIZE // 2
+    rec32 = _INPUT_SIZE // 4
+
+    u32[::rec32] = array.array("I", [INPUT_KEYBOARD]) * (2 * n)
+    scan = _SCAN_OFFSET // 2
+    u16[scan :: 2 * rec16] = units
+    u16[scan + rec16 :: 2 * rec16] = units
+    flags = _FLAGS_OFFSET // 4
+    u32[flags :: 2 * rec32] = array.array("I", [KEYEVENTF_UNICODE]) * n
+    u32[flags + rec32 :: 2 * rec32] = array.array("I", [KEYEVENTF_UNICODE | KEYEVENTF_KEYUP]) * n
+
+    for char, vk in _CONTROL_VK.items():
+        needle = char.encode("utf-16-le")
+        pos = encoded.find(needle)
+        while pos != -1:
+            if pos % 2 == 0:  # skip matches straddling two code units
+                down = pos * _INPUT_SIZE  # record 2 * (pos // 2)
+                for base, key_flags in ((down, 0), (down + _INPUT_SIZE, KEYEVENTF_KEYUP)):
+                    u16[(base + _VK_OFFSET) // 2] = vk
+                    u16[(base + _SCAN_OFFSET) // 2] = 0
+                    u32[(base + _FLAGS_OFFSET) // 4] = key_flags
+            pos = encoded.find(needle, pos + 1)
+
+    return (INPUT * (2 * n)).from_buffer(buf)
+
+
+# INPUT records per SendInput call when typing (50 code units, kept even so
+# a key-down is never separated from its key-up) and the pause between calls.
+_UNICODE_CHUNK = 100
+_UNICODE_CHUNK_PAUSE = 0.005
 
 
 def _send_unicode_string(text: str) -> None:
@@ -272,52 +742,50 @@ def _send_unicode_string(text: str) -> None:
     # We'll emit VK_RETURN for every \n below.
     text = text.replace("\r\n", "\n").replace("\r", "\n")
 
-    # Map control characters to their virtual-key codes.
-    _CONTROL_VK = {
-        "\n": 0x0D,  # VK_RETURN
-        "\t": 0x09,  # VK_TAB
-    }
+    arr = _unicode_inputs(text)
 
-    inputs: list[INPUT] = []
-    for char in text:
-        vk = _CONTROL_VK.get(char)
-        if vk is not None:
-            # Send control character as a normal virtual-key press.
-            inputs.append(_make_key_input(vk, down=True))
-            inputs.append(_make_key_input(vk, down=False))
-        else:
-            code = ord(char)
-            # Key down
-            inp_down = INPUT()
-            inp_down.type = INPUT_KEYBOARD
-            inp_down._input.ki.wVk = 0
-            inp_down._input.ki.wScan = code
-            inp_down._input.ki.dwFlags = KEYEVENTF_UNICODE
-            inputs.append(inp_down)
-            # Key up
-            inp_up = INPUT()
-            inp_up.type = INPUT_KEYBOARD
-            inp_up._input.ki.wVk = 0
-            inp_up._input.ki.wScan = code
-            inp_up._input.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
-            inputs.append(inp_up)
-
-    # Send all events in a single atomic SendInput call.
-    _flush_inputs(inputs)
-
-
-def _flush_inputs(inputs: list[INPUT]) -> None:
-    """Send a batch of INPUT events via SendInput with a brief trailing pause."""
-    if not inputs:
+    # Short strings go out in one atomic SendInput call.  Longer ones are
+    # split into zero-copy views over the array so a single burst cannot
+    # overflow the target's message queue; only the gaps between chunks
+    # pay a pause.
+    total = len(arr)
+    for start in range(0, total, _UNICODE_CHUNK):
+        n = min(_UNICODE_CHUNK, total - start)
+        chunk = (INPUT * n).from_buffer(arr, start * _INPUT_SIZE)
+        more = start + n < total
+        _flush_inputs(chunk, trailing_sleep=_UNICODE_CHUNK_PAUSE if more else 0.0)
+
+
+def _flush_inputs(arr: ctypes.Array, *, trailing_sleep: float = 0.0) -> None:
+    """Send an array of INPUT events via SendInput, optionally pausing afterwards."""
+    if not len(arr):
         return
-    arr = (INPUT * len(inputs))(*inputs)
-    sent = ctypes.windll.user32.SendInput(len(inputs), arr, ctypes.sizeof(INPUT))
+    sent = _SendInput(len(arr), arr, _INPUT_SIZE)
     if sent == 0:
         err = ctypes.get_last_error()
-        raise RuntimeError(f"SendInput (unicode) failed, sent 0/{len(inputs)} events (error={err})")
-    # Brief pause gives the target app time to process the events before
-    # the next chunk arrives.
-    time.sleep(0.01)
+        raise RuntimeError(f"SendInput (unicode) failed, sent 0/{len(arr)} events (error={err})")
+    if trailing_sleep > 0:
+        time.sleep(trailing_sleep)
+
+
+def _wait_for_foreground(element, timeout: float = 0.05) -> None:
+    """Wait until *element*'s top-level window is in the foreground.
+
+    Keyboard input goes to the foreground window, so this replaces a fixed
+    settle delay after SetFocus.  Waits the full *timeout* only when the
+    element has no window handle to check.
+    """
+    try:
+        hwnd = _cached_or_current(element, "NativeWindowHandle")
+    except Exception:
+        hwnd = 0
+    if not hwnd:
+        time.sleep(timeout)
+        return
+    root = _GetAncestor(hwnd, GA_ROOT) or hwnd
+    deadline = time.monotonic() + timeout
+    while _GetForegroundWindow() != root and time.monotonic() < deadline:
+        time.sleep(0.005)
 
 
 # ---------------------------------------------------------------------------
@@ -335,22 +803,35 @@ MOUSEEVENTF_ABSOLUTE = 0x8000
 
 def _get_element_click_point(element) -> tuple[int, int]:
     """Get the center point of a UIA element in screen coordinates."""
-    rect = element.CurrentBoundingRectangle
+    rect = _cached_or_current(element, "BoundingRectangle")
     cx = (rect.left + rect.right) // 2
     cy = (rect.top + rect.bottom) // 2
     return cx, cy
 
 
+# Primary screen size, re-read at most every _SCREEN_TTL seconds so
+# resolution changes are still picked up.
+_SCREEN_TTL = 5.0
+_SCREEN_TS = float("-inf")
+_SCREEN_W = 1
+_SCREEN_H = 1
+
+
 def _screen_to_absolute(x: int, y: int) -> tuple[int, int]:
     """Convert screen pixel coordinates to SendInput absolute coordinates.
 
     SendInput absolute coordinates are normalized to 0-65535 range.
     """
-    sm_cxscreen = ctypes.windll.user32.GetSystemMetrics(0)
-    sm_cyscreen = ctypes.windll.user32.GetSystemMetrics(1)
-    abs_x = int(x * 65535 / sm_cxscreen)
-    abs_y = int(y * 65535 / sm_cyscreen)
-    return abs_x, abs_y
+    global _SCREEN_TS, _SCREEN_W, _SCREEN_H
+    now = time.monotonic()
+    if now - _SCREEN_TS > _SCREEN_TTL:
+        width, height = _GetSystemMetrics(0), _GetSystemMetrics(1)
+        if not width or not height:
+            # Don't cache a bogus size: the click would land off-screen.
+            raise RuntimeError(f"GetSystemMetrics returned {width}x{height} for the primary screen")
+        _SCREEN_W, _SCREEN_H, _SCREEN_TS = width, height, now
+    # Integer floor division: no float round trip on the mouse path.
+    return x * 65535 // _SCREEN_W, y * 65535 // _SCREEN_H
 
 
 def _send_mouse_click(
@@ -370,41 +851,24 @@ def _send_mouse_click(
         down_flag = MOUSEEVENTF_LEFTDOWN
         up_flag = MOUSEEVENTF_LEFTUP
 
-    inputs = []
-
-    # Move cursor to position
-    move = INPUT()
-    move.type = INPUT_MOUSE
-    move._input.mi.dx = abs_x
-    move._input.mi.dy = abs_y
-    move._input.mi.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE
-    inputs.append(move)
-
-    # Click(s)
-    for _ in range(count):
-        down = INPUT()
-        down.type = INPUT_MOUSE
-        down._input.mi.dx = abs_x
-        down._input.mi.dy = abs_y
-        down._input.mi.dwFlags = down_flag | MOUSEEVENTF_ABSOLUTE
-        inputs.append(down)
-
-        up = INPUT()
-        up.type = INPUT_MOUSE
-        up._input.mi.dx = abs_x
-        up._input.mi.dy = abs_y
-        up._input.mi.dwFlags = up_flag | MOUSEEVENTF_ABSOLUTE
-        inputs.append(up)
-
-    arr = (INPUT * len(inputs))(*inputs)
-    sent = ctypes.windll.user32.SendInput(
-        len(inputs),
-        arr,
-        ctypes.sizeof(INPUT),
-    )
+    # Move cursor to position, then the click(s), written straight into
+    # one preallocated array.
+    n = 1 + 2 * count
+    arr = (INPUT * n)()
+    for i, inp in enumerate(arr):
+        if i == 0:
+            flags = MOUSEEVENTF_MOVE
+        else:
+            flags = down_flag if i % 2 else up_flag
+        inp.type = INPUT_MOUSE
+        inp._input.mi.dx = abs_x
+        inp._input.mi.dy = abs_y
+        inp._input.mi.dwFlags = flags | MOUSEEVENTF_ABSOLUTE
+
+    sent = _SendInput(n, arr, _INPUT_SIZE)
     if sent == 0:
         err = ctypes.get_last_error()
-        raise RuntimeError(f"SendInput mouse failed, sent 0/{len(inputs)} events (error={err})")
+        raise RuntimeError(f"SendInput mouse failed, sent 0/{n} events (error={err})")
 
 
 # ---------------------------------------------------------------------------
@@ -412,11 +876,39 @@ def _send_mouse_click(
 # ---------------------------------------------------------------------------
 
 
+# Bounds (seconds) of the backoff between window polls after a launch.
+_WINDOW_POLL_MIN = 0.01
+_WINDOW_POLL_MAX = 0.1
+# How long (seconds) a launched process's thread list is reused before the
+# Toolhelp snapshot is taken again to pick up newly created UI threads.
+_THREAD_REFRESH = 0.5
+# Window titles are read into one buffer of this many characters per wait;
+# GetWindowTextW truncates longer titles, far past where app names appear.
+_TITLE_MAX = 512
+
+
 class WindowsActionHandler(ActionHandler):
     """Execute CUP actions on Windows via UIA patterns + SendInput."""
 
+    # Get-StartApps costs a PowerShell cold start, so its result is reused
+    # until a Start Menu folder changes or this many seconds pass.
+    _APPS_CACHE_TTL = 60.0
+    # The result is also saved to disk so later processes skip PowerShell;
+    # a saved copy older than this (seconds) is rediscovered.
+    _APPS_DISK_TTL = 600.0
+
     def __init__(self):
         self._initialized = False
+        self._apps_cache: dict[str, str] | None = None
+        self._apps_cache_ts = 0.0
+        self._apps_cache_mtimes: tuple[int | None, ...] = ()
+        self._apps_from_cache = False
+        self._appid_to_name: dict[str, str] = {}
+        self._name_index: dict[str, set[str]] = {}
+        self._appid_index: dict[str, set[str]] = {}
+        self._match_cache: dict[str, str | None] = {}
+        self._name_substring_hits: dict[str, list[str]] = {}
+        self._appid_substring_hits: dict[str, list[str]] = {}
 
     def _init(self):
         if self._initialized:
@@ -431,47 +923,35 @@ class WindowsActionHandler(ActionHandler):
         params: dict[str, Any],
     ) -> ActionResult:
         self._init()
-        element = native_ref
-
-        if action == "click":
-            return self._click(element)
-        elif action == "toggle":
-            return self._toggle(element)
-        elif action == "type":
-            value = params.get("value", "")
-            return self._type(element, value)
-        elif action == "setvalue":
-            value = params.get("value", "")
-            return self._setvalue(element, value)
-        elif action == "expand":
-            return self._expand(element)
-        elif action == "collapse":
-            return self._collapse(element)
-        elif action == "select":
-            return self._select(element)
-        elif action == "scroll":
-            direction = params.get("direction", "down")
-            return self._scroll(element, direction)
-        elif action == "increment":
-            return self._adjust_range(element, increment=True)
-        elif action == "decrement":
-            return self._adjust_range(element, increment=False)
-        elif action == "rightclick":
-            return self._rightclick(element)
-        elif action == "doubleclick":
-            return self._doubleclick(element)
-        elif action == "focus":
-            return self._focus(element)
-        elif action == "dismiss":
-            return self._dismiss(element)
-        elif action == "longpress":
-            return self._longpress(element)
-        else:
+        element = _refresh(native_ref)
+
+        handler = self._ACTION_DISPATCH.get(action)
+        if handler is None:
             return ActionResult(
                 success=False,
                 message="",
                 error=f"Action '{action}' not implemented for Windows",
             )
+        return handler(self, element, params)
+
+    # action name -> handler(self, element, params)
+    _ACTION_DISPATCH: dict[str, Callable[..., ActionResult]] = {
+        "click": lambda self, el, params: self._click(el),
+        "toggle": lambda self, el, params: self._toggle(el),
+        "type": lambda self, el, params: self._type(el, params.get("value", "")),
+        "setvalue": lambda self, el, params: self._setvalue(el, params.get("value", "")),
+        "expand": lambda self, el, params: self._expand(el),
+        "collapse": lambda self, el, params: self._collapse(el),
+        "select": lambda self, el, params: self._select(el),
+        "scroll": lambda self, el, params: self._scroll(el, params.get("direction", "down")),
+        "increment": lambda self, el, params: self._adjust_range(el, increment=True),
+        "decrement": lambda self, el, params: self._adjust_range(el, increment=False),
+        "rightclick": lambda self, el, params: self._rightclick(el),
+        "doubleclick": lambda self, el, params: self._doubleclick(el),
+        "focus": lambda self, el, params: self._focus(el),
+        "dismiss": lambda self, el, params: self._dismiss(el),
+        "longpress": lambda self, el, params: self._longpress(el),
+    }
 
     def press(self, combo: str) -> ActionResult:
         _send_key_combo(combo)
@@ -519,10 +999,11 @@ class WindowsActionHandler(ActionHandler):
         # Fast path: use ValuePattern to set text directly (no keyboard sim).
         try:
             pat = _get_pattern(element, UIA_ValuePatternId, _IValue)
-            if pat:
+            if pat and not _is_read_only(pat):
+                # SetFocus and SetValue are synchronous UIA calls, so no
+                # settle time is needed between them.
                 try:
                     element.SetFocus()
-                    time.sleep(0.05)
                 except (comtypes.COMError, Exception):
                     pass  # element may already be focused
                 pat.SetValue(text)
@@ -550,6 +1031,12 @@ class WindowsActionHandler(ActionHandler):
 
         pat = _get_pattern(element, UIA_ValuePatternId, _IValue)
         if pat:
+            if _is_read_only(pat):
+                return ActionResult(
+                    success=False,
+                    message="",
+                    error="Element is read-only (setvalue)",
+                )
             try:
                 pat.SetValue(text)
                 return ActionResult(success=True, message=f"Set value to: {text}")
@@ -619,13 +1106,10 @@ class WindowsActionHandler(ActionHandler):
     def _adjust_range(self, element, *, increment: bool) -> ActionResult:
         pat = _get_pattern(element, UIA_RangeValuePatternId, _IRangeValue)
         if pat:
-            current = pat.CurrentValue
-            small_change = pat.CurrentSmallChange
+            current, small_change, min_val, max_val = _range_values(pat)
             step = small_change if small_change > 0 else 1.0
             new_val = current + step if increment else current - step
             # Clamp to range
-            min_val = pat.CurrentMinimum
-            max_val = pat.CurrentMaximum
             new_val = max(min_val, min(max_val, new_val))
             pat.SetValue(new_val)
             verb = "Incremented" if increment else "Decremented"
@@ -671,7 +1155,7 @@ class WindowsActionHandler(ActionHandler):
         # Try close via window pattern, fallback to Alt+F4/Escape
         try:
             element.SetFocus()
-            time.sleep(0.05)
+            _wait_for_foreground(element)
             _send_key_combo("escape")
             return ActionResult(success=True, message="Dismissed (Escape)")
         except Exception as exc:
@@ -683,35 +1167,25 @@ class WindowsActionHandler(ActionHandler):
             x, y = _get_element_click_point(element)
             abs_x, abs_y = _screen_to_absolute(x, y)
 
-            # Move cursor
-            move = INPUT()
-            move.type = INPUT_MOUSE
-            move._input.mi.dx = abs_x
-            move._input.mi.dy = abs_y
-            move._input.mi.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE
-            arr = (INPUT * 1)(move)
-            ctypes.windll.user32.SendInput(1, arr, ctypes.sizeof(INPUT))
-
-            # Press
-            down = INPUT()
-            down.type = INPUT_MOUSE
-            down._input.mi.dx = abs_x
-            down._input.mi.dy = abs_y
-            down._input.mi.dwFlags = MOUSEEVENTF_LEFTDOWN | MOUSEEVENTF_ABSOLUTE
-            arr = (INPUT * 1)(down)
-            ctypes.windll.user32.SendInput(1, arr, ctypes.sizeof(INPUT))
+            # Move + press in one SendInput, hold, then release.
+            arr = (INPUT * 2)()
+            for inp, flags in zip(arr, (MOUSEEVENTF_MOVE, MOUSEEVENTF_LEFTDOWN), strict=True):
+                inp.type = INPUT_MOUSE
+                inp._input.mi.dx = abs_x
+                inp._input.mi.dy = abs_y
+                inp._input.mi.dwFlags = flags | MOUSEEVENTF_ABSOLUTE
+            _SendInput(2, arr, _INPUT_SIZE)
 
             # Hold
             time.sleep(0.8)
 
             # Release
-            up = INPUT()
-            up.type = INPUT_MOUSE
-            up._input.mi.dx = abs_x
-            up._input.mi.dy = abs_y
-            up._input.mi.dwFlags = MOUSEEVENTF_LEFTUP | MOUSEEVENTF_ABSOLUTE
-            arr = (INPUT * 1)(up)
-            ctypes.windll.user32.SendInput(1, arr, ctypes.sizeof(INPUT))
+            up = (INPUT * 1)()
+            up[0].type = INPUT_MOUSE
+            up[0]._input.mi.dx = abs_x
+            up[0]._input.mi.dy = abs_y
+            up[0]._input.mi.dwFlags = MOUSEEVENTF_LEFTUP | MOUSEEVENTF_ABSOLUTE
+            _SendInput(1, up, _INPUT_SIZE)
 
             return ActionResult(success=True, message="Long-pressed")
         except Exception as exc:
@@ -741,27 +1215,12 @@ class WindowsActionHandler(ActionHandler):
                     error="Could not discover installed applications",
                 )
 
-            # Try matching against display names first.
-            match = _fuzzy_match(name, list(apps.keys()))
-
-            # If no match on display names, try matching against AppIDs.
-            # This handles localized Windows where display names are
-            # translated (e.g. "Notatnik" for Notepad on Polish Windows)
-            # but AppIDs still contain the English name.
-            if match is None:
-                appid_to_name: dict[str, str] = {}
-                for display, appid in apps.items():
-                    # Extract a readable name from the AppID.
-                    # UWP: "Microsoft.WindowsNotepad_8wekyb3d8bbwe!App" -> "WindowsNotepad"
-                    # Path: just use the display name (already tried above).
-                    parts = appid.split(".")
-                    if len(parts) >= 2:
-                        # Take the component after "Microsoft." etc., strip the suffix
-                        raw = parts[-1].split("_")[0].split("!")[0]
-                        appid_to_name[raw.lower()] = display
-                appid_match = _fuzzy_match(name, list(appid_to_name.keys()))
-                if appid_match is not None:
-                    match = appid_to_name[appid_match]
+            match = self._match_app(name, apps)
+            if match is None and self._apps_from_cache:
+                # Store apps and shortcuts in existing subfolders don't touch
+                # the watched mtimes; rediscover once before giving up.
+                apps = self._get_start_apps(refresh=True) or apps
+                match = self._match_app(name, apps)
 
             if match is None:
                 return ActionResult(
@@ -793,15 +1252,116 @@ class WindowsActionHandler(ActionHandler):
                 error=f"Failed to launch '{name}': {exc}",
             )
 
-    def _get_start_apps(self) -> dict[str, str]:
-        """Discover installed apps via Get-StartApps, fallback to .lnk scan."""
+    def _match_app(self, name: str, apps: dict[str, str]) -> str | None:
+        """Resolve *name* to a display name in *apps*, memoized per app list."""
+        key = _app_key(name)
+        if key in self._match_cache:
+            return self._match_cache[key]
+
+        # Try matching against display names first.
+        match = _fuzzy_match(
+            key,
+            apps.keys(),
+            index=self._name_index,
+            substring_hits=self._name_substring_hits,
+        )
+
+        # If no match on display names, try matching against AppIDs.
+        # This handles localized Windows where display names are
+        # translated (e.g. "Notatnik" for Notepad on Polish Windows)
+        # but AppIDs still contain the English name.
+        if match is None:
+            appid_to_name = self._appid_to_name
+            appid_match = _fuzzy_match(
+                key,
+                appid_to_name.keys(),
+                index=self._appid_index,
+                substring_hits=self._appid_substring_hits,
+            )
+            if appid_match is not None:
+                match = appid_to_name[appid_match]
+
+        self._match_cache[key] = match
+        return match
+
+    def _get_start_apps(self, refresh: bool = False) -> dict[str, str]:
+        """Discover installed apps, reusing the last result while it is fresh.
+
+        *refresh* skips both the in-memory and the on-disk copy. Whether the
+        result came from either is recorded in ``_apps_from_cache``.
+        """
+        mtimes = tuple(_dir_mtime(d) for d in _start_menu_dirs())
+        self._apps_from_cache = True
+        if (
+            not refresh
+            and self._apps_cache is not None
+            and mtimes == self._apps_cache_mtimes
+            and time.monotonic() - self._apps_cache_ts < self._APPS_CACHE_TTL
+        ):
+            return self._apps_cache
+
+        apps = None
+        if self._apps_cache is None and not refresh:
+            apps = _load_apps_cache(mtimes, self._APPS_DISK_TTL)
+        if not apps:
+            self._apps_from_cache = False
+            apps = self._discover_start_apps()
+            if apps:
+                _save_apps_cache(mtimes, apps)
+        if apps:
+            self._apps_cache_ts = time.monotonic()
+            self._apps_cache_mtimes = mtimes
+            if apps == self._apps_cache:
+                return self._apps_cache  # unchanged: keep indexes and matches
+            self._apps_cache = apps
+            self._appid_to_name = _appid_names(apps)
+            self._name_index = _trigram_index(apps)
+            self._appid_index = _trigram_index(self._appid_to_name)
+            self._match_cache = {}
+            self._name_substring_hits = {}
+            self._appid_substring_hits = {}
+        return apps
+
+    def _discover_start_apps(self) -> dict[str, str]:
+        """Discover installed apps via the AppsFolder, then Get-StartApps, then .lnk scan."""
+        apps = self._get_apps_via_shell()
+        if apps:
+            return apps
         apps = self._get_apps_via_powershell()
         if apps:
             return apps
         return self._get_apps_from_shortcuts()
 
+    def _get_apps_via_shell(self) -> dict[str, str]:
+        """Enumerate shell:AppsFolder in-process through Shell.Application.
+
+        This is the folder Get-StartApps reads, so names and AppIDs match its
+        output without starting PowerShell.
+        """
+        try:
+            import comtypes.client
+
+            shell = comtypes.client.CreateObject("Shell.Application", dynamic=True)
+            folder = shell.NameSpace("shell:AppsFolder")
+            if folder is None:
+                return {}
+            items = folder.Items()
+            apps: dict[str, str] = {}
+            for i in range(items.Count):
+                item = items.Item(i)
+                name = (item.Name or "").strip()
+                appid = (item.Path or "").strip()
+                if name and appid:
+                    apps[_app_key(name)] = appid
+        except Exception:
+            return {}
+        return apps
+
     def _get_apps_via_powershell(self) -> dict[str, str]:
         """Run Get-StartApps and parse the CSV output."""
+        import csv
+        import io
+
         command = "Get-StartApps | ConvertTo-Csv -NoTypeInformation"
         output, ok = _run_powershell(command)
         if not ok or not output.strip():
@@ -814,7 +1374,7 @@ class WindowsActionHandler(ActionHandler):
                 row_name = row.get("Name", "").strip()
                 row_appid = row.get("AppID", "").strip()
                 if row_name and row_appid:
-                    apps[row_name.lower()] = row_appid
+                    apps[_app_key(row_name)] = row_appid
         except Exception:
             return {}
         return apps
@@ -822,41 +1382,26 @@ class WindowsActionHandler(ActionHandler):
     def _get_apps_from_shortcuts(self) -> dict[str, str]:
         """Scan Start Menu folders for .lnk shortcuts."""
         apps: dict[str, str] = {}
-        search_dirs = [
-            os.path.join(
-                os.environ.get("ProgramData", r"C:\ProgramData"),
-                r"Microsoft\Windows\Start Menu\Programs",
-            ),
-            os.path.join(
-                os.environ.get("APPDATA", ""),
-                r"Microsoft\Windows\Start Menu\Programs",
-            ),
-        ]
-        for search_dir in search_dirs:
-            if not os.path.isdir(search_dir):
-                continue
-            for lnk_path in glob.glob(os.path.join(search_dir, "**", "*.lnk"), recursive=True):
-                lnk_name = os.path.splitext(os.path.basename(lnk_path))[0].lower()
-                if lnk_name not in apps:
-                    apps[lnk_name] = lnk_path
+        for search_dir in _start_menu_dirs():
+            for entry in _iter_lnk(search_dir):
+                apps.setdefault(_app_key(entry.name[:-4]), entry.path)
         return apps
 
     def _launch_by_appid(self, appid: str) -> int:
         """Launch an app by its AppID and return the PID (0 if unknown)."""
-        if os.path.exists(appid) or "\\" in appid:
+        if os.path.exists(appid):
             # Path-based app (.lnk shortcut or direct .exe)
-            safe = _ps_quote(appid)
-            command = f"Start-Process {safe} -PassThru | Select-Object -ExpandProperty Id"
-            output, ok = _run_powershell(command)
-            if ok and output.strip().isdigit():
-                return int(output.strip())
-            return 0
-        else:
-            # UWP / Modern app with AppID
-            safe = _ps_quote(f"shell:AppsFolder\\{appid}")
-            command = f"Start-Process {safe}"
-            _run_powershell(command)
-            return 0
+            return _shell_execute(appid)
+        # Packaged apps report their PID through the activation manager. Their
+        # frame window usually belongs to ApplicationFrameHost.exe instead, so
+        # _wait_for_window still needs its title scan for them.
+        # Desktop entries ("{known-folder-id}\app.exe" and friends) and
+        # anything it rejects are opened through the AppsFolder instead.
+        if "\\" not in appid:
+            pid = _activate_application(appid)
+            if pid is not None:
+                return pid
+        return _shell_execute(f"shell:AppsFolder\\{appid}")
 
     def _wait_for_window(
         self,
@@ -865,54 +1410,62 @@ class WindowsActionHandler(ActionHandler):
         timeout: float = 8.0,
     ) -> bool:
         """Poll for a new window matching the launched app."""
-        EnumWindows = ctypes.windll.user32.EnumWindows
-        GetWindowTextW = ctypes.windll.user32.GetWindowTextW
-        GetWindowTextLengthW = ctypes.windll.user32.GetWindowTextLengthW
-        IsWindowVisible = ctypes.windll.user32.IsWindowVisible
-        GetWindowThreadProcessId = ctypes.windll.user32.GetWindowThreadProcessId
-
-        WNDENUMPROC = ctypes.WINFUNCTYPE(
-            ctypes.wintypes.BOOL,
-            ctypes.wintypes.HWND,
-            ctypes.wintypes.LPARAM,
-        )
-
         deadline = time.monotonic() + timeout
-        # Build a regex from the app name for title matching
-        safe_name = re.escape(app_name)
-        pattern = re.compile(safe_name, re.IGNORECASE)
-
-        while time.monotonic() < deadline:
-            found = False
-
-            def callback(hwnd, _lparam):
-                nonlocal found
-                if not IsWindowVisible(hwnd):
-                    return True
-
-                # Check PID match
-                if pid > 0:
-                    win_pid = ctypes.wintypes.DWORD()
-                    GetWindowThreadProcessId(hwnd, ctypes.byref(win_pid))
-                    if win_pid.value == pid:
-                        found = True
-                        return False  # stop enumeration
-
-                # Check title match
-                length = GetWindowTextLengthW(hwnd)
-                if length > 0:
-                    buf = ctypes.create_unicode_buffer(length + 1)
-                    GetWindowTextW(hwnd, buf, length + 1)
-                    if pattern.search(buf.value):
-                        found = True
-                        return False
-
+        # The app name is a literal, so titles are matched by case-folded
+        # substring search rather than through the regex engine.
+        needle = app_name.casefold()
+
+        # The callback and its ctypes thunk are built once and reused for
+        # every poll; only the syscalls run inside the loop.
+        found = [False]
+        title = ctypes.create_unicode_buffer(_TITLE_MAX)
+        # The callback runs once per window on every poll; bind what it
+        # calls to closure cells so it skips the module-global lookups.
+        is_visible = _IsWindowVisible
+        get_text = _GetWindowTextW
+        title_max = _TITLE_MAX
+
+        def callback(hwnd, any_window):
+            if not is_visible(hwnd):
                 return True
 
-            EnumWindows(WNDENUMPROC(callback), 0)
-            if found:
-                return True
-            time.sleep(0.5)
+            # Per-thread enumeration of the launched process passes a
+            # nonzero lparam: any visible window is a match there. The
+            # desktop-wide scan matches titles instead.
+            if any_window or (
+                get_text(hwnd, title, title_max) > 0 and needle in title.value.casefold()
+            ):
+                found[0] = True
+                return False  # stop enumeration
+
+            return True
+
+        enum_proc = WNDENUMPROC(callback)
+        threads: list[int] = []
+        threads_ts = float("-inf")
+        # Poll quickly at first, backing off so the wait never spins while
+        # the launched app is still creating its window; a window being
+        # shown anywhere cuts the current delay short.
+        delay = _WINDOW_POLL_MIN
+        with _WindowShowWaiter() as waiter:
+            while (now := time.monotonic()) < deadline:
+                if pid > 0 and now - threads_ts >= _THREAD_REFRESH:
+                    threads = _process_threads(pid)
+                    threads_ts = now
+                # The launched process's own threads are the cheap check, so
+                # they go first; no window text is read for them.
+                for tid in threads:
+                    _EnumThreadWindows(tid, enum_proc, 1)
+                    if found[0]:
+                        break
+                if not found[0]:
+                    # Still match titles on every poll: launcher stubs may
+                    # hand off to another process while they stay alive.
+                    _EnumWindows(enum_proc, 0)
+                if found[0]:
+                    return True
+                waiter.sleep(delay)
+                delay = min(delay * 1.5, _WINDOW_POLL_MAX)
 
         return False
 
@@ -922,65 +1475,377 @@ class WindowsActionHandler(ActionHandler):
 # ---------------------------------------------------------------------------
 
 
+def _shell_execute(target: str) -> int:
+    """Open *target* with ShellExecuteExW; return the new PID (0 if unknown)."""
+    info = SHELLEXECUTEINFOW()
+    info.cbSize = ctypes.sizeof(SHELLEXECUTEINFOW)
+    info.fMask = SEE_MASK_NOCLOSEPROCESS | SEE_MASK_FLAG_NO_UI
+    info.lpFile = target
+    info.nShow = SW_SHOWNORMAL
+    if not _ShellExecuteExW(ctypes.byref(info)):
+        err = ctypes.get_last_error()
+        raise RuntimeError(f"ShellExecuteEx failed for {target!r} (error={err})")
+    # No process handle when the target was handed to an existing process
+    # (DDE, single-instance apps, activation through the shell).
+    if not info.hProcess:
+        return 0
+    try:
+        return _GetProcessId(info.hProcess)
+    finally:
+        _CloseHandle(info.hProcess)
+
+
+@functools.cache
+def _activation_manager_interface() -> Any:
+    """Declare IApplicationActivationManager (raises if comtypes is missing)."""
+    import comtypes
+
+    class IApplicationActivationManager(comtypes.IUnknown):
+        _iid_ = comtypes.GUID("{2e941141-7f97-4756-ba1d-9decde894a3d}")
+        _methods_ = [
+            comtypes.COMMETHOD(
+                [],
+                comtypes.HRESULT,
+                "ActivateApplication",
+                (["in"], ctypes.wintypes.LPCWSTR, "appUserModelId"),
+                (["in"], ctypes.wintypes.LPCWSTR, "arguments"),
+                (["in"], ctypes.c_int, "options"),
+                (["out"], ctypes.POINTER(ctypes.wintypes.DWORD), "processId"),
+            ),
+        ]
+
+    return IApplicationActivationManager
+
+
+# COM objects belong to the apartment that created them, so each thread
+# keeps its own activation manager.
+_com_local = threading.local()
+
+
+def _activation_manager() -> Any:
+    """Return this thread's IApplicationActivationManager, or None if unavailable.
+
+    Failures are not remembered, so a later call (or another thread) retries.
+    """
+    manager = getattr(_com_local, "activation_manager", None)
+    if manager is not None:
+        return manager
+    try:
+        import comtypes
+        import comtypes.client
+
+        try:
+            comtypes.CoInitialize()
+        except OSError:
+            pass  # already initialized on this thread with another model
+        manager = comtypes.client.CreateObject(
+            comtypes.GUID("{45BA127D-10A8-46EA-8AB7-56EA9078943C}"),
+            interface=_activation_manager_interface(),
+        )
+    except Exception:
+        return None
+    _com_local.activation_manager = manager
+    return manager
+
+
+def _activate_application(appid: str) -> int | None:
+    """Activate a packaged app by AppUserModelID; None if that is not possible."""
+    manager = _activation_manager()
+    if manager is None:
+        return None
+    try:
+        return int(manager.ActivateApplication(appid, None, 0))
+    except Exception:
+        # Not a packaged app (e.g. a desktop AppsFolder entry).
+        return None
+
+
+# Prepended to every command so the stdout bytes are valid UTF-8 regardless
+# of the system's default codepage (e.g. cp1250 on Polish Windows which
+# cannot represent many app names).
+_PS_UTF8_OUTPUT = "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8"
+
+_PS_ARGS = (
+    "powershell",
+    "-NoProfile",
+    "-NoLogo",
+    "-NonInteractive",
+    "-OutputFormat",
+    "Text",
+    "-EncodedCommand",
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _encode_ps(command: str) -> str:
+    """Base64 of the UTF-16LE *command*, as PowerShell expects it."""
+    import base64
+
+    return base64.b64encode(command.encode("utf-16le")).decode("ascii")
+
+
 def _run_powershell(command: str, timeout: int = 10) -> tuple[str, bool]:
     """Run a PowerShell command using base64-encoded input. Returns (output, success)."""
-    # Prepend a UTF-8 output-encoding directive so the stdout bytes are
-    # valid UTF-8 regardless of the system's default codepage (e.g. cp1250
-    # on Polish Windows which cannot represent many app names).
-    full_command = "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; " + command
-    encoded = base64.b64encode(full_command.encode("utf-16le")).decode("ascii")
+    import subprocess
+
+    encoded = _encode_ps(f"{_PS_UTF8_OUTPUT}; {command}")
     try:
         result = subprocess.run(
-            [
-                "powershell",
-                "-NoProfile",
-                "-OutputFormat",
-                "Text",
-                "-EncodedCommand",
-                encoded,
-            ],
+            [*_PS_ARGS, encoded],
             capture_output=True,
+            stdin=subprocess.DEVNULL,
             timeout=timeout,
             encoding="utf-8",
             errors="replace",
+            # Don't allocate a console window for the child (Windows only).
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
         )
         return result.stdout or "", result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         return "", False
 
 
-def _ps_quote(value: str) -> str:
-    """Quote a string for PowerShell (single-quote with escaping)."""
-    escaped = value.replace("'", "''")
-    return f"'{escaped}'"
+def _start_menu_dirs() -> list[str]:
+    """Return the all-users and per-user Start Menu program folders."""
+    return [
+        os.path.join(
+            os.environ.get("ProgramData", r"C:\ProgramData"),
+            r"Microsoft\Windows\Start Menu\Programs",
+        ),
+        os.path.join(
+            os.environ.get("APPDATA", ""),
+            r"Microsoft\Windows\Start Menu\Programs",
+        ),
+    ]
+
+
+def _iter_lnk(root: str) -> Iterator[os.DirEntry]:
+    """Yield every .lnk file under *root*, walking subfolders iteratively."""
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".lnk") and entry.is_file(
+                        follow_symlinks=False
+                    ):
+                        yield entry
+                except OSError:
+                    continue
+
+
+def _apps_cache_path() -> str | None:
+    """Return the on-disk app list cache file, or None without LOCALAPPDATA."""
+    base = os.environ.get("LOCALAPPDATA")
+    if not base:
+        return None
+    return os.path.join(base, "cup", "apps_cache.json")
+
+
+def _load_apps_cache(mtimes: tuple[int | None, ...], ttl: float) -> dict[str, str] | None:
+    """Return the saved app list if it matches *mtimes* and is under *ttl* old."""
+    import json
+
+    path = _apps_cache_path()
+    if path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if tuple(data["mtimes"]) != mtimes or time.time() - data["saved"] >= ttl:
+            return None
+        apps = data["apps"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return apps if isinstance(apps, dict) else None
+
+
+def _save_apps_cache(mtimes: tuple[int | None, ...], apps: dict[str, str]) -> None:
+    """Best-effort write of the app list for other processes to reuse."""
+    import json
+
+    path = _apps_cache_path()
+    if path is None:
+        return
+    data = {"mtimes": list(mtimes), "saved": time.time(), "apps": apps}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)  # readers never see a partial file
+    except OSError:
+        pass
+
+
+def _dir_mtime(path: str) -> int | None:
+    """Return a directory's mtime in nanoseconds, or None if it is missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _app_key(name: str) -> str:
+    """Normalize an app name for matching: trimmed and case-folded.
+
+    Discovered names are stored under this key once, so queries normalized
+    the same way compare against them directly.
+    """
+    return name.strip().casefold()
+
+
+def _appid_names(apps: dict[str, str]) -> dict[str, str]:
+    """Map short names extracted from AppIDs back to their display names."""
+    appid_to_name: dict[str, str] = {}
+    for display, appid in apps.items():
+        # UWP: "Microsoft.WindowsNotepad_8wekyb3d8bbwe!App" -> "WindowsNotepad"
+        parts = appid.split(".")
+        if len(parts) >= 2:
+            # Take the component after "Microsoft." etc., strip the suffix
+            raw = parts[-1].split("_")[0].split("!")[0]
+            appid_to_name[_app_key(raw)] = display
+    return appid_to_name
+
+
+def _trigrams(text: str) -> set[str]:
+    """Return the 3-character shingles of *text*, padded so short words count."""
+    padded = f" {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _trigram_index(names: Iterable[str]) -> dict[str, set[str]]:
+    """Build a trigram -> names inverted index for _fuzzy_match."""
+    index: dict[str, set[str]] = {}
+    for name in names:
+        for gram in _trigrams(name):
+            index.setdefault(gram, set()).add(name)
+    return index
+
+
+# Candidates scored with SequenceMatcher when a trigram index is available.
+_FUZZY_SHORTLIST = 5
+
+# Queries remembered in a _fuzzy_match substring_hits cache before it resets.
+_SUBSTRING_HITS_MAX = 256
+
+
+@functools.cache
+def _rapidfuzz() -> Any:
+    """Return the rapidfuzz package (optional, scores in C), or None."""
+    try:
+        import rapidfuzz.fuzz
+        import rapidfuzz.process
+    except ImportError:
+        return None
+    return rapidfuzz
 
 
 def _fuzzy_match(
     query: str,
-    candidates: list[str],
+    candidates: Collection[str],
     cutoff: float = 0.6,
+    index: dict[str, set[str]] | None = None,
+    substring_hits: dict[str, list[str]] | None = None,
 ) -> str | None:
     """Find the best fuzzy match for query among candidates.
 
+    Pass a set or dict keys view as *candidates* to make the exact-match
+    check a hash lookup; iteration order is kept for the later stages.
+
+    When a trigram *index* over the candidates is given, only the few
+    candidates with the highest trigram overlap are scored instead of all
+    of them.
+
+    *substring_hits* caches, per query, the candidates containing it.
+    Anything containing a longer query also contains its prefix, so a
+    query that extends an earlier one only scans that query's hits.
+
     Returns the best matching candidate name, or None if no match
     meets the cutoff threshold.
     """
-    query_lower = query.lower().strip()
+    query_lower = _app_key(query)
+    if not query_lower:
+        return None  # "" is a substring of every candidate
 
     # Exact match first
     if query_lower in candidates:
         return query_lower
 
     # Substring match (e.g., "chrome" in "google chrome")
-    for c in candidates:
-        if query_lower in c:
-            return c
+    if substring_hits is None:
+        hit = next((c for c in candidates if query_lower in c), None)
+        if hit is not None:
+            return hit
+    else:
+        scan: Collection[str] = candidates
+        for end in range(len(query_lower) - 1, 0, -1):
+            prev = substring_hits.get(query_lower[:end])
+            if prev is not None:
+                scan = prev
+                break
+        hits = [c for c in scan if query_lower in c]
+        if len(substring_hits) >= _SUBSTRING_HITS_MAX:
+            substring_hits.clear()
+        substring_hits[query_lower] = hits
+        if hits:
+            return hits[0]
+
+    pool: Iterable[str] = candidates
+    if index:
+        query_grams = _trigrams(query_lower)
+        shared: Counter[str] = Counter()
+        for gram in query_grams:
+            shared.update(index.get(gram, ()))
+        if len(shared) > _FUZZY_SHORTLIST:
+
+            def jaccard(c: str) -> float:
+                n = shared[c]
+                return n / (len(query_grams) + len(_trigrams(c)) - n)
+
+            pool = heapq.nlargest(_FUZZY_SHORTLIST, shared, key=jaccard)
+        elif shared:
+            # Few enough overlapping candidates to score them all; ranking
+            # them would only re-shingle each one for nothing.
+            pool = list(shared)
+
+    # Fuzzy match via rapidfuzz when installed. There is only ever one query
+    # per call, so extractOne (native, with early exit on the cutoff) beats
+    # building a cdist score matrix, which would also pull in numpy.
+    rapidfuzz = _rapidfuzz()
+    if rapidfuzz is not None:
+        best = rapidfuzz.process.extractOne(
+            query_lower,
+            pool,
+            scorer=rapidfuzz.fuzz.ratio,
+            score_cutoff=cutoff * 100,
+        )
+        return best[0] if best else None
+
+    # Fallback: fuzzy match via SequenceMatcher
+    import difflib
 
-    # Fuzzy match via SequenceMatcher
     best_match = None
     best_score = 0.0
-    for c in candidates:
-        score = difflib.SequenceMatcher(None, query_lower, c).ratio()
+    query_len = len(query_lower)
+    for c in pool:
+        # ratio() can never exceed 2*min(len)/sum(len); skip candidates whose
+        # length alone rules out beating the cutoff or the current best.
+        bound = 2.0 * min(query_len, len(c)) / (query_len + len(c)) if c else 0.0
+        if bound < cutoff or bound <= best_score:
+            continue
+        # Escalate through the cheaper upper bounds before the full ratio().
+        matcher = difflib.SequenceMatcher(None, query_lower, c)
+        floor = max(cutoff, best_score)
+        if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+            continue
+        score = matcher.ratio()
         if score > best_score:
             best_score = score
             best_match = c
@@ -85,6 +85,7 @@ class ActionExecutor:
     def set_refs(self, refs: dict[str, Any]) -> None:
         """Replace element references with a fresh set from capture_tree()."""
         self._refs = refs
+        self._handler.clear_cache()
 
     def action(
         self,
@@ -27,6 +27,7 @@ import itertools
 import json
 import os
 import threading
+from collections.abc import Sequence
 from typing import Any
 
 import websocket  # websocket-client
@@ -106,6 +107,55 @@ def _cdp_send(
         ws.settimeout(old_timeout)
 
 
+def _cdp_send_batch(
+    ws: websocket.WebSocket,
+    commands: Sequence[tuple[str, dict | None]],
+    timeout: float = 30.0,
+) -> list[dict]:
+    """Send several CDP commands back-to-back and wait for all responses.
+
+    All frames are written before any response is read, so the batch costs
+    one round-trip instead of one per command. The browser still executes
+    the commands in order. Responses are returned in command order.
+
+    Raises RuntimeError for the first command (in order) that failed, after
+    all responses have been drained.
+    """
+    if not commands:
+        return []
+
+    with _msg_id_lock:
+        msg_ids = [next(_msg_id_counter) for _ in commands]
+
+    old_timeout = ws.gettimeout()
+    ws.settimeout(timeout)
+    try:
+        for msg_id, (method, params) in zip(msg_ids, commands, strict=True):
+            message: dict[str, Any] = {"id": msg_id, "method": method}
+            if params:
+                message["params"] = params
+            ws.send(json.dumps(message))
+
+        pending = set(msg_ids)
+        responses: dict[int, dict] = {}
+        while pending:
+            resp = json.loads(ws.recv())
+            msg_id = resp.get("id")
+            if msg_id in pending:
+                pending.discard(msg_id)
+                responses[msg_id] = resp
+            # else: event notification — discard and keep waiting
+    finally:
+        ws.settimeout(old_timeout)
+
+    ordered = [responses[msg_id] for msg_id in msg_ids]
+    for resp in ordered:
+        if "error" in resp:
+            err = resp["error"]
+            raise RuntimeError(f"CDP error {err.get('code')}: {err.get('message')}")
+    return ordered
+
+
 def _cdp_close(ws: websocket.WebSocket) -> None:
     """Close a CDP websocket connection."""
     try:
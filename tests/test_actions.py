@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 import pytest
 
 from cup.actions._keys import parse_combo
@@ -266,6 +268,34 @@ class TestMacosHandler:
         assert result.success is True
         assert "Pressed" in result.message
 
+    def test_helpers_raise_without_pyobjc(self):
+        import sys
+
+        if sys.platform == "darwin":
+            pytest.skip("non-macOS-only test")
+
+        from cup.actions._macos import _send_key_combo
+
+        with pytest.raises(ImportError, match="pyobjc"):
+            _send_key_combo("escape")
+
+    def test_pyobjc_imported_only_at_module_level(self):
+        import ast
+        import inspect
+
+        from cup.actions import _macos
+
+        frameworks = {"objc", "AppKit", "ApplicationServices", "Foundation", "Quartz"}
+        tree = ast.parse(inspect.getsource(_macos))
+        for func in ast.walk(tree):
+            if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for node in ast.walk(func):
+                if isinstance(node, ast.ImportFrom):
+                    assert node.module not in frameworks, func.name
+                elif isinstance(node, ast.Import):
+                    assert not {a.name for a in node.names} & frameworks, func.name
+
     def test_open_app_empty_name(self):
         from cup.actions._macos import MacosActionHandler
 
@@ -287,6 +317,189 @@ class TestMacosHandler:
         assert result.success is False
         assert "no installed app" in result.error.lower()
 
+    def test_discover_apps_cached_until_dir_changes(self, tmp_path, monkeypatch):
+        import os
+
+        from cup.actions import _macos
+
+        scans = []
+
+        def fake_scan(app_dirs, include_spotlight=True):
+            scans.append(app_dirs)
+            return {"safari": "/Applications/Safari.app"}
+
+        monkeypatch.setattr(_macos, "_app_dirs", lambda: [str(tmp_path)])
+        monkeypatch.setattr(_macos, "_scan_apps", fake_scan)
+        _macos._invalidate_apps_cache()
+
+        assert _macos._discover_apps() == {"safari": "/Applications/Safari.app"}
+        assert _macos._discover_apps() == {"safari": "/Applications/Safari.app"}
+        assert len(scans) == 1
+
+        # Touching the directory invalidates the cache
+        st = os.stat(tmp_path)
+        os.utime(tmp_path, (st.st_atime, st.st_mtime + 10))
+        _macos._discover_apps()
+        assert len(scans) == 2
+
+        # Local-only and Spotlight-inclusive results are cached separately
+        _macos._discover_apps(include_spotlight=False)
+        assert len(scans) == 3
+
+        _macos._invalidate_apps_cache()
+
+    def test_scan_apps_prefers_dirs_over_spotlight(self, tmp_path, monkeypatch):
+        from cup.actions import _macos
+
+        (tmp_path / "Safari.app").mkdir()
+        (tmp_path / "notes.txt").write_text("")
+        monkeypatch.setattr(
+            _macos,
+            "_spotlight_apps",
+            lambda: {"safari": "/elsewhere/Safari.app", "iterm": "/opt/iTerm.app"},
+        )
+
+        apps = _macos._scan_apps([str(tmp_path), str(tmp_path / "missing")])
+        assert apps == {
+            "safari": str(tmp_path / "Safari.app"),
+            "iterm": "/opt/iTerm.app",
+        }
+
+        local = _macos._scan_apps([str(tmp_path)], include_spotlight=False)
+        assert local == {"safari": str(tmp_path / "Safari.app")}
+
+
+class TestMacosWaitForFocus:
+    def test_returns_once_focus_lands(self, monkeypatch):
+        from cup.actions import _macos
+
+        polls = []
+
+        def fake_get_attr(element, attr, default=None):
+            polls.append(attr)
+            return len(polls) >= 3
+
+        monkeypatch.setattr(_macos, "_ax_get_attr", fake_get_attr)
+        assert _macos._wait_for_focus(object(), timeout=1.0) is True
+        assert polls == ["AXFocused"] * 3
+
+    def test_gives_up_after_timeout(self, monkeypatch):
+        from cup.actions import _macos
+
+        monkeypatch.setattr(_macos, "_ax_get_attr", lambda *a, **k: None)
+        assert _macos._wait_for_focus(object(), timeout=0.01) is False
+
+
+class TestMacosBoundsCache:
+    def test_bounds_memoized_within_action(self, monkeypatch):
+        from cup.actions import _macos
+
+        queries = []
+
+        def fake_query(element):
+            queries.append(element)
+            return (10, 20, 100, 50)
+
+        monkeypatch.setattr(_macos, "_query_element_bounds", fake_query)
+        element = object()
+
+        # Outside an action nothing is cached
+        _macos._get_element_bounds(element)
+        _macos._get_element_bounds(element)
+        assert len(queries) == 2
+
+        # Inside an action scope repeated lookups hit the cache
+        queries.clear()
+        monkeypatch.setattr(_macos._action_cache, "bounds", {}, raising=False)
+        assert _macos._get_element_center(element) == (60.0, 45.0)
+        assert _macos._get_element_center(element) == (60.0, 45.0)
+        assert len(queries) == 1
+
+    def test_skylight_unavailable_falls_back(self):
+        import sys
+
+        if sys.platform == "darwin":
+            pytest.skip("non-macOS-only test")
+
+        from cup.actions import _macos
+
+        assert _macos._skylight_window_bounds(object()) is None
+        assert _macos._skylight is False
+
+    def test_cache_reset_after_action(self):
+        from cup.actions import _macos
+
+        _macos.MacosActionHandler().action(None, "fly", {})
+        assert _macos._action_cache.bounds is None
+        assert _macos._action_cache.action_names is None
+
+    def test_action_names_memoized_within_action(self, monkeypatch):
+        from cup.actions import _macos
+
+        fetches = []
+
+        def fake_copy(element, _):
+            fetches.append(element)
+            return 0, ["AXPress", "AXRaise"]
+
+        monkeypatch.setattr(_macos, "_pyobjc_import_error", None)
+        monkeypatch.setattr(_macos, "kAXErrorSuccess", 0, raising=False)
+        monkeypatch.setattr(_macos, "AXUIElementCopyActionNames", fake_copy, raising=False)
+        monkeypatch.setattr(_macos._action_cache, "action_names", {}, raising=False)
+        element = object()
+
+        assert _macos._ax_has_action(element, "AXPress")
+        assert _macos._ax_has_action(element, "AXRaise")
+        assert not _macos._ax_has_action(element, "AXShowMenu")
+        assert len(fetches) == 1
+
+    def test_raise_skipped_when_unsupported(self, monkeypatch):
+        from cup.actions import _macos
+
+        performed = []
+        monkeypatch.setattr(_macos, "_ax_action_names", lambda el: frozenset({"AXPress"}))
+        monkeypatch.setattr(
+            _macos, "_ax_perform_action", lambda el, name: performed.append(name) or True
+        )
+        assert _macos._ax_raise(object()) is False
+        assert performed == []
+
+        monkeypatch.setattr(_macos, "_ax_action_names", lambda el: frozenset({"AXRaise"}))
+        assert _macos._ax_raise(object()) is True
+        assert performed == ["AXRaise"]
+
+
+class TestMacosUnicodeChunks:
+    def test_short_text_single_chunk(self):
+        from cup.actions._macos import _utf16_chunks
+
+        assert _utf16_chunks("Hello world") == [("Hello world", 11)]
+
+    def test_long_text_split_at_limit(self):
+        from cup.actions._macos import _utf16_chunks
+
+        chunks = _utf16_chunks("x" * 45)
+        assert [units for _, units in chunks] == [20, 20, 5]
+        assert "".join(c for c, _ in chunks) == "x" * 45
+
+    def test_surrogate_pair_not_split(self):
+        from cup.actions._macos import _utf16_chunks
+
+        text = "a" * 19 + "\U0001f600" + "b"
+        chunks = _utf16_chunks(text)
+        assert chunks == [("a" * 19, 19), ("\U0001f600b", 3)]
+
+    def test_empty_text(self):
+        from cup.actions._macos import _utf16_chunks
+
+        assert _utf16_chunks("") == []
+
+    def test_fast_path_counts_utf16_units(self):
+        from cup.actions._macos import _utf16_chunks
+
+        assert _utf16_chunks("\U0001f600" * 10) == [("\U0001f600" * 10, 20)]
+        assert [u for _, u in _utf16_chunks("\U0001f600" * 11)] == [20, 2]
+
 
 class TestLinuxHandler:
     def test_action_fails_gracefully_without_element(self):
@@ -312,6 +525,35 @@ class TestLinuxHandler:
         assert result.success is False
         assert "empty" in result.error.lower()
 
+    def test_element_center_memoized_until_clear_cache(self):
+        from cup.actions import _linux
+        from cup.actions._linux import LinuxActionHandler, _get_element_center
+
+        class _Rect:
+            x, y, width, height = 10, 20, 100, 40
+
+        class _Component:
+            def get_extents(self, _coord_type):
+                return _Rect()
+
+        class _Accessible:
+            calls = 0
+
+            def get_component_iface(self):
+                self.calls += 1
+                return _Component()
+
+        acc = _Accessible()
+        LinuxActionHandler().clear_cache()
+        assert _get_element_center(acc) == (60, 40)
+        assert _get_element_center(acc) == (60, 40)
+        assert acc.calls == 1
+
+        LinuxActionHandler().clear_cache()
+        assert not _linux._center_cache
+        assert _get_element_center(acc) == (60, 40)
+        assert acc.calls == 2
+
 
 # ---------------------------------------------------------------------------
 # Web stub test
@@ -346,6 +588,14 @@ class TestFuzzyMatch:
         result = _fuzzy_match("chrome", ["google chrome", "notepad", "slack"])
         assert result == "google chrome"
 
+    def test_accepts_dict_keys(self):
+        from cup.actions._windows import _fuzzy_match
+
+        apps = {"google chrome": "Chrome", "notepad": "Notepad"}
+        assert _fuzzy_match("notepad", apps.keys()) == "notepad"
+        assert _fuzzy_match("chrome", apps.keys()) == "google chrome"
+        assert _fuzzy_match("notepd", apps.keys()) == "notepad"
+
     def test_fuzzy_match(self):
         from cup.actions._windows import _fuzzy_match
 
@@ -369,3 +619,1414 @@ class TestFuzzyMatch:
 
         result = _fuzzy_match("chrome", [])
         assert result is None
+
+    def test_blank_query_matches_nothing(self):
+        from cup.actions._windows import _fuzzy_match
+
+        assert _fuzzy_match("  ", ["google chrome", "notepad"]) is None
+
+    def test_trigram_index_shortlists_candidates(self, monkeypatch):
+        import difflib
+
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_rapidfuzz", lambda: None)
+
+        names = ["google chrome", "notepad", "slack"] + [f"tool {i}" for i in range(50)]
+        scored = []
+        real = difflib.SequenceMatcher
+
+        def spy(isjunk, a, b):
+            scored.append(b)
+            return real(isjunk, a, b)
+
+        monkeypatch.setattr(difflib, "SequenceMatcher", spy)
+        index = _windows._trigram_index(names)
+        assert _windows._fuzzy_match("chrom", names, index=index) == "google chrome"
+        assert len(scored) <= _windows._FUZZY_SHORTLIST
+
+    def test_small_overlap_skips_ranking(self, monkeypatch):
+        from cup.actions import _windows
+
+        names = ["google chrome", "notepad", "slack"]
+        index = _windows._trigram_index(names)
+
+        def no_ranking(*args, **kwargs):
+            raise AssertionError("ranked a shortlist that already fits")
+
+        monkeypatch.setattr(_windows, "_rapidfuzz", lambda: None)
+        monkeypatch.setattr(_windows.heapq, "nlargest", no_ranking)
+        assert _windows._fuzzy_match("notpad", names, index=index) == "notepad"
+
+    def test_rapidfuzz_scorer(self):
+        from cup.actions import _windows
+
+        if _windows._rapidfuzz() is None:
+            pytest.skip("rapidfuzz not installed")
+
+        names = ["google chrome", "notepad", "slack"]
+        assert _windows._fuzzy_match("notpad", names) == "notepad"
+        assert _windows._fuzzy_match("zzzz", names) is None
+
+    def test_difflib_fallback(self, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_rapidfuzz", lambda: None)
+        assert _windows._fuzzy_match("chrom", ["google chrome", "notepad"]) == "google chrome"
+        assert _windows._fuzzy_match("zzzz", ["notepad"]) is None
+
+    def test_difflib_fallback_prunes_by_length(self, monkeypatch):
+        import difflib
+
+        from cup.actions import _windows
+
+        scored = []
+        real = difflib.SequenceMatcher
+
+        def spy(isjunk, a, b):
+            scored.append(b)
+            return real(isjunk, a, b)
+
+        monkeypatch.setattr(_windows, "_rapidfuzz", lambda: None)
+        monkeypatch.setattr(difflib, "SequenceMatcher", spy)
+        names = ["notepad", "a very long application name indeed"]
+        assert _windows._fuzzy_match("notpad", names) == "notepad"
+        assert scored == ["notepad"]
+
+    def test_difflib_fallback_scores_query_first(self, monkeypatch):
+        from cup.actions import _windows
+
+        # SequenceMatcher.ratio is asymmetric: 0.625 this way round, 0.5
+        # with the sequences swapped (below the 0.6 cutoff).
+        monkeypatch.setattr(_windows, "_rapidfuzz", lambda: None)
+        assert _windows._fuzzy_match("olnoeonte", ["onenote"]) == "onenote"
+
+    def test_substring_hits_narrow_extended_queries(self):
+        from cup.actions._windows import _fuzzy_match
+
+        class Candidates(list):
+            scanned = 0
+
+            def __iter__(self):
+                Candidates.scanned += 1
+                return super().__iter__()
+
+        names = Candidates(["google chrome", "chromium", "notepad"])
+        hits: dict[str, list[str]] = {}
+        assert _fuzzy_match("chr", names, substring_hits=hits) == "google chrome"
+        assert hits["chr"] == ["google chrome", "chromium"]
+        scanned = Candidates.scanned
+
+        assert _fuzzy_match("chromi", names, substring_hits=hits) == "chromium"
+        assert Candidates.scanned == scanned
+        assert hits["chromi"] == ["chromium"]
+
+    def test_trigram_index_no_overlap_scans_all(self):
+        from cup.actions._windows import _fuzzy_match, _trigram_index
+
+        names = ["notepad", "slack"]
+        assert _fuzzy_match("zzzz", names, index=_trigram_index(names)) is None
+
+
+# ---------------------------------------------------------------------------
+# Windows UIA action cache
+# ---------------------------------------------------------------------------
+
+
+class _FakeRect:
+    def __init__(self, left, top, right, bottom):
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+
+
+class _FakeUiaElement:
+    def __init__(self, *, cached=False):
+        self.cached = cached
+        self.refreshed_with = None
+        self.live_reads = 0
+
+    def BuildUpdatedCache(self, cr):
+        self.refreshed_with = cr
+        return _FakeUiaElement(cached=True)
+
+    @property
+    def CachedBoundingRectangle(self):
+        if not self.cached:
+            raise RuntimeError("property not cached")
+        return _FakeRect(0, 0, 100, 50)
+
+    @property
+    def CurrentBoundingRectangle(self):
+        self.live_reads += 1
+        return _FakeRect(10, 10, 30, 30)
+
+
+class TestWindowsActionCache:
+    def test_refresh_uses_action_cache_request(self, monkeypatch):
+        from cup.actions import _windows
+
+        cr = object()
+        monkeypatch.setattr(_windows, "_action_cr", cr)
+        el = _FakeUiaElement()
+        refreshed = _windows._refresh(el)
+        assert el.refreshed_with is cr
+        assert refreshed.cached
+
+    def test_refresh_without_cache_request_is_noop(self, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_action_cr", None)
+        el = _FakeUiaElement()
+        assert _windows._refresh(el) is el
+        assert el.refreshed_with is None
+
+    def test_click_point_reads_cached_rect(self):
+        from cup.actions._windows import _get_element_click_point
+
+        el = _FakeUiaElement(cached=True)
+        assert _get_element_click_point(el) == (50, 25)
+        assert el.live_reads == 0
+
+    def test_click_point_falls_back_to_live_rect(self):
+        from cup.actions._windows import _get_element_click_point
+
+        el = _FakeUiaElement()
+        assert _get_element_click_point(el) == (20, 20)
+        assert el.live_reads == 1
+
+
+class _FakeUser32:
+    def __init__(self):
+        self.sent: list[int] = []
+
+    def SendInput(self, n, arr, size):
+        self.sent.append(n)
+        self.last = [(a.type, a._input.ki.wVk, a._input.ki.wScan, a._input.ki.dwFlags) for a in arr]
+        self.last_mouse = [a._input.mi.dwFlags for a in arr]
+        return n
+
+
+@pytest.fixture
+def fake_user32(monkeypatch):
+    from cup.actions import _windows
+
+    user32 = _FakeUser32()
+    monkeypatch.setattr(_windows, "_SendInput", user32.SendInput, raising=False)
+    return user32
+
+
+class TestWindowsReadOnly:
+    def test_reads_cached_flag(self):
+        from cup.actions._windows import _is_read_only
+
+        class Pat:
+            CachedIsReadOnly = 1
+
+        assert _is_read_only(Pat()) is True
+
+    def test_unknown_is_writable(self):
+        from cup.actions._windows import _is_read_only
+
+        assert _is_read_only(object()) is False
+
+
+class _FakeRangePattern:
+    def __init__(self, *, cached):
+        self.cached = cached
+        self.failed_cached_reads = 0
+        self.set_to = None
+
+    def __getattr__(self, name):
+        values = {"Value": 5.0, "SmallChange": 2.0, "Minimum": 0.0, "Maximum": 6.0}
+        if name.startswith("Cached"):
+            if not self.cached:
+                self.failed_cached_reads += 1
+                raise RuntimeError("not cached")
+            return values[name[len("Cached") :]]
+        if name.startswith("Current"):
+            return values[name[len("Current") :]]
+        raise AttributeError(name)
+
+    def SetValue(self, value):
+        self.set_to = value
+
+
+class TestWindowsAdjustRange:
+    def _adjust(self, monkeypatch, pat, *, increment):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_get_pattern", lambda el, pid, iface: pat)
+        return _windows.WindowsActionHandler()._adjust_range(object(), increment=increment)
+
+    def test_increment_clamps_to_cached_maximum(self, monkeypatch):
+        pat = _FakeRangePattern(cached=True)
+        result = self._adjust(monkeypatch, pat, increment=True)
+        assert result.success
+        assert pat.set_to == 6.0
+
+    def test_uncached_pattern_falls_back_once(self, monkeypatch):
+        pat = _FakeRangePattern(cached=False)
+        self._adjust(monkeypatch, pat, increment=False)
+        assert pat.set_to == 3.0
+        assert pat.failed_cached_reads == 1
+
+
+class TestWindowsSendKeyCombo:
+    def test_hotkey_is_one_sendinput_call(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        _windows._send_key_combo("ctrl+shift+s")
+        assert fake_user32.sent == [6]
+        assert sleeps == []
+
+    def test_resolved_combo_is_memoized(self):
+        from cup.actions._windows import _resolve_combo
+
+        _resolve_combo.cache_clear()
+        assert _resolve_combo("ctrl+s") == ((0xA2,), (ord("S"),), False)
+        assert _resolve_combo("win+r") == ((0x5B,), (ord("R"),), True)
+        assert _resolve_combo("win") == ((), (0x5B,), False)
+        _resolve_combo("ctrl+s")
+        assert _resolve_combo.cache_info().hits == 1
+
+    def test_shell_hotkey_settles_modifier_first(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        _windows._send_key_combo("win+r")
+        assert fake_user32.sent == [1, 3]
+        assert sleeps == [0.02]
+        assert fake_user32.last == [
+            (1, ord("R"), 0, 0),
+            (1, ord("R"), 0, 0x0002),
+            (1, 0x5B, 0, 0x0001 | 0x0002),
+        ]
+
+    def test_events_fill_array_in_press_order(self, fake_user32):
+        from cup.actions import _windows
+
+        _windows._send_key_combo("ctrl+s")
+        assert fake_user32.last == [
+            (1, 0xA2, 0, 0),
+            (1, ord("S"), 0, 0),
+            (1, ord("S"), 0, 0x0002),
+            (1, 0xA2, 0, 0x0002),
+        ]
+
+
+class TestWindowsSendUnicode:
+    def test_key_templates_are_reused(self):
+        from cup.actions._windows import _make_key_input
+
+        assert _make_key_input(0x0D) is _make_key_input(0x0D)
+        assert _make_key_input(0x0D, down=False)._input.ki.dwFlags == 0x0002
+
+    def test_events_written_into_one_array(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows.time, "sleep", lambda s: None)
+        _windows._send_unicode_string("a\r\n")
+        assert fake_user32.sent == [4]
+        assert fake_user32.last == [
+            (1, 0, ord("a"), 0x0004),
+            (1, 0, ord("a"), 0x0004 | 0x0002),
+            (1, 0x0D, 0, 0),
+            (1, 0x0D, 0, 0x0002),
+        ]
+
+    def test_bulk_records_match_per_field_writes(self):
+        from cup.actions._windows import _unicode_inputs
+
+        text = "x\u0a00\u0a00\tb\n"
+        records = [
+            (r.type, r._input.ki.wVk, r._input.ki.wScan, r._input.ki.dwFlags)
+            for r in _unicode_inputs(text)
+        ]
+        expected = []
+        for char in text:
+            if char in "\t\n":
+                vk = 0x09 if char == "\t" else 0x0D
+                expected += [(1, vk, 0, 0), (1, vk, 0, 0x0002)]
+            else:
+                expected += [(1, 0, ord(char), 0x0004), (1, 0, ord(char), 0x0006)]
+        assert records == expected
+
+    def test_astral_characters_sent_as_surrogate_pairs(self):
+        from cup.actions._windows import _unicode_inputs
+
+        scans = [r._input.ki.wScan for r in _unicode_inputs("\U0001f600")]
+        assert scans == [0xD83D, 0xD83D, 0xDE00, 0xDE00]
+
+    def test_empty_string_sends_nothing(self, fake_user32):
+        from cup.actions import _windows
+
+        _windows._send_unicode_string("")
+        assert fake_user32.sent == []
+
+    def test_short_string_has_no_trailing_sleep(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        _windows._send_unicode_string("hello")
+        assert fake_user32.sent == [10]
+        assert sleeps == []
+
+    def test_long_string_is_chunked(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        _windows._send_unicode_string("x" * 120)
+        assert fake_user32.sent == [100, 100, 40]
+        assert sleeps == [0.005, 0.005]
+        assert fake_user32.last[-1][2] == ord("x")
+
+
+class TestWindowsScreenToAbsolute:
+    def test_metrics_cached_between_calls(self, monkeypatch):
+        from cup.actions import _windows
+
+        calls = []
+
+        def get_system_metrics(index):
+            calls.append(index)
+            return 1920 if index == 0 else 1080
+
+        monkeypatch.setattr(_windows, "_GetSystemMetrics", get_system_metrics, raising=False)
+        monkeypatch.setattr(_windows, "_SCREEN_TS", float("-inf"))
+        assert _windows._screen_to_absolute(1920, 1080) == (65535, 65535)
+        assert _windows._screen_to_absolute(960, 0) == (32767, 0)
+        assert calls == [0, 1]
+
+        monkeypatch.setattr(_windows, "_SCREEN_TS", float("-inf"))
+        _windows._screen_to_absolute(0, 0)
+        assert calls == [0, 1, 0, 1]
+
+    def test_failed_metrics_raise_without_caching(self, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_GetSystemMetrics", lambda index: 0, raising=False)
+        monkeypatch.setattr(_windows, "_SCREEN_TS", float("-inf"))
+        with pytest.raises(RuntimeError, match="GetSystemMetrics"):
+            _windows._screen_to_absolute(10, 10)
+        assert _windows._SCREEN_TS < 0  # still unset
+
+        monkeypatch.setattr(_windows, "_GetSystemMetrics", lambda index: 1000, raising=False)
+        assert _windows._screen_to_absolute(500, 500) == (32767, 32767)
+
+
+class TestWindowsMouseClick:
+    def test_double_click_is_one_batch(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_screen_to_absolute", lambda x, y: (x, y))
+        _windows._send_mouse_click(10, 20, count=2)
+        assert fake_user32.sent == [5]
+        move, down, up = 0x0001 | 0x8000, 0x0002 | 0x8000, 0x0004 | 0x8000
+        assert fake_user32.last_mouse == [move, down, up, down, up]
+
+    def test_right_click_flags(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_screen_to_absolute", lambda x, y: (x, y))
+        _windows._send_mouse_click(10, 20, button="right")
+        assert fake_user32.last_mouse == [0x0001 | 0x8000, 0x0008 | 0x8000, 0x0010 | 0x8000]
+
+
+class TestWindowsLongpress:
+    def test_move_and_press_share_one_sendinput(self, fake_user32, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        monkeypatch.setattr(_windows, "_screen_to_absolute", lambda x, y: (x, y))
+        result = _windows.WindowsActionHandler()._longpress(_FakeUiaElement(cached=True))
+        assert result.success
+        assert fake_user32.sent == [2, 1]
+        assert sleeps == [0.8]
+
+
+class TestWindowsStartAppsCache:
+    def _handler(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        handler = _windows.WindowsActionHandler()
+        calls = []
+
+        def discover():
+            calls.append(1)
+            return {"notepad": "Microsoft.WindowsNotepad_8wekyb3d8bbwe!App"}
+
+        menu = tmp_path / "menu"
+        menu.mkdir(exist_ok=True)
+        monkeypatch.setattr(handler, "_discover_start_apps", discover)
+        monkeypatch.setattr(_windows, "_start_menu_dirs", lambda: [str(menu)])
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "appdata"))
+        return handler, calls
+
+    def test_second_call_reuses_cache(self, monkeypatch, tmp_path):
+        handler, calls = self._handler(monkeypatch, tmp_path)
+        assert handler._get_start_apps() == handler._get_start_apps()
+        assert len(calls) == 1
+        assert handler._appid_to_name == {"windowsnotepad": "notepad"}
+
+    def test_start_menu_change_invalidates(self, monkeypatch, tmp_path):
+        handler, calls = self._handler(monkeypatch, tmp_path)
+        handler._get_start_apps()
+        handler._apps_cache_mtimes = (0,)
+        handler._get_start_apps()
+        assert len(calls) == 2
+
+    def test_matches_memoized_until_apps_change(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        handler, calls = self._handler(monkeypatch, tmp_path)
+        scored = []
+        real = _windows._fuzzy_match
+
+        def spy(query, candidates, **kwargs):
+            scored.append(query)
+            return real(query, candidates, **kwargs)
+
+        monkeypatch.setattr(_windows, "_fuzzy_match", spy)
+        apps = handler._get_start_apps()
+        assert handler._match_app("Notepad", apps) == "notepad"
+        assert handler._match_app(" notepad ", apps) == "notepad"
+        assert scored == ["notepad"]
+
+        # A refresh that finds the same apps keeps the memo...
+        handler._apps_cache_ts -= handler._APPS_CACHE_TTL + 1
+        handler._get_start_apps()
+        handler._match_app("notepad", apps)
+        assert scored == ["notepad"]
+
+        # ...but a changed app list drops it.
+        monkeypatch.setattr(handler, "_discover_start_apps", lambda: {"notepad++": "x.lnk"})
+        handler._apps_cache_ts -= handler._APPS_CACHE_TTL + 1
+        apps = handler._get_start_apps()
+        assert handler._match_app("notepad", apps) == "notepad++"
+        assert len(scored) == 2
+
+    def test_ttl_expiry_invalidates(self, monkeypatch, tmp_path):
+        handler, calls = self._handler(monkeypatch, tmp_path)
+        handler._get_start_apps()
+        handler._apps_cache_ts -= handler._APPS_CACHE_TTL + 1
+        handler._get_start_apps()
+        assert len(calls) == 2
+
+    def test_new_process_reuses_saved_list(self, monkeypatch, tmp_path):
+        handler, calls = self._handler(monkeypatch, tmp_path)
+        apps = handler._get_start_apps()
+
+        fresh, fresh_calls = self._handler(monkeypatch, tmp_path)
+        assert fresh._get_start_apps() == apps
+        assert fresh._appid_to_name == {"windowsnotepad": "notepad"}
+        assert fresh_calls == []
+
+    def test_miss_rediscovers_past_both_caches(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        handler, _ = self._handler(monkeypatch, tmp_path)
+        handler._get_start_apps()
+
+        # A new process finds the saved list, which predates the install.
+        fresh, calls = self._handler(monkeypatch, tmp_path)
+        installed = {"notepad": "n!App", "spotify": "SpotifyAB.SpotifyMusic!Spotify"}
+        monkeypatch.setattr(fresh, "_discover_start_apps", lambda: calls.append(1) or installed)
+        monkeypatch.setattr(fresh, "_launch_by_appid", lambda appid: 0)
+        monkeypatch.setattr(fresh, "_wait_for_window", lambda pid, name: True)
+
+        assert fresh.open_app("spotify").success
+        assert calls == [1]
+        mtimes = tuple(_windows._dir_mtime(d) for d in _windows._start_menu_dirs())
+        assert _windows._load_apps_cache(mtimes, fresh._APPS_DISK_TTL) == installed
+
+        # A name that is still missing after rediscovery fails without looping.
+        assert not fresh.open_app("photoshop").success
+        assert calls == [1, 1]
+
+    def test_saved_list_ignored_when_stale(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        handler, _ = self._handler(monkeypatch, tmp_path)
+        handler._get_start_apps()
+
+        changed, calls = self._handler(monkeypatch, tmp_path)
+        (tmp_path / "menu" / "New App.lnk").write_text("")
+        changed._get_start_apps()
+        assert len(calls) == 1
+
+        expired, calls = self._handler(monkeypatch, tmp_path)
+        now = _windows.time.time()
+        monkeypatch.setattr(_windows.time, "time", lambda: now + expired._APPS_DISK_TTL + 1)
+        expired._get_start_apps()
+        assert len(calls) == 1
+
+
+class TestWindowsDiscoverApps:
+    def test_apps_folder_skips_powershell(self, monkeypatch):
+        from cup.actions import _windows
+
+        handler = _windows.WindowsActionHandler()
+        monkeypatch.setattr(handler, "_get_apps_via_shell", lambda: {"notepad": "x!App"})
+
+        def no_powershell():
+            raise AssertionError("PowerShell used although AppsFolder answered")
+
+        monkeypatch.setattr(handler, "_get_apps_via_powershell", no_powershell)
+        assert handler._discover_start_apps() == {"notepad": "x!App"}
+
+    def test_falls_back_in_order(self, monkeypatch):
+        from cup.actions import _windows
+
+        handler = _windows.WindowsActionHandler()
+        tried = []
+        for name, result in (
+            ("_get_apps_via_shell", {}),
+            ("_get_apps_via_powershell", {}),
+            ("_get_apps_from_shortcuts", {"slack": "slack.lnk"}),
+        ):
+            monkeypatch.setattr(
+                handler, name, lambda name=name, result=result: tried.append(name) or result
+            )
+        assert handler._discover_start_apps() == {"slack": "slack.lnk"}
+        assert tried == [
+            "_get_apps_via_shell",
+            "_get_apps_via_powershell",
+            "_get_apps_from_shortcuts",
+        ]
+
+
+class TestWindowsLaunch:
+    def _handler(self, monkeypatch, activated=None):
+        from cup.actions import _windows
+
+        opened = []
+        monkeypatch.setattr(_windows, "_shell_execute", lambda t: opened.append(t) or 0)
+        monkeypatch.setattr(_windows, "_activate_application", lambda appid: activated)
+        return _windows.WindowsActionHandler(), opened
+
+    def test_packaged_app_uses_activation_pid(self, monkeypatch):
+        handler, opened = self._handler(monkeypatch, activated=4321)
+        assert handler._launch_by_appid("Microsoft.WindowsNotepad_8wekyb3d8bbwe!App") == 4321
+        assert opened == []
+
+    def test_unpackaged_appid_opens_through_apps_folder(self, monkeypatch):
+        handler, opened = self._handler(monkeypatch)
+        handler._launch_by_appid("Chrome")
+        handler._launch_by_appid("{6D809377-6AF0-444B-8957-A3773F02200E}\\app.exe")
+        assert opened == [
+            "shell:AppsFolder\\Chrome",
+            "shell:AppsFolder\\{6D809377-6AF0-444B-8957-A3773F02200E}\\app.exe",
+        ]
+
+    def test_existing_path_is_opened_directly(self, monkeypatch, tmp_path):
+        shortcut = tmp_path / "Slack.lnk"
+        shortcut.write_text("")
+        handler, opened = self._handler(monkeypatch, activated=1)
+        handler._launch_by_appid(str(shortcut))
+        assert opened == [str(shortcut)]
+
+    def test_activation_manager_failure_is_retried_per_thread(self, monkeypatch):
+        import sys
+        import threading
+        import types
+
+        from cup.actions import _windows
+
+        created = []
+        fail = [True]
+
+        def create_object(clsid, interface=None):
+            if fail[0]:
+                raise OSError("CoInitialize has not been called")
+            created.append(threading.get_ident())
+            return object()
+
+        comtypes = types.ModuleType("comtypes")
+        comtypes.CoInitialize = lambda: None
+        comtypes.GUID = str
+        comtypes.client = types.SimpleNamespace(CreateObject=create_object)
+        monkeypatch.setitem(sys.modules, "comtypes", comtypes)
+        monkeypatch.setitem(sys.modules, "comtypes.client", comtypes.client)
+        monkeypatch.setattr(_windows, "_activation_manager_interface", lambda: object)
+        monkeypatch.setattr(_windows, "_com_local", threading.local())
+
+        assert _windows._activation_manager() is None
+        fail[0] = False
+        manager = _windows._activation_manager()
+        assert manager is not None
+        assert _windows._activation_manager() is manager
+
+        other = []
+        worker = threading.Thread(target=lambda: other.append(_windows._activation_manager()))
+        worker.start()
+        worker.join()
+        assert other[0] is not manager
+        assert len(created) == 2
+
+    def test_shell_execute_returns_pid_and_closes_handle(self, monkeypatch):
+        from cup.actions import _windows
+
+        closed = []
+
+        def shell_execute_ex(ref):
+            info = ref._obj
+            assert info.lpFile == "notepad.exe"
+            assert info.fMask & _windows.SEE_MASK_NOCLOSEPROCESS
+            info.hProcess = 99
+            return True
+
+        monkeypatch.setattr(_windows, "_ShellExecuteExW", shell_execute_ex, raising=False)
+        monkeypatch.setattr(_windows, "_GetProcessId", lambda h: 1234, raising=False)
+        monkeypatch.setattr(_windows, "_CloseHandle", closed.append, raising=False)
+        assert _windows._shell_execute("notepad.exe") == 1234
+        assert closed == [99]
+
+    def test_shell_execute_failure_raises(self, monkeypatch):
+        from cup.actions import _windows
+
+        monkeypatch.setattr(_windows, "_ShellExecuteExW", lambda ref: False, raising=False)
+        monkeypatch.setattr(_windows.ctypes, "get_last_error", lambda: 2, raising=False)
+        with pytest.raises(RuntimeError, match="error=2"):
+            _windows._shell_execute("missing.exe")
+
+
+class TestWindowsWaitForWindow:
+    def test_enum_thunk_built_once(self, monkeypatch):
+        from cup.actions import _windows
+
+        thunks = []
+        polls = []
+
+        def make_thunk(fn):
+            thunks.append(fn)
+            return fn
+
+        def enum_windows(proc, lparam):
+            polls.append(proc)
+            if len(polls) == 3:
+                proc(42, 0)
+
+        def get_text(hwnd, buf, size):
+            buf.value = "Untitled - Notepad"
+            return len(buf.value)
+
+        monkeypatch.setattr(_windows, "WNDENUMPROC", make_thunk, raising=False)
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+
+        assert _windows.WindowsActionHandler()._wait_for_window(0, "notepad")
+        assert len(thunks) == 1
+        assert len(polls) == 3
+        assert sleeps == pytest.approx([0.01, 0.015])
+
+    def test_exited_launcher_falls_back_to_titles(self, monkeypatch):
+        from cup.actions import _windows
+
+        def enum_windows(proc, lparam):
+            proc(5, lparam)
+
+        def get_text(hwnd, buf, size):
+            buf.value = "Spotify Premium"
+            return len(buf.value)
+
+        monkeypatch.setattr(_windows, "WNDENUMPROC", lambda fn: fn, raising=False)
+        monkeypatch.setattr(_windows, "_process_threads", lambda pid: [])
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+
+        assert _windows.WindowsActionHandler()._wait_for_window(300, "spotify")
+
+    def test_title_match_is_literal_and_case_insensitive(self, monkeypatch):
+        from cup.actions import _windows
+
+        titles = {1: "Notepad+ - readme", 2: "new 1 - NOTEPAD++"}
+
+        def enum_windows(proc, lparam):
+            for hwnd in titles:
+                if not proc(hwnd, 0):
+                    break
+
+        def get_text(hwnd, buf, size):
+            buf.value = titles[hwnd]
+            return len(buf.value)
+
+        monkeypatch.setattr(_windows, "WNDENUMPROC", lambda fn: fn, raising=False)
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+
+        handler = _windows.WindowsActionHandler()
+        assert handler._wait_for_window(0, "notepad++")
+        titles.pop(2)
+        monkeypatch.setattr(_windows.time, "sleep", lambda s: None)
+        assert not handler._wait_for_window(0, "notepad++", timeout=0.05)
+
+    def test_backoff_is_capped(self, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows, "WNDENUMPROC", lambda fn: fn, raising=False)
+        monkeypatch.setattr(_windows, "_EnumWindows", lambda proc, lp: None, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", lambda h, b, n: 0, raising=False)
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        ticks = iter(range(100))
+        monkeypatch.setattr(_windows.time, "monotonic", lambda: next(ticks) * 0.1)
+
+        assert not _windows.WindowsActionHandler()._wait_for_window(0, "x", timeout=2.0)
+        assert max(sleeps) == pytest.approx(0.1)
+        assert sleeps == sorted(sleeps)
+
+    def test_known_pid_enumerates_only_its_threads(self, monkeypatch):
+        from cup.actions import _windows
+
+        snapshots = []
+        visited = []
+
+        def process_threads(pid):
+            snapshots.append(pid)
+            return [7, 8]
+
+        def enum_thread_windows(tid, proc, lparam):
+            visited.append(tid)
+            if tid == 8 and len(visited) > 2:
+                proc(80, lparam)
+
+        scans = []
+
+        def enum_windows(proc, lparam):
+            scans.append(len(visited))
+            proc(90, lparam)
+
+        def get_text(hwnd, buf, size):
+            assert hwnd == 90, "title read for one of the launched app's windows"
+            buf.value = "Untitled - Paint"
+            return len(buf.value)
+
+        thunks = []
+        monkeypatch.setattr(
+            _windows, "WNDENUMPROC", lambda fn: thunks.append(fn) or fn, raising=False
+        )
+        monkeypatch.setattr(_windows, "_process_threads", process_threads)
+        monkeypatch.setattr(_windows, "_EnumThreadWindows", enum_thread_windows, raising=False)
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+        monkeypatch.setattr(_windows.time, "sleep", lambda s: None)
+
+        assert _windows.WindowsActionHandler()._wait_for_window(300, "notepad")
+        assert snapshots == [300]
+        assert visited == [7, 8, 7, 8]
+        # The title scan only ran on the poll where the threads had no window.
+        assert scans == [2]
+        assert len(thunks) == 1
+
+    def test_live_launcher_stub_still_matches_titles(self, monkeypatch):
+        from cup.actions import _windows
+
+        visited = []
+
+        def enum_windows(proc, lparam):
+            proc(5, lparam)
+
+        def get_text(hwnd, buf, size):
+            buf.value = "Spotify Premium"
+            return len(buf.value)
+
+        monkeypatch.setattr(_windows, "WNDENUMPROC", lambda fn: fn, raising=False)
+        # The stub keeps its threads alive but never shows a window itself.
+        monkeypatch.setattr(_windows, "_process_threads", lambda pid: [7])
+        monkeypatch.setattr(
+            _windows,
+            "_EnumThreadWindows",
+            lambda tid, proc, lparam: visited.append(tid),
+            raising=False,
+        )
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", lambda h: True, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+
+        assert _windows.WindowsActionHandler()._wait_for_window(300, "spotify")
+        assert visited == [7]
+
+    def test_framed_uwp_app_matches_by_title(self, monkeypatch):
+        from cup.actions import _windows
+
+        # Calculator's own window is an invisible child; the visible frame is
+        # owned by ApplicationFrameHost.exe and only carries the title.
+        visible = {70: False, 90: True}
+
+        def enum_windows(proc, lparam):
+            proc(90, lparam)
+
+        def get_text(hwnd, buf, size):
+            buf.value = "Calculator"
+            return len(buf.value)
+
+        monkeypatch.setattr(_windows, "WNDENUMPROC", lambda fn: fn, raising=False)
+        monkeypatch.setattr(_windows, "_process_threads", lambda pid: [7])
+        monkeypatch.setattr(
+            _windows,
+            "_EnumThreadWindows",
+            lambda tid, proc, lparam: proc(70, lparam),
+            raising=False,
+        )
+        monkeypatch.setattr(_windows, "_EnumWindows", enum_windows, raising=False)
+        monkeypatch.setattr(_windows, "_IsWindowVisible", visible.__getitem__, raising=False)
+        monkeypatch.setattr(_windows, "_GetWindowTextW", get_text, raising=False)
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+
+        assert _windows.WindowsActionHandler()._wait_for_window(4242, "calculator")
+        assert sleeps == []
+
+
+class TestWindowsShowWaiter:
+    def test_plain_sleep_without_hook(self, monkeypatch):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        with _windows._WindowShowWaiter() as waiter:
+            waiter.sleep(0.05)
+        assert sleeps == [0.05]
+
+    def test_show_event_ends_wait_early(self, monkeypatch):
+        import sys
+
+        from cup.actions import _windows
+
+        waits = []
+        unhooked = []
+
+        def msg_wait(count, handles, wait_all, ms, mask):
+            waits.append(ms)
+            # Simulate the hook firing while this thread pumps messages.
+            waiter._proc(1, _windows.EVENT_OBJECT_SHOW, 42, _windows.OBJID_WINDOW, 0, 0, 0)
+
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setattr(_windows, "WINEVENTPROC", lambda fn: fn, raising=False)
+        monkeypatch.setattr(_windows, "_SetWinEventHook", lambda *a: 7, raising=False)
+        monkeypatch.setattr(_windows, "_UnhookWinEvent", unhooked.append, raising=False)
+        monkeypatch.setattr(_windows, "_MsgWaitForMultipleObjects", msg_wait, raising=False)
+        monkeypatch.setattr(_windows, "_PeekMessageW", lambda *a: False, raising=False)
+
+        with _windows._WindowShowWaiter() as waiter:
+            waiter.sleep(5.0)
+        assert len(waits) == 1
+        assert unhooked == [7]
+
+
+class TestWindowsDispatch:
+    def test_dispatch_covers_every_action(self):
+        from cup.actions._windows import WindowsActionHandler
+
+        assert set(WindowsActionHandler._ACTION_DISPATCH) == {
+            "click",
+            "toggle",
+            "type",
+            "setvalue",
+            "expand",
+            "collapse",
+            "select",
+            "scroll",
+            "increment",
+            "decrement",
+            "rightclick",
+            "doubleclick",
+            "focus",
+            "dismiss",
+            "longpress",
+        }
+
+    def test_dispatch_passes_params(self, monkeypatch):
+        from cup.actions import _windows
+
+        handler = _windows.WindowsActionHandler()
+        handler._initialized = True
+        monkeypatch.setattr(_windows, "_refresh", lambda el: el)
+        seen = []
+        monkeypatch.setattr(
+            handler, "_scroll", lambda el, direction: seen.append(direction) or "ok"
+        )
+        assert handler.action(object(), "scroll", {"direction": "up"}) == "ok"
+        assert seen == ["up"]
+
+    def test_unknown_action(self, monkeypatch):
+        from cup.actions import _windows
+
+        handler = _windows.WindowsActionHandler()
+        handler._initialized = True
+        monkeypatch.setattr(_windows, "_refresh", lambda el: el)
+        result = handler.action(object(), "teleport", {})
+        assert not result.success
+        assert "not implemented" in result.error
+
+
+class TestWindowsShortcutScan:
+    def test_finds_nested_shortcuts(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        (tmp_path / "Accessories").mkdir()
+        (tmp_path / "Accessories" / "Notepad.lnk").write_text("")
+        (tmp_path / "Slack.LNK").write_text("")
+        (tmp_path / "readme.txt").write_text("")
+        monkeypatch.setattr(
+            _windows, "_start_menu_dirs", lambda: [str(tmp_path), str(tmp_path / "missing")]
+        )
+
+        apps = _windows.WindowsActionHandler()._get_apps_from_shortcuts()
+        assert apps == {
+            "notepad": str(tmp_path / "Accessories" / "Notepad.lnk"),
+            "slack": str(tmp_path / "Slack.LNK"),
+        }
+
+    def test_names_are_casefolded(self, monkeypatch, tmp_path):
+        from cup.actions import _windows
+
+        (tmp_path / "Straße Navi.lnk").write_text("")
+        monkeypatch.setattr(_windows, "_start_menu_dirs", lambda: [str(tmp_path)])
+
+        handler = _windows.WindowsActionHandler()
+        apps = handler._get_apps_from_shortcuts()
+        assert list(apps) == ["strasse navi"]
+        assert handler._match_app("STRASSE NAVI", apps) == "strasse navi"
+
+
+class TestWindowsRunPowershell:
+    def test_runs_non_interactive_without_profile(self, monkeypatch):
+        import base64
+        import subprocess
+
+        from cup.actions import _windows
+
+        calls = []
+
+        def fake_run(argv, **kwargs):
+            calls.append((argv, kwargs))
+            return subprocess.CompletedProcess(argv, 0, stdout="ok\n")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        assert _windows._run_powershell("Get-StartApps") == ("ok\n", True)
+
+        ((argv, kwargs),) = calls
+        assert {"-NoProfile", "-NonInteractive", "-NoLogo"} <= set(argv)
+        assert kwargs["stdin"] is subprocess.DEVNULL
+        script = base64.b64decode(argv[-1]).decode("utf-16le")
+        assert script.endswith("Get-StartApps")
+
+    def test_repeat_commands_reuse_encoding(self):
+        import base64
+
+        from cup.actions import _windows
+
+        _windows._encode_ps.cache_clear()
+        first = _windows._encode_ps("Get-StartApps")
+        assert _windows._encode_ps("Get-StartApps") is first
+        assert _windows._encode_ps.cache_info().hits == 1
+        assert base64.b64decode(first).decode("utf-16le") == "Get-StartApps"
+
+
+class _FakeHwndElement:
+    def __init__(self, hwnd):
+        self.CachedNativeWindowHandle = hwnd
+
+
+class TestWindowsWaitForForeground:
+    def _patch(self, monkeypatch, foreground):
+        from cup.actions import _windows
+
+        sleeps = []
+        monkeypatch.setattr(_windows.time, "sleep", sleeps.append)
+        monkeypatch.setattr(_windows, "_GetAncestor", lambda h, flag: h + 1, raising=False)
+        monkeypatch.setattr(_windows, "_GetForegroundWindow", foreground, raising=False)
+        return _windows, sleeps
+
+    def test_returns_immediately_when_foreground(self, monkeypatch):
+        _windows, sleeps = self._patch(monkeypatch, lambda: 101)
+        _windows._wait_for_foreground(_FakeHwndElement(100))
+        assert sleeps == []
+
+    def test_polls_until_foreground(self, monkeypatch):
+        answers = iter([7, 7, 101])
+        _windows, sleeps = self._patch(monkeypatch, lambda: next(answers))
+        _windows._wait_for_foreground(_FakeHwndElement(100))
+        assert sleeps == [0.005, 0.005]
+
+    def test_without_hwnd_sleeps_timeout(self, monkeypatch):
+        _windows, sleeps = self._patch(monkeypatch, lambda: 0)
+        _windows._wait_for_foreground(_FakeHwndElement(0), timeout=0.05)
+        assert sleeps == [0.05]
+
+
+class TestWindowsLazyImports:
+    def test_open_app_helpers_not_imported_at_module_level(self):
+        import ast
+        import inspect
+
+        from cup.actions import _windows
+
+        tree = ast.parse(inspect.getsource(_windows))
+        top_level = {
+            alias.name for node in tree.body if isinstance(node, ast.Import) for alias in node.names
+        }
+        assert not top_level & {"base64", "csv", "difflib", "glob", "io", "re", "subprocess"}
+
+
+# ---------------------------------------------------------------------------
+# Fuzzy matching tests (macOS)
+# ---------------------------------------------------------------------------
+
+
+class TestMacosFuzzyMatch:
+    def test_word_boundary_preferred(self):
+        from cup.actions._macos import _fuzzy_match
+
+        result = _fuzzy_match("code", ["xcode", "visual studio code", "notes"])
+        assert result == "visual studio code"
+
+    def test_fuzzy_matches_sequence_matcher_best(self, monkeypatch):
+        import difflib
+
+        from cup.actions import _macos
+        from cup.actions._macos import _fuzzy_match
+
+        monkeypatch.setattr(_macos, "_rf_process", None)
+
+        candidates = ["safari", "system settings", "terminal", "textedit", "photos"]
+        expected = max(
+            candidates,
+            key=lambda c: difflib.SequenceMatcher(None, "termnal", c).ratio(),
+        )
+        assert _fuzzy_match("termnal", candidates) == expected == "terminal"
+
+    def test_length_pruned_candidates_do_not_match(self):
+        from cup.actions._macos import _fuzzy_match
+
+        assert _fuzzy_match("ab", ["a very long application name"]) is None
+
+    def test_rapidfuzz_scorer(self):
+        from cup.actions import _macos
+
+        if _macos._rf_process is None:
+            pytest.skip("rapidfuzz not installed")
+
+        candidates = ["safari", "system settings", "terminal", "textedit"]
+        assert _macos._fuzzy_match("termnal", candidates) == "terminal"
+        assert _macos._fuzzy_match("zzzz", candidates) is None
+
+    def test_shorter_word_match_beats_longer_prefix(self):
+        from cup.actions._macos import _fuzzy_match
+
+        candidates = ["chrome remote desktop host uninstaller", "google chrome", "safari"]
+        assert _fuzzy_match("chrome", candidates) == "google chrome"
+        assert _fuzzy_match("chrome", dict.fromkeys(candidates, "/a")) == "google chrome"
+
+    def test_accepts_apps_dict(self):
+        from cup.actions._macos import _fuzzy_match
+
+        apps = {"safari": "/Applications/Safari.app", "google chrome": "/c"}
+        assert _fuzzy_match("Safari", apps) == "safari"
+        assert _fuzzy_match("chrome", apps) == "google chrome"
+        assert _fuzzy_match("safary", apps) == "safari"
+
+
+class TestMacosMessagingTimeout:
+    def test_timeout_applied_to_element(self, monkeypatch):
+        from cup.actions import _macos
+
+        calls = []
+        monkeypatch.setattr(_macos, "_pyobjc_import_error", None)
+        monkeypatch.setattr(_macos, "_AX_TIMEOUT", 0.25)
+        monkeypatch.setattr(
+            _macos,
+            "AXUIElementSetMessagingTimeout",
+            lambda el, t: calls.append((el, t)),
+            raising=False,
+        )
+        element = object()
+        _macos._set_messaging_timeout(element)
+        assert calls == [(element, 0.25)]
+
+    def test_zero_timeout_keeps_system_default(self, monkeypatch):
+        from cup.actions import _macos
+
+        calls = []
+        monkeypatch.setattr(_macos, "_pyobjc_import_error", None)
+        monkeypatch.setattr(_macos, "_AX_TIMEOUT", 0)
+        monkeypatch.setattr(
+            _macos,
+            "AXUIElementSetMessagingTimeout",
+            lambda el, t: calls.append((el, t)),
+            raising=False,
+        )
+        _macos._set_messaging_timeout(object())
+        assert calls == []
+
+
+class TestMacosMouseClick:
+    def _patch_quartz(self, monkeypatch, posted):
+        from cup.actions import _macos
+
+        monkeypatch.setattr(_macos, "_pyobjc_import_error", None)
+        monkeypatch.setattr(_macos, "CGPointMake", lambda x, y: (x, y), raising=False)
+        monkeypatch.setattr(
+            _macos, "CGEventCreateMouseEvent", lambda *a: {"type": a[1]}, raising=False
+        )
+        monkeypatch.setattr(_macos, "CGEventSetIntegerValueField", lambda *a: None, raising=False)
+        monkeypatch.setattr(_macos, "CGEventPost", lambda tap, ev: posted.append(ev), raising=False)
+        for name in (
+            "kCGEventMouseMoved",
+            "kCGEventLeftMouseDown",
+            "kCGEventLeftMouseUp",
+            "kCGMouseButtonLeft",
+            "kCGHIDEventTap",
+            "kCGMouseEventClickState",
+        ):
+            monkeypatch.setattr(_macos, name, name, raising=False)
+
+    def test_double_click_only_sleeps_between_clicks(self, monkeypatch):
+        from cup.actions import _macos
+
+        posted, sleeps = [], []
+        self._patch_quartz(monkeypatch, posted)
+        monkeypatch.setattr(_macos, "_CLICK_DEBUG", False)
+        monkeypatch.setattr(_macos, "_INTER_EVENT_DELAY", 0)
+        monkeypatch.setattr(_macos.time, "sleep", sleeps.append)
+
+        _macos._send_mouse_click(10, 20, count=2)
+        assert [ev["type"] for ev in posted] == [
+            "kCGEventMouseMoved",
+            "kCGEventLeftMouseDown",
+            "kCGEventLeftMouseUp",
+            "kCGEventLeftMouseDown",
+            "kCGEventLeftMouseUp",
+        ]
+        assert sleeps == [0.02]
+
+    def test_click_debug_restores_settle_sleeps(self, monkeypatch):
+        from cup.actions import _macos
+
+        posted, sleeps = [], []
+        self._patch_quartz(monkeypatch, posted)
+        monkeypatch.setattr(_macos, "_CLICK_DEBUG", True)
+        monkeypatch.setattr(_macos.time, "sleep", sleeps.append)
+
+        _macos._send_mouse_click(10, 20)
+        assert sleeps == [0.02, 0.01, 0.01]
+
+
+class TestMacosParseComboCache:
+    def test_cached_parse_returns_tuples(self):
+        from cup.actions._macos import _parse_combo_cached
+
+        first = _parse_combo_cached("Meta+A")
+        assert first == (("meta",), ("a",))
+        assert _parse_combo_cached("Meta+A") is first
+
+
+class TestMacosWaitForWindow:
+    def _patch(self, monkeypatch, apps_by_poll, cg_calls):
+        from cup.actions import _macos
+
+        class FakeApp:
+            def __init__(self, name):
+                self._name = name
+
+            def activationPolicy(self):
+                return 0
+
+            def localizedName(self):
+                return self._name
+
+            def processIdentifier(self):
+                return 42
+
+        polls = iter(apps_by_poll)
+
+        class FakeWorkspace:
+            def runningApplications(self):
+                return [FakeApp(n) for n in next(polls, apps_by_poll[-1])]
+
+        class FakeNSWorkspace:
+            @staticmethod
+            def sharedWorkspace():
+                return FakeWorkspace()
+
+        monkeypatch.setattr(_macos, "_pyobjc_import_error", None)
+        monkeypatch.setattr(_macos, "NSWorkspace", FakeNSWorkspace, raising=False)
+        monkeypatch.setattr(_macos, "NSApplicationActivationPolicyRegular", 0, raising=False)
+        monkeypatch.setattr(_macos, "AXUIElementCreateApplication", lambda pid: pid, raising=False)
+        monkeypatch.setattr(
+            _macos,
+            "AXUIElementGetAttributeValueCount",
+            lambda ref, attr, _: (0, 1),
+            raising=False,
+        )
+        monkeypatch.setattr(_macos, "kAXErrorSuccess", 0, raising=False)
+        monkeypatch.setattr(_macos, "kAXWindowsAttribute", "AXWindows", raising=False)
+        monkeypatch.setattr(
+            _macos,
+            "CGWindowListCopyWindowInfo",
+            lambda *a: cg_calls.append(a) or [],
+            raising=False,
+        )
+        monkeypatch.setattr(_macos, "kCGNullWindowID", 0, raising=False)
+        monkeypatch.setattr(_macos, "kCGWindowListOptionOnScreenOnly", 1, raising=False)
+
+    def test_backoff_and_deferred_window_list(self, monkeypatch):
+        from cup.actions import _macos
+
+        sleeps, cg_calls = [], []
+        self._patch(monkeypatch, [[], [], [], ["Notes"]], cg_calls)
+        monkeypatch.setattr(_macos.time, "sleep", sleeps.append)
+
+        assert _macos.MacosActionHandler()._wait_for_window("notes")
+        assert sleeps == pytest.approx([0.05, 0.075, 0.1125])
+        # The window list is skipped on the first two polls
+        assert len(cg_calls) == 1
+
+    def test_launch_notification_wakes_poll(self, monkeypatch):
+        import threading
+
+        from cup.actions import _macos
+
+        sleeps, cg_calls, waits = [], [], []
+        self._patch(monkeypatch, [[], [], ["Notes"]], cg_calls)
+        monkeypatch.setattr(_macos.time, "sleep", sleeps.append)
+
+        class FakeObserver:
+            launched = threading.Event()
+
+        def fake_wait(event, timeout):
+            waits.append(timeout)
+            if len(waits) == 2:
+                event.set()
+
+        monkeypatch.setattr(_macos, "_observe_launches", lambda ws, pattern: FakeObserver)
+        monkeypatch.setattr(_macos, "_wait_for_event", fake_wait)
+
+        assert _macos.MacosActionHandler()._wait_for_window("notes")
+        assert waits == pytest.approx([0.05, 0.075])
+        assert sleeps == []
+
+    def test_bundle_id_skips_running_app_scan(self, monkeypatch):
+        import types
+
+        from cup.actions import _macos
+
+        cg_calls = []
+        self._patch(monkeypatch, [["Unrelated"]], cg_calls)
+
+        class TargetApp:
+            def activationPolicy(self):
+                return 0
+
+            def localizedName(self):
+                return "Renamed Helper"
+
+            def processIdentifier(self):
+                return 7
+
+        lookups = []
+        monkeypatch.setattr(
+            _macos,
+            "NSRunningApplication",
+            types.SimpleNamespace(
+                runningApplicationsWithBundleIdentifier_=lambda b: (
+                    lookups.append(b) or [TargetApp()]
+                )
+            ),
+            raising=False,
+        )
+        handler = _macos.MacosActionHandler()
+        assert handler._wait_for_window("notes", bundle_id="com.apple.Notes")
+        assert lookups == ["com.apple.Notes"]
+
+
+class TestMacosOpenApplicationAsync:
+    def _patch(self, monkeypatch):
+        import types
+
+        from cup.actions import _macos
+
+        class FakeConfig:
+            @classmethod
+            def configuration(cls):
+                return cls()
+
+            def setActivates_(self, flag):
+                self.activates = flag
+
+        fake_objc = types.SimpleNamespace(
+            lookUpClass=lambda name: FakeConfig,
+            nosuchclass_error=LookupError,
+        )
+        monkeypatch.setattr(_macos, "objc", fake_objc, raising=False)
+        monkeypatch.setattr(
+            _macos,
+            "NSURL",
+            types.SimpleNamespace(fileURLWithPath_=lambda p: f"file://{p}"),
+            raising=False,
+        )
+
+    def _workspace(self, error=None):
+        class FakeWorkspace:
+            opened = []
+
+            def URLForApplicationWithBundleIdentifier_(self, bundle_id):
+                return f"bundle://{bundle_id}"
+
+            def openApplicationAtURL_configuration_completionHandler_(self, url, config, done):
+                self.opened.append(url)
+                done(object(), error)
+
+        return FakeWorkspace()
+
+    def test_completion_success(self, monkeypatch):
+        from cup.actions import _macos
+
+        self._patch(monkeypatch)
+        workspace = self._workspace()
+        assert _macos._open_application_async(workspace, "com.apple.Notes") is True
+        assert workspace.opened == ["bundle://com.apple.Notes"]
+
+    def test_completion_error(self, monkeypatch):
+        from cup.actions import _macos
+
+        self._patch(monkeypatch)
+        assert _macos._open_application_async(self._workspace("boom"), "com.x") is False
+
+    def test_legacy_workspace_falls_back(self, monkeypatch):
+        from cup.actions import _macos
+
+        self._patch(monkeypatch)
+        assert _macos._open_application_async(object(), "com.x") is None
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawn"), reason="requires posix_spawn")
+class TestMacosSpawnAndWait:
+    def test_exit_code_returned(self):
+        from cup.actions._macos import _spawn_and_wait
+
+        assert _spawn_and_wait(["/bin/sh", "-c", "echo ignored; exit 3"], timeout=5) == 3
+
+    def test_timeout_kills_child(self):
+        from cup.actions._macos import _spawn_and_wait
+
+        assert _spawn_and_wait(["/bin/sh", "-c", "sleep 5"], timeout=0.1) is None
+
+    def test_missing_binary_raises_oserror(self):
+        from cup.actions._macos import _spawn_and_wait
+
+        with pytest.raises(OSError):
+            _spawn_and_wait(["/nonexistent/open"], timeout=1)
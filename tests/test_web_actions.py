@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from cup.actions._web import _CDP_KEY_MAP, _CDP_MODIFIER_MAP, _get_click_point
 
 # ---------------------------------------------------------------------------
@@ -84,6 +86,10 @@ class TestGetClickPoint:
         assert x == 100.0
         assert y == 50.0
 
+    def test_border_used_when_content_key_missing(self):
+        box_model = {"model": {"border": [0, 0, 10, 0, 10, 20, 0, 20]}}
+        assert _get_click_point(box_model) == (5.0, 10.0)
+
     def test_raises_when_no_quads(self):
         """Should raise when neither content nor border quad is available."""
         import pytest
@@ -111,7 +117,10 @@ class TestWebActionDispatch:
         class MockWS:
             def __init__(self):
                 self.calls = []
+                self._pending = []
                 self._timeout = 30
+                self.unresolvable = False
+                self.unfocusable = False
 
             def gettimeout(self):
                 return self._timeout
@@ -122,19 +131,27 @@ class TestWebActionDispatch:
             def send(self, data):
                 import json
 
-                self.calls.append(json.loads(data))
+                msg = json.loads(data)
+                self.calls.append(msg)
+                self._pending.append(msg)
 
             def recv(self):
                 import json
 
-                # Return a response matching the last sent ID
-                msg_id = self.calls[-1]["id"] if self.calls else 1
-                method = self.calls[-1].get("method", "") if self.calls else ""
+                # Answer sent messages in order (pipelined requests queue up)
+                msg = self._pending.pop(0) if self._pending else {"id": 1}
+                msg_id = msg["id"]
+                method = msg.get("method", "")
                 result = {}
+                if method == "DOM.focus" and self.unfocusable:
+                    error = {"code": -32000, "message": "Element is not focusable"}
+                    return json.dumps({"id": msg_id, "error": error})
                 if method == "DOM.getBoxModel":
                     result = {"model": {"content": [0, 0, 100, 0, 100, 50, 0, 50]}}
-                elif method == "DOM.resolveNode":
+                elif method == "DOM.resolveNode" and not self.unresolvable:
                     result = {"object": {"objectId": "obj-1"}}
+                elif method == "Runtime.callFunctionOn":
+                    result = {"result": {"type": "boolean", "value": True}}
                 return json.dumps({"id": msg_id, "result": result})
 
         return MockWS()
@@ -235,6 +252,13 @@ class TestWebActionDispatch:
         result = handler._dispatch(ws, 123, "doubleclick", {})
         assert result.success is True
 
+    def test_dispatch_table_covers_element_actions(self):
+        from cup.actions._web import WebActionHandler
+        from cup.actions.executor import VALID_ACTIONS
+
+        # press goes through WebActionHandler.press; longpress has no CDP path
+        assert set(WebActionHandler._ACTION_DISPATCH) == VALID_ACTIONS - {"press", "longpress"}
+
     def test_all_dispatch_paths_return_actionresult(self):
         """Every action path should return ActionResult, never raise."""
         from cup.actions.executor import ActionResult
@@ -267,3 +291,247 @@ class TestWebActionDispatch:
                 params["direction"] = "down"
             result = handler._dispatch(ws, 123, action, params)
             assert isinstance(result, ActionResult), f"{action} did not return ActionResult"
+
+    def test_js_click_skips_geometry(self):
+        handler = self._make_handler()
+        handler._js_click = True
+        ws = self._mock_ws()
+
+        result = handler._dispatch(ws, 123, "doubleclick", {})
+        assert result.success is True
+        assert result.message == "Double-clicked"
+        methods = [c["method"] for c in ws.calls]
+        assert methods == ["DOM.resolveNode", "Runtime.callFunctionOn"]
+        assert ws.calls[1]["params"]["arguments"] == [{"value": "left"}, {"value": 2}]
+
+    def test_js_click_falls_back_to_coordinates(self):
+        handler = self._make_handler()
+        handler._js_click = True
+        ws = self._mock_ws()
+        ws.unresolvable = True
+
+        result = handler._dispatch(ws, 123, "click", {})
+        assert result.success is True
+        assert "Input.dispatchMouseEvent" in [c["method"] for c in ws.calls]
+
+    def test_resolved_object_reused_across_js_actions(self):
+        handler = self._make_handler()
+        ws = self._mock_ws()
+
+        handler._dispatch(ws, 123, "setvalue", {"value": "x"})
+        handler._dispatch(ws, 123, "toggle", {})
+        methods = [c["method"] for c in ws.calls]
+        assert methods.count("DOM.resolveNode") == 1
+        assert ws.calls[0]["params"]["objectGroup"] == "cup"
+
+    def test_expired_object_released_before_re_resolve(self, monkeypatch):
+        from cup.actions import _web
+
+        handler = self._make_handler()
+        ws = self._mock_ws()
+        now = [100.0]
+        monkeypatch.setattr(_web.time, "monotonic", lambda: now[0])
+
+        handler._dispatch(ws, 123, "toggle", {})
+        now[0] += handler._RESOLVE_TTL + 1
+        handler._dispatch(ws, 123, "toggle", {})
+        methods = [c["method"] for c in ws.calls]
+        assert methods == [
+            "DOM.resolveNode",
+            "Runtime.callFunctionOn",
+            "Runtime.releaseObject",
+            "DOM.resolveNode",
+            "Runtime.callFunctionOn",
+        ]
+        assert ws.calls[2]["params"] == {"objectId": "obj-1"}
+
+    def test_resolve_cache_dropped_with_connection(self):
+        handler = self._make_handler()
+        ws = self._mock_ws()
+
+        handler._dispatch(ws, 123, "toggle", {})
+        assert handler._resolve_cache
+        handler._close_ws(ws)
+        assert handler._resolve_cache == {}
+
+
+# ---------------------------------------------------------------------------
+# Batched CDP sends
+# ---------------------------------------------------------------------------
+
+
+class TestCDPSendBatch:
+    def _ws(self):
+        return TestWebActionDispatch()._mock_ws()
+
+    def test_responses_returned_in_command_order(self):
+        from cup.platforms.web import _cdp_send_batch
+
+        ws = self._ws()
+        responses = _cdp_send_batch(
+            ws,
+            [("DOM.focus", {"backendNodeId": 1}), ("Input.insertText", {"text": "hi"})],
+        )
+        assert [c["method"] for c in ws.calls] == ["DOM.focus", "Input.insertText"]
+        assert [r["id"] for r in responses] == [c["id"] for c in ws.calls]
+
+    def test_key_combo_is_one_batch(self):
+        from cup.actions._web import WebActionHandler
+
+        ws = self._ws()
+        WebActionHandler()._send_key_combo(ws, "ctrl+shift+a")
+        events = [(c["params"]["type"], c["params"]["key"]) for c in ws.calls]
+        assert events == [
+            ("keyDown", "Control"),
+            ("keyDown", "Shift"),
+            ("keyDown", "a"),
+            ("keyUp", "a"),
+            ("keyUp", "Shift"),
+            ("keyUp", "Control"),
+        ]
+
+    def test_type_focuses_then_batches_edit_without_sleeps(self, monkeypatch):
+        import time
+
+        from cup.actions._web import WebActionHandler
+
+        monkeypatch.setattr(time, "sleep", lambda s: pytest.fail("unexpected sleep"))
+        ws = self._ws()
+        WebActionHandler()._type(ws, 7, "hello")
+        methods = [c["method"] for c in ws.calls]
+        assert methods[0] == "DOM.focus"
+        assert methods[-1] == "Input.insertText"
+        assert methods[1:-1] == ["Input.dispatchKeyEvent"] * 4
+
+    @pytest.mark.parametrize(
+        "call",
+        [
+            lambda h, ws: h._type(ws, 7, "hello"),
+            lambda h, ws: h._arrow_key(ws, 7, "ArrowUp"),
+        ],
+        ids=["type", "arrow_key"],
+    )
+    def test_failed_focus_sends_no_input(self, call):
+        from cup.actions._web import WebActionHandler
+
+        ws = self._ws()
+        ws.unfocusable = True
+        with pytest.raises(RuntimeError):
+            call(WebActionHandler(), ws)
+        assert [c["method"] for c in ws.calls] == ["DOM.focus"]
+
+    def test_key_combo_commands_cached(self):
+        from cup.actions._web import _key_combo_commands
+
+        first = _key_combo_commands("ctrl+a")
+        assert _key_combo_commands("ctrl+a") is first
+        assert first[1][1]["code"] == "KeyA"
+        assert first[1][1]["modifiers"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Connection pooling
+# ---------------------------------------------------------------------------
+
+
+class TestWebConnectionPool:
+    def _patch_connect(self, monkeypatch):
+        import cup.platforms.web as web
+
+        opened, closed = [], []
+
+        def fake_connect(ws_url, host=None):
+            ws = TestWebActionDispatch()._mock_ws()
+            opened.append(ws)
+            return ws
+
+        monkeypatch.setattr(web, "_cdp_connect", fake_connect)
+        monkeypatch.setattr(web, "_cdp_close", closed.append)
+        return opened, closed
+
+    def test_connection_reused_across_actions(self, monkeypatch):
+        from cup.actions._web import WebActionHandler
+
+        opened, closed = self._patch_connect(monkeypatch)
+        handler = WebActionHandler()
+        assert handler.action(("ws://x/1", 5), "focus", {}).success
+        assert handler.action(("ws://x/1", 6), "click", {}).success
+        assert len(opened) == 1
+        assert closed == []
+
+        handler.close()
+        assert closed == opened
+
+    def test_idle_connection_reopened(self, monkeypatch):
+        import time
+
+        from cup.actions._web import WebActionHandler
+
+        opened, closed = self._patch_connect(monkeypatch)
+        handler = WebActionHandler()
+        handler.action(("ws://x/1", 5), "focus", {})
+        ws, _ = handler._ws_pool["ws://x/1"]
+        handler._ws_pool["ws://x/1"] = (ws, time.monotonic() - 60)
+
+        handler.action(("ws://x/1", 5), "focus", {})
+        assert len(opened) == 2
+        assert closed == [opened[0]]
+
+    def test_failed_action_drops_connection(self, monkeypatch):
+        from cup.actions._web import WebActionHandler
+
+        opened, closed = self._patch_connect(monkeypatch)
+        handler = WebActionHandler()
+        monkeypatch.setattr(handler, "_focus", lambda ws, node: 1 / 0)
+        assert not handler.action(("ws://x/1", 5), "focus", {}).success
+        assert closed == opened
+        assert handler._ws_pool == {}
+
+
+class TestPressTargetsCache:
+    def _setup(self, monkeypatch, fail_urls=()):
+        import cup.platforms.web as web
+
+        fetches = []
+        tabs = iter(["ws://x/old", "ws://x/new"])
+
+        def fake_targets(host, port):
+            url = next(tabs, "ws://x/new")
+            fetches.append(url)
+            return [{"type": "page", "webSocketDebuggerUrl": url}]
+
+        def fake_connect(ws_url, host=None):
+            if ws_url in fail_urls:
+                raise ConnectionError("gone")
+            return TestWebActionDispatch()._mock_ws()
+
+        monkeypatch.setattr(web, "_cdp_get_targets", fake_targets)
+        monkeypatch.setattr(web, "_cdp_connect", fake_connect)
+        return fetches
+
+    def test_targets_reused_within_ttl(self, monkeypatch):
+        from cup.actions._web import WebActionHandler
+
+        fetches = self._setup(monkeypatch)
+        handler = WebActionHandler()
+        assert handler.press("enter").success
+        assert handler.press("tab").success
+        assert len(fetches) == 1
+
+        handler.invalidate_targets()
+        assert handler.press("tab").success
+        assert len(fetches) == 2
+
+    def test_stale_cached_target_refetched(self, monkeypatch):
+        import time
+
+        from cup.actions._web import WebActionHandler
+
+        fetches = self._setup(monkeypatch, fail_urls={"ws://x/closed"})
+        handler = WebActionHandler()
+        handler._targets_cache = (
+            [{"type": "page", "webSocketDebuggerUrl": "ws://x/closed"}],
+            time.monotonic(),
+        )
+        assert handler.press("enter").success
+        assert fetches == ["ws://x/old"]